@@ -14,6 +14,10 @@ from path_planning.dfs import DFSPlanner
 from path_planning.rrt import RRTPlanner
 from path_planning.rrt_star import RRTStarPlanner
 from path_planning.prm import PRMPlanner
+from path_planning.jps import JPSPlanner
+from path_planning.bidirectional_bfs import BidirectionalBFSPlanner
+from path_planning.bidirectional_astar import BidirectionalAStarPlanner
+from path_planning.lpa_star import LPAStarPlanner
 
 # Import explanation methods
 from explanations.lime_explainer import LimeExplainer
@@ -24,6 +28,7 @@ from explanations.contrastive_explainer import ContrastiveExplainer
 from environment_generator import EnvironmentGenerator
 from gui import GridWorldEnv
 from metrics import compute_path_metrics
+from distance_fields import load_distance_fields
 
 class BatchExperimentRunner:
     def __init__(self):
@@ -37,7 +42,11 @@ class BatchExperimentRunner:
             "Greedy Best-First": GreedyBestFirstPlanner,
             "RRT": RRTPlanner,
             "RRT*": RRTStarPlanner,
-            "PRM": PRMPlanner
+            "PRM": PRMPlanner,
+            "JPS": JPSPlanner,
+            "Bidirectional BFS": BidirectionalBFSPlanner,
+            "Bidirectional A*": BidirectionalAStarPlanner,
+            "LPA*": LPAStarPlanner
         }
         
         self.explainers = {
@@ -70,6 +79,9 @@ class BatchExperimentRunner:
         # Load agent and goal positions
         env.agent_pos = env_data.get("agent_pos")
         env.goal_pos = env_data.get("goal_pos")
+
+        # Precomputed start/goal distance fields, if stored alongside the corpus
+        env.distance_fields = load_distance_fields(filepath, env)
         
         return env
     
@@ -1,5 +1,3 @@
-import os
-import json
 import argparse
 import pandas as pd
 import numpy as np
@@ -7,6 +5,7 @@ from tqdm import tqdm
 
 from explanations.contrastive_explainer import ContrastiveExplainer
 from grid_world_env import GridWorldEnv
+from contrastive_pair_store import load_pairs
 from path_planning.astar import AStarPlanner
 from path_planning.dijkstra import DijkstraPlanner
 from path_planning.bfs import BFSPlanner
@@ -102,16 +101,8 @@ def main():
     args = parser.parse_args()
 
     results = []
-    pairs = sorted([d for d in os.listdir(args.input_dir) if d.startswith("pair_")])
-
-    for pair_dir in tqdm(pairs, desc="Evaluating contrastive explanations"):
-        pair_path = os.path.join(args.input_dir, pair_dir, "pair.json")
-        if not os.path.exists(pair_path):
-            continue
-
-        with open(pair_path, "r") as f:
-            data = json.load(f)
 
+    for pair_dir, data in tqdm(load_pairs(args.input_dir), desc="Evaluating contrastive explanations"):
         env_a = load_environment_from_dict(data["original_environment"])
         env_b = load_environment_from_dict(data["contrastive_environment"])
         path_a = data["original_environment"]["path"]
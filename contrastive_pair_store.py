@@ -0,0 +1,149 @@
+import os
+import json
+
+PAIR_STORE_FILENAME = "pairs.jsonl"
+
+
+def encode_path(path, grid_size):
+    """Encode a path as a flat list of cell ids (row * grid_size + col)"""
+    return [int(r) * grid_size + int(c) for r, c in path] if path else []
+
+
+def decode_path(cell_ids, grid_size):
+    """Decode a flat list of cell ids back into a [[row, col], ...] path"""
+    return [list(divmod(cell_id, grid_size)) for cell_id in cell_ids] if cell_ids else None
+
+
+def _shape_cells(shape):
+    return [[int(r), int(c)] for r, c in shape]
+
+
+def encode_delta(env_a, env_b):
+    """
+    Describe env_b as the changes applied to env_a.
+
+    Returns:
+        dict with the shapes that were added or changed (full cell lists), the
+        ids of removed shapes, and start/goal only if they differ
+    """
+    shapes_a = {int(k): _shape_cells(v) for k, v in env_a.obstacle_shapes.items()}
+    shapes_b = {int(k): _shape_cells(v) for k, v in env_b.obstacle_shapes.items()}
+
+    delta = {
+        "changed": {str(k): v for k, v in shapes_b.items() if shapes_a.get(k) != v},
+        "removed": [k for k in shapes_a if k not in shapes_b],
+        "num_obstacles": env_b.num_obstacles,
+    }
+    if list(env_b.agent_pos) != list(env_a.agent_pos):
+        delta["agent_pos"] = list(env_b.agent_pos)
+    if list(env_b.goal_pos) != list(env_a.goal_pos):
+        delta["goal_pos"] = list(env_b.goal_pos)
+    return delta
+
+
+def apply_delta(original, delta):
+    """
+    Rebuild the full contrastive environment dict from the original and a delta.
+
+    Args:
+        original: Original environment dict (grid_size, agent_pos, goal_pos, obstacle_shapes, ...)
+        delta: Delta as produced by encode_delta
+
+    Returns:
+        dict in the same format as the original
+    """
+    removed = {str(k) for k in delta["removed"]}
+    shapes = {k: v for k, v in original["obstacle_shapes"].items() if k not in removed}
+    shapes.update(delta["changed"])
+    return {
+        "grid_size": original["grid_size"],
+        "num_obstacles": delta.get("num_obstacles", original["num_obstacles"]),
+        "agent_pos": delta.get("agent_pos", original["agent_pos"]),
+        "goal_pos": delta.get("goal_pos", original["goal_pos"]),
+        "obstacle_shapes": shapes,
+    }
+
+
+class ContrastivePairStore:
+    """
+    Single-file store for contrastive environment pairs.
+
+    Pairs are appended as JSON lines to one file. Each record keeps the
+    original environment in full, the contrastive environment as a delta
+    (changed shapes only) and both paths as flat integer cell ids. Reading
+    yields the same structure as the old per-pair ``pair.json`` files, so
+    consumers work with either layout.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+    def clear(self):
+        """Start a new, empty store"""
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        open(self.filepath, "w").close()
+
+    def append(self, name, env_a, path_a, env_b, path_b):
+        """Append one pair to the store"""
+        grid_size = env_a.grid_size
+        record = {
+            "pair": name,
+            "original": {
+                "grid_size": grid_size,
+                "num_obstacles": env_a.num_obstacles,
+                "agent_pos": list(env_a.agent_pos),
+                "goal_pos": list(env_a.goal_pos),
+                "obstacle_shapes": {str(k): _shape_cells(v) for k, v in env_a.obstacle_shapes.items()},
+            },
+            "delta": encode_delta(env_a, env_b),
+            "path_a": encode_path(path_a, grid_size),
+            "path_b": encode_path(path_b, grid_size),
+        }
+        with open(self.filepath, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def __iter__(self):
+        """
+        Yield (name, pair_data) for every stored pair.
+
+        pair_data has the layout of the legacy pair.json files:
+        {"original_environment": {..., "path": ...}, "contrastive_environment": {..., "path": ...}}
+        """
+        with open(self.filepath, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                original = record["original"]
+                grid_size = original["grid_size"]
+
+                env_a = dict(original, path=decode_path(record["path_a"], grid_size))
+                env_b = dict(apply_delta(original, record["delta"]),
+                             path=decode_path(record["path_b"], grid_size))
+                yield record["pair"], {
+                    "original_environment": env_a,
+                    "contrastive_environment": env_b,
+                }
+
+
+def load_pairs(folder):
+    """
+    Yield (name, pair_data) for all contrastive pairs in a folder.
+
+    Reads the consolidated pair store if present, otherwise falls back to the
+    legacy layout with one pair_XXX/pair.json directory per pair.
+    """
+    store_path = os.path.join(folder, PAIR_STORE_FILENAME)
+    if os.path.exists(store_path):
+        yield from ContrastivePairStore(store_path)
+        return
+
+    for subfolder in sorted(d for d in os.listdir(folder) if d.startswith("pair_")):
+        pair_path = os.path.join(folder, subfolder, "pair.json")
+        if not os.path.exists(pair_path):
+            print(f"[!] Skipping {subfolder}: pair.json not found")
+            continue
+        with open(pair_path, "r") as f:
+            yield subfolder, json.load(f)
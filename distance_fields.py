@@ -0,0 +1,145 @@
+import os
+import numpy as np
+from path_planning.distance_field import UNREACHABLE, sweep
+from path_planning.occupancy import build_occupancy
+
+
+def bfs_distance_field(grid_size, obstacles, source):
+    """
+    Compute 4-connected shortest-path distances from a source cell.
+
+    The source itself is always expanded, like the start cell of the grid
+    planners; every other cell is entered only if it is free.
+
+    Args:
+        grid_size: Width/height of the square grid
+        obstacles: List of obstacle cells
+        source: Source cell [row, col]
+
+    Returns:
+        (grid_size, grid_size) int16 array of distances, UNREACHABLE where no path exists
+    """
+    n = grid_size
+    occupancy = build_occupancy(grid_size, obstacles)
+    dist, _ = sweep(occupancy, n, source[0] * n + source[1])
+
+    if max(dist) > np.iinfo(np.int16).max:
+        raise ValueError("Distances exceed the int16 range of the distance field format")
+    return np.array(dist, dtype=np.int16).reshape(n, n)
+
+
+def free_grid_path_length(start, goal):
+    """Number of cells on a shortest 4-connected path in an obstacle-free grid"""
+    return abs(start[0] - goal[0]) + abs(start[1] - goal[1]) + 1
+
+
+class DistanceFields:
+    """
+    Start and goal distance fields of one environment.
+
+    Attributes:
+        start: (H, W) int16 distances from the agent position
+        goal: (H, W) int16 distances from the goal position
+    """
+
+    def __init__(self, fields, agent_pos, goal_pos, obstacles):
+        self.fields = fields
+        self.start = fields[0]
+        self.goal = fields[1]
+        # Remember what the fields were computed for, so that perturbed or
+        # mutated environments never read stale distances
+        self._agent_pos = [int(v) for v in agent_pos]
+        self._goal_pos = [int(v) for v in goal_pos]
+        self._obstacles = frozenset((int(r), int(c)) for r, c in obstacles)
+
+    @classmethod
+    def compute(cls, env):
+        """Compute both fields for an environment"""
+        fields = np.stack([
+            bfs_distance_field(env.grid_size, env.obstacles, env.agent_pos),
+            bfs_distance_field(env.grid_size, env.obstacles, env.goal_pos),
+        ])
+        return cls(fields, env.agent_pos, env.goal_pos, env.obstacles)
+
+    def matches(self, env):
+        """Check that the fields still describe the environment's current state"""
+        return (list(env.agent_pos) == self._agent_pos and
+                list(env.goal_pos) == self._goal_pos and
+                len(env.obstacles) == len(self._obstacles) and
+                frozenset(tuple(o) for o in env.obstacles) == self._obstacles)
+
+    def path_length(self):
+        """
+        Number of cells on a shortest path from start to goal.
+
+        Returns:
+            int path length (as len(path) from an optimal planner), or None if infeasible
+        """
+        d = int(self.start[self._goal_pos[0], self._goal_pos[1]])
+        return None if d == UNREACHABLE else d + 1
+
+
+def distance_fields_path(env_path):
+    """Sidecar filename of the distance fields stored next to an environment JSON file"""
+    return os.path.splitext(env_path)[0] + ".dist.npz"
+
+
+def save_distance_fields(env, env_path):
+    """
+    Compute and store the distance fields of an environment next to its JSON file.
+
+    The fields are written as one (2, H, W) int16 array (start, goal), together
+    with the start, goal and obstacle cells they were computed for.
+    """
+    fields = DistanceFields.compute(env)
+    np.savez(
+        distance_fields_path(env_path),
+        fields=fields.fields,
+        positions=np.array([fields._agent_pos, fields._goal_pos], dtype=np.int16),
+        obstacles=np.array(sorted(fields._obstacles), dtype=np.int16).reshape(-1, 2),
+    )
+    return fields
+
+
+def remove_distance_fields(env_path):
+    """Delete the distance fields stored next to an environment JSON file, if any"""
+    fields_path = distance_fields_path(env_path)
+    if os.path.exists(fields_path):
+        os.remove(fields_path)
+
+
+def load_distance_fields(env_path, env):
+    """
+    Load the stored distance fields of an environment.
+
+    Args:
+        env_path: Path of the environment JSON file
+        env: The environment loaded from env_path
+
+    Returns:
+        DistanceFields, or None if no fields were stored for this environment
+        or they were computed for a different start, goal or obstacle set
+    """
+    fields_path = distance_fields_path(env_path)
+    if not os.path.exists(fields_path):
+        return None
+    with np.load(fields_path) as data:
+        start, goal = data["positions"]
+        fields = DistanceFields(data["fields"], start, goal, data["obstacles"])
+    return fields if fields.matches(env) else None
+
+
+def optimal_path_length(env, planner):
+    """
+    Read the start-goal path length from an environment's distance fields.
+
+    Only valid for planners that return shortest 4-connected paths.
+
+    Returns:
+        (available, length): available is False if the fields cannot answer for
+        this environment/planner; length is None when no path exists
+    """
+    fields = getattr(env, "distance_fields", None)
+    if fields is None or not getattr(planner, "optimal", False) or not fields.matches(env):
+        return False, None
+    return True, fields.path_length()
@@ -0,0 +1,251 @@
+import json
+import numpy as np
+from grid_world_env import GridWorldEnv
+
+
+class EnvBatch:
+    """
+    Struct-of-arrays container for a corpus of equally sized grid worlds.
+
+    Every environment is stored as a slice of stacked NumPy arrays so that
+    corpus-level preprocessing (feasibility labelling, density statistics,
+    obstacle perturbations, filtering) runs as one vectorized pass over all N
+    environments instead of N Python loops.
+
+    Attributes:
+        shape_masks: (N, S, H, W) bool array, one mask per obstacle shape
+            (S is the largest shape count in the batch, unused slots are empty)
+        shape_valid: (N, S) bool array marking which shape slots are in use
+        shape_keys: List of N lists with the original shape ids per slot
+        starts: (N, 2) int array of agent positions
+        goals: (N, 2) int array of goal positions
+        shape_counts: (N,) int array of obstacle shapes per environment
+    """
+
+    def __init__(self, shape_masks, shape_valid, shape_keys, starts, goals):
+        self.shape_masks = shape_masks
+        self.shape_valid = shape_valid
+        self.shape_keys = shape_keys
+        self.starts = starts
+        self.goals = goals
+        self.shape_counts = shape_valid.sum(axis=1)
+        self.grid_size = shape_masks.shape[-1]
+        self._occupancy = None
+        self._labels = None
+
+    def __len__(self):
+        return self.shape_masks.shape[0]
+
+    @classmethod
+    def from_envs(cls, envs):
+        """
+        Stack a list of GridWorldEnv instances into a batch.
+
+        Args:
+            envs: List of environments, all with the same grid_size
+
+        Returns:
+            EnvBatch holding all environments
+        """
+        if not envs:
+            raise ValueError("Cannot build an EnvBatch from an empty corpus")
+
+        grid_size = envs[0].grid_size
+        if any(env.grid_size != grid_size for env in envs):
+            raise ValueError("EnvBatch requires all environments to share the same grid_size")
+
+        n = len(envs)
+        max_shapes = max(1, max(len(env.obstacle_shapes) for env in envs))
+
+        shape_masks = np.zeros((n, max_shapes, grid_size, grid_size), dtype=bool)
+        shape_valid = np.zeros((n, max_shapes), dtype=bool)
+        shape_keys = []
+        starts = np.zeros((n, 2), dtype=np.int32)
+        goals = np.zeros((n, 2), dtype=np.int32)
+
+        for i, env in enumerate(envs):
+            keys = list(env.obstacle_shapes.keys())
+            shape_keys.append(keys)
+            for slot, shape_id in enumerate(keys):
+                shape_valid[i, slot] = True
+                cells = np.asarray(env.obstacle_shapes[shape_id], dtype=np.int64).reshape(-1, 2)
+                inside = ((cells >= 0) & (cells < grid_size)).all(axis=1)
+                cells = cells[inside]
+                shape_masks[i, slot, cells[:, 0], cells[:, 1]] = True
+            starts[i] = env.agent_pos
+            goals[i] = env.goal_pos
+
+        return cls(shape_masks, shape_valid, shape_keys, starts, goals)
+
+    @classmethod
+    def from_files(cls, filepaths):
+        """Load environment JSON files (as written by EnvironmentGenerator) into a batch"""
+        envs = []
+        for filepath in filepaths:
+            with open(filepath, 'r') as f:
+                envs.append(GridWorldEnv.from_dict(json.load(f)))
+        return cls.from_envs(envs)
+
+    @property
+    def occupancy(self):
+        """(N, H, W) bool array of blocked cells"""
+        if self._occupancy is None:
+            self._occupancy = self.shape_masks.any(axis=1)
+        return self._occupancy
+
+    @property
+    def labels(self):
+        """(N, H, W) int32 array of 4-connected component labels (0 = blocked)"""
+        if self._labels is None:
+            self._labels = self._label_components()
+        return self._labels
+
+    def _label_components(self):
+        """
+        Label the free space of every environment at once.
+
+        Each free cell starts with its own flat index (+1) as label and repeatedly
+        takes the minimum label of its free 4-neighbours until nothing changes.
+        After every sweep each label is replaced by the label of the cell it
+        points to, which collapses long chains and keeps the number of sweeps
+        far below the component diameter.
+        """
+        n, h, w = self.occupancy.shape
+        free = ~self.occupancy
+        big = np.iinfo(np.int32).max
+
+        labels = np.where(free, np.arange(1, h * w + 1, dtype=np.int32).reshape(1, h, w), 0)
+        padded = np.full((n, h + 2, w + 2), big, dtype=np.int32)
+
+        while True:
+            padded[:, 1:-1, 1:-1] = np.where(free, labels, big)
+            neighbour_min = np.minimum.reduce([
+                padded[:, :-2, 1:-1],  # up
+                padded[:, 2:, 1:-1],   # down
+                padded[:, 1:-1, :-2],  # left
+                padded[:, 1:-1, 2:],   # right
+            ])
+            updated = np.where(free, np.minimum(labels, neighbour_min), 0)
+
+            # Pointer jumping: a label always names a cell of the same component
+            flat = updated.reshape(n, h * w)
+            jumped = np.take_along_axis(flat, np.maximum(flat - 1, 0), axis=1).reshape(n, h, w)
+            updated = np.where(free, np.minimum(updated, jumped), 0)
+
+            if np.array_equal(updated, labels):
+                return labels
+            labels = updated
+
+    def feasible(self):
+        """
+        Vectorized feasibility of every environment.
+
+        Returns:
+            (N,) bool array, True where the goal is 4-connected to the start
+        """
+        idx = np.arange(len(self))
+        labels = self.labels
+        sr, sc = self.starts[:, 0], self.starts[:, 1]
+        gr, gc = self.goals[:, 0], self.goals[:, 1]
+
+        goal_labels = labels[idx, gr, gc]
+        start_labels = labels[idx, sr, sc]
+        reachable = (goal_labels > 0) & (start_labels == goal_labels)
+
+        # The planners never test the start cell itself, so a start covered by an
+        # obstacle can still leave through any free neighbour
+        padded = np.pad(labels, ((0, 0), (1, 1), (1, 1)))
+        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            neighbour_labels = padded[idx, sr + 1 + dr, sc + 1 + dc]
+            reachable |= (start_labels == 0) & (goal_labels > 0) & (neighbour_labels == goal_labels)
+
+        same_cell = (sr == gr) & (sc == gc)
+        return reachable | same_cell
+
+    def density(self):
+        """(N,) float array with the fraction of blocked cells per environment"""
+        return self.occupancy.mean(axis=(1, 2))
+
+    def statistics(self):
+        """Summary statistics of the corpus"""
+        density = self.density()
+        feasible = self.feasible()
+        return {
+            "num_envs": len(self),
+            "grid_size": self.grid_size,
+            "mean_density": float(density.mean()),
+            "std_density": float(density.std()),
+            "min_density": float(density.min()),
+            "max_density": float(density.max()),
+            "mean_shape_count": float(self.shape_counts.mean()),
+            "feasible_fraction": float(feasible.mean()),
+        }
+
+    def select(self, mask):
+        """
+        Return the sub-batch given by a boolean mask or an index array.
+
+        Args:
+            mask: (N,) bool array or sequence of indices
+
+        Returns:
+            EnvBatch with the selected environments
+        """
+        indices = np.flatnonzero(mask) if np.asarray(mask).dtype == bool else np.asarray(mask)
+        batch = EnvBatch(
+            self.shape_masks[indices],
+            self.shape_valid[indices],
+            [self.shape_keys[i] for i in indices],
+            self.starts[indices],
+            self.goals[indices],
+        )
+        if self._labels is not None:
+            batch._labels = self._labels[indices]
+        return batch
+
+    def perturb(self, keep):
+        """
+        Apply a removal perturbation to every environment at once.
+
+        Args:
+            keep: (N, S) bool array, False removes the shape in that slot
+
+        Returns:
+            New EnvBatch with the removed shapes cleared
+        """
+        keep = np.asarray(keep, dtype=bool) & self.shape_valid
+        shape_masks = self.shape_masks & keep[:, :, None, None]
+        return EnvBatch(shape_masks, keep, self.shape_keys, self.starts, self.goals)
+
+    def random_removal(self, removal_rate=0.3, rng=None):
+        """
+        Randomly remove obstacle shapes from all environments.
+
+        Args:
+            removal_rate: Probability of removing each shape
+            rng: Optional numpy Generator for reproducibility
+
+        Returns:
+            (perturbed EnvBatch, (N, S) bool keep mask)
+        """
+        rng = rng or np.random.default_rng()
+        keep = rng.random(self.shape_valid.shape) >= removal_rate
+        return self.perturb(keep), keep & self.shape_valid
+
+    def to_env(self, i):
+        """Rebuild the i-th environment as a GridWorldEnv"""
+        obstacle_shapes = {}
+        for slot, shape_id in enumerate(self.shape_keys[i]):
+            if self.shape_valid[i, slot]:
+                cells = np.argwhere(self.shape_masks[i, slot])
+                obstacle_shapes[shape_id] = cells.tolist()
+        return GridWorldEnv.from_dict({
+            "grid_size": self.grid_size,
+            "agent_pos": self.starts[i].tolist(),
+            "goal_pos": self.goals[i].tolist(),
+            "obstacle_shapes": obstacle_shapes,
+        })
+
+    def to_envs(self):
+        """Rebuild all environments as GridWorldEnv instances"""
+        return [self.to_env(i) for i in range(len(self))]
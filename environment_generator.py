@@ -3,6 +3,8 @@ import os
 import json
 from grid_world_env import GridWorldEnv
 from path_planning.astar import AStarPlanner
+from path_planning.connectivity import ConnectivityOracle
+from distance_fields import remove_distance_fields, save_distance_fields
 
 class EnvironmentGenerator:
     """
@@ -18,19 +20,22 @@ class EnvironmentGenerator:
             random.seed(seed)
         
     def is_feasible(self, env, planner=None):
-        """Check if the environment has a valid path from start to goal."""
+        """
+        Check if the environment has a valid path from start to goal.
+
+        Without an explicit planner the answer comes from a connected-component
+        labelling of the grid, which matches what any complete 4-connected grid
+        planner (A*, Dijkstra, BFS, ...) would report without running a search.
+        """
         if planner is None:
-            planner = AStarPlanner()
+            return ConnectivityOracle.from_env(env).is_reachable(env.agent_pos, env.goal_pos)
         planner.set_environment(
             start=env.agent_pos,
             goal=env.goal_pos,
             grid_size=env.grid_size,
             obstacles=env.obstacles
         )
-        result = planner.plan(return_steps=False)  # Specify return_steps=False
-        # Handle both cases - either a single path or a tuple with path as first element
-        path = result[0] if isinstance(result, tuple) else result
-        return path is not None and len(path) > 0
+        return planner.path_exists()
         
     def generate_position(self, env):
         """Generate a random position that is not an obstacle."""
@@ -103,8 +108,17 @@ class EnvironmentGenerator:
         """
         # Store the original number of obstacles to maintain the limit
         original_num_obstacles = env.num_obstacles
+        # Grid planners declare the moves they search; sampling planners are not
+        # bound to grid moves, so they get no connectivity shortcut
+        connectivity = getattr(planner_class, "connectivity", None)
         
         for attempt in range(max_block_attempts):
+            # Cheap connectivity check first - no need to search an already blocked grid
+            if connectivity and not ConnectivityOracle.from_env(env, connectivity=connectivity).is_reachable(
+                    env.agent_pos, env.goal_pos):
+                print(f"Path already blocked after {attempt} blocking attempts")
+                break
+
             # Set up planner
             planner = planner_class()
             planner.set_environment(
@@ -195,8 +209,17 @@ class EnvironmentGenerator:
             
         return environments, len(environments)
         
-    def save_environment(self, env, filename):
-        """Save environment to a JSON file."""
+    def save_environment(self, env, filename, distance_fields=False):
+        """
+        Save environment to a JSON file.
+
+        Args:
+            env (GridWorldEnv): The environment to save
+            filename (str): Target JSON file
+            distance_fields (bool): Also store the start/goal distance fields
+                next to the JSON file (see distance_fields.py); otherwise any
+                fields stored there before are removed
+        """
         env_data = {
             "grid_size": env.grid_size,
             "num_obstacles": env.num_obstacles,
@@ -208,6 +231,11 @@ class EnvironmentGenerator:
         with open(filename, 'w') as f:
             json.dump(env_data, f, indent=2)
 
+        if distance_fields:
+            save_distance_fields(env, filename)
+        else:
+            remove_distance_fields(filename)
+
 
 def main():
     """
@@ -222,6 +250,7 @@ def main():
     n = 1000  # Number of environments to generate
     grid_size = 15  # Larger grid to accommodate more obstacles
     num_obstacles = 15  # Many obstacles for complex explanations
+    distance_fields = True  # Store start/goal distance fields next to each environment
     
     # Create output directories
     base_dir = "environments"
@@ -254,7 +283,7 @@ def main():
     print(f"\nSaving {infeasible_count} infeasible environments...")
     for i, env in enumerate(infeasible_envs):
         filename = os.path.join(infeasible_dir, f"infeasible_env_{i+1:05d}.json")
-        generator.save_environment(env, filename)
+        generator.save_environment(env, filename, distance_fields=distance_fields)
         if (i + 1) % 1000 == 0:
             print(f"Saved {i+1}/{infeasible_count} infeasible environments")
     
@@ -275,7 +304,7 @@ def main():
     print(f"\nSaving {feasible_count} feasible environments...")
     for i, env in enumerate(feasible_envs):
         filename = os.path.join(feasible_dir, f"feasible_env_{i+1:05d}.json")
-        generator.save_environment(env, filename)
+        generator.save_environment(env, filename, distance_fields=distance_fields)
         if (i + 1) % 1000 == 0:
             print(f"Saved {i+1}/{feasible_count} feasible environments")
     
@@ -1,8 +1,10 @@
 import os
-import json
 import random
+from concurrent.futures import ProcessPoolExecutor
 from grid_world_env import GridWorldEnv
 from path_planning.astar import AStarPlanner
+from path_planning.connectivity import ConnectivityOracle
+from contrastive_pair_store import ContrastivePairStore, PAIR_STORE_FILENAME
 
 class ContrastiveEnvironmentGenerator:
     def __init__(self, grid_size=10, num_obstacles=6, seed=42):
@@ -10,19 +12,17 @@ class ContrastiveEnvironmentGenerator:
         self.num_obstacles = num_obstacles
         self.rng = random.Random(seed)  # Use local RNG
         os.makedirs("contrastive_envs", exist_ok=True)
+        self.store = ContrastivePairStore(os.path.join("contrastive_envs", PAIR_STORE_FILENAME))
 
     def plan_path(self, env):
-        planner = AStarPlanner()
-        planner.set_environment(
-            start=env.agent_pos,
-            goal=env.goal_pos,
-            grid_size=env.grid_size,
-            obstacles=env.obstacles
-        )
-        return planner.plan()
+        return plan_path(env)
 
     def is_valid_path(self, path):
-        return path and len(path) > 1
+        return is_valid_path(path)
+
+    def apply_perturbation(self, env, strategy):
+        """Apply one perturbation strategy ('remove', 'move' or 'mutate') to env in place"""
+        apply_perturbation(env, strategy, self.rng, self.grid_size)
 
     def perturb_environment(self, env):
         strategies = ['remove', 'move', 'mutate']
@@ -30,36 +30,11 @@ class ContrastiveEnvironmentGenerator:
 
         for strategy in strategies:
             new_env = env.clone()
+            self.apply_perturbation(new_env, strategy)
 
-            if strategy == 'remove':
-                if new_env.obstacle_shapes:
-                    obs_id = self.rng.choice(list(new_env.obstacle_shapes.keys()))
-                    del new_env.obstacle_shapes[obs_id]
-                    new_env.update_obstacles_from_shapes()
-
-            elif strategy == 'move':
-                if new_env.obstacle_shapes:
-                    obs_id = self.rng.choice(list(new_env.obstacle_shapes.keys()))
-                    shape = new_env.obstacle_shapes[obs_id]
-                    dx, dy = self.rng.choice([(-1,0), (1,0), (0,-1), (0,1)])
-                    new_shape = [
-                        (max(0, min(self.grid_size - 1, x + dx)),
-                         max(0, min(self.grid_size - 1, y + dy)))
-                        for x, y in shape
-                    ]
-                    new_env.obstacle_shapes[obs_id] = new_shape
-                    new_env.update_obstacles_from_shapes()
-
-            elif strategy == 'mutate':
-                if len(new_env.obstacle_shapes) >= 2:
-                    ids = self.rng.sample(list(new_env.obstacle_shapes.keys()), 2)
-                    grow_id, shrink_id = ids
-                    grow_shape = new_env.obstacle_shapes[grow_id]
-                    shrink_shape = new_env.obstacle_shapes[shrink_id]
-                    if shrink_shape:
-                        moved = shrink_shape.pop()
-                        grow_shape.append(moved)
-                        new_env.update_obstacles_from_shapes()
+            # Skip the search entirely when the perturbation disconnects start and goal
+            if not ConnectivityOracle.from_env(new_env).is_reachable(new_env.agent_pos, new_env.goal_pos):
+                continue
 
             new_path = self.plan_path(new_env)
             if self.is_valid_path(new_path):
@@ -68,30 +43,10 @@ class ContrastiveEnvironmentGenerator:
         return None, None
 
     def save_pair(self, i, env_a, path_a, env_b, path_b):
-        pair_dir = os.path.join("contrastive_envs", f"pair_{i:03d}")
-        os.makedirs(pair_dir, exist_ok=True)
-        output = {
-            "original_environment": {
-                "grid_size": env_a.grid_size,
-                "num_obstacles": env_a.num_obstacles,
-                "agent_pos": env_a.agent_pos,
-                "goal_pos": env_a.goal_pos,
-                "obstacle_shapes": env_a.obstacle_shapes,
-                "path": path_a
-            },
-            "contrastive_environment": {
-                "grid_size": env_b.grid_size,
-                "num_obstacles": env_b.num_obstacles,
-                "agent_pos": env_b.agent_pos,
-                "goal_pos": env_b.goal_pos,
-                "obstacle_shapes": env_b.obstacle_shapes,
-                "path": path_b
-            }
-        }
-        with open(os.path.join(pair_dir, "pair.json"), "w") as f:
-            json.dump(output, f, indent=2)
+        self.store.append(f"pair_{i:03d}", env_a, path_a, env_b, path_b)
 
     def generate(self, count=100, attempts_per_env=50):
+        self.store.clear()
         success = 0
         seed_for_env = 0 #self.rng.randint(0, 999999)
         for i in range(count):
@@ -100,6 +55,9 @@ class ContrastiveEnvironmentGenerator:
                 env = GridWorldEnv(grid_size=self.grid_size, num_obstacles=self.num_obstacles, seed=seed_for_env)
                 env.agent_pos = env.generate_random_position()
                 env.goal_pos = env.generate_random_position()
+                if not ConnectivityOracle.from_env(env).is_reachable(env.agent_pos, env.goal_pos):
+                    continue
+
                 path_a = self.plan_path(env)
 
                 if not self.is_valid_path(path_a):
@@ -118,7 +76,191 @@ class ContrastiveEnvironmentGenerator:
 
         print(f"\nFinished. Total contrastive pairs generated: {success}/{count}")
 
+    def generate_parallel(self, count=100, pairs_per_env=10, attempts_per_env=100, workers=None, batch_size=None,
+                          max_base_envs=None):
+        """
+        Generate contrastive pairs with a process pool.
+
+        Each task builds one base environment, plans it once and derives up to
+        pairs_per_env contrastive perturbations from it. Tasks are submitted in
+        batches and their results are saved in seed order, so the output is
+        deterministic for a given generator seed regardless of scheduling.
+
+        Args:
+            count: Number of pairs to generate
+            pairs_per_env: Maximum pairs derived from one base environment
+            attempts_per_env: Maximum perturbations tried per base environment
+            workers: Number of worker processes (defaults to os.cpu_count())
+            batch_size: Number of base environments submitted per round
+            max_base_envs: Upper bound on base environments tried (defaults to 50 per requested pair)
+        """
+        workers = workers or os.cpu_count() or 1
+        batch_size = batch_size or workers * 4
+        max_base_envs = max_base_envs or count * 50
+        self.store.clear()
+        success = 0
+        seed_for_env = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while success < count and seed_for_env < max_base_envs:
+                tasks = []
+                for _ in range(batch_size):
+                    seed_for_env += 1
+                    tasks.append((self.grid_size, self.num_obstacles, self.rng.randrange(2**32),
+                                  seed_for_env, pairs_per_env, attempts_per_env))
+
+                for pairs in executor.map(_pairs_for_seed, tasks):
+                    for env_a, path_a, env_b, path_b in pairs:
+                        if success >= count:
+                            break
+                        self.save_pair(success, env_a, path_a, env_b, path_b)
+                        success += 1
+
+                print(f"[✓] {success}/{count} pairs saved ({seed_for_env} base environments)")
+
+        print(f"\nFinished. Total contrastive pairs generated: {success}/{count}")
+
+
+def plan_path(env):
+    planner = AStarPlanner()
+    planner.set_environment(
+        start=env.agent_pos,
+        goal=env.goal_pos,
+        grid_size=env.grid_size,
+        obstacles=env.obstacles
+    )
+    return planner.plan()
+
+
+def is_valid_path(path):
+    return path and len(path) > 1
+
+
+def apply_perturbation(env, strategy, rng, grid_size):
+    """Apply one perturbation strategy ('remove', 'move' or 'mutate') to env in place"""
+    if strategy == 'remove':
+        if env.obstacle_shapes:
+            obs_id = rng.choice(list(env.obstacle_shapes.keys()))
+            del env.obstacle_shapes[obs_id]
+            env.update_obstacles_from_shapes()
+
+    elif strategy == 'move':
+        if env.obstacle_shapes:
+            obs_id = rng.choice(list(env.obstacle_shapes.keys()))
+            shape = env.obstacle_shapes[obs_id]
+            dx, dy = rng.choice([(-1,0), (1,0), (0,-1), (0,1)])
+            new_shape = [
+                (max(0, min(grid_size - 1, x + dx)),
+                 max(0, min(grid_size - 1, y + dy)))
+                for x, y in shape
+            ]
+            env.obstacle_shapes[obs_id] = new_shape
+            env.update_obstacles_from_shapes()
+
+    elif strategy == 'mutate':
+        if len(env.obstacle_shapes) >= 2:
+            ids = rng.sample(list(env.obstacle_shapes.keys()), 2)
+            grow_id, shrink_id = ids
+            grow_shape = env.obstacle_shapes[grow_id]
+            shrink_shape = env.obstacle_shapes[shrink_id]
+            if shrink_shape:
+                moved = shrink_shape.pop()
+                grow_shape.append(moved)
+                env.update_obstacles_from_shapes()
+
+
+def contrastive_perturbations(env, path, rng, grid_size, max_pairs=10, max_attempts=100):
+    """
+    Derive several contrastive environments from one base environment.
+
+    The base plan is computed once by the caller and reused to reject
+    candidates without searching: a perturbation that frees no cell and
+    blocks no cell of the base path leaves the A* result unchanged, so it
+    can never yield a contrastive pair. Duplicate obstacle layouts are also
+    skipped.
+
+    Args:
+        env: Base environment with a valid path
+        path: Cached A* path of the base environment
+        rng: random.Random driving the perturbations
+        grid_size: Width/height of the grid, bounds moved shapes
+        max_pairs: Maximum number of contrastive environments to return
+        max_attempts: Maximum number of perturbations to try
+
+    Returns:
+        list: (perturbed_env, perturbed_path) tuples
+    """
+    base_cells = frozenset(tuple(o) for o in env.obstacles)
+    path_cells = set(tuple(p) for p in path)
+    seen = {base_cells}
+    strategies = ['remove', 'move', 'mutate']
+    pairs = []
+
+    for _ in range(max_attempts):
+        if len(pairs) >= max_pairs:
+            break
+
+        new_env = env.clone()
+        apply_perturbation(new_env, rng.choice(strategies), rng, grid_size)
+
+        cells = frozenset(tuple(o) for o in new_env.obstacles)
+        if cells in seen:
+            continue
+        seen.add(cells)
+
+        # Only added obstacles off the base path: the cached plan is still the answer
+        if base_cells <= cells and not (cells & path_cells):
+            continue
+
+        if not ConnectivityOracle.from_env(new_env).is_reachable(new_env.agent_pos, new_env.goal_pos):
+            continue
+
+        new_path = plan_path(new_env)
+        if is_valid_path(new_path) and new_path != path:
+            pairs.append((new_env, new_path))
+
+    return pairs
+
+
+def pairs_for_seed(grid_size, num_obstacles, rng, env_seed, max_pairs=10, max_attempts=100):
+    """
+    Build a base environment from a seed and derive its contrastive pairs.
+
+    Touches no files, so it can run in pool workers as is.
+
+    Args:
+        grid_size: Width/height of the grid
+        num_obstacles: Number of obstacle shapes of the base environment
+        rng: random.Random driving the perturbations
+        env_seed: Seed for GridWorldEnv obstacle generation
+        max_pairs: Maximum number of pairs to derive from this base environment
+        max_attempts: Maximum number of perturbations to try
+
+    Returns:
+        list: (env_a, path_a, env_b, path_b) tuples
+    """
+    env = GridWorldEnv(grid_size=grid_size, num_obstacles=num_obstacles, seed=env_seed)
+    env.agent_pos = env.generate_random_position()
+    env.goal_pos = env.generate_random_position()
+    if not ConnectivityOracle.from_env(env).is_reachable(env.agent_pos, env.goal_pos):
+        return []
+
+    path_a = plan_path(env)
+    if not is_valid_path(path_a):
+        return []
+
+    return [
+        (env, path_a, env_b, path_b)
+        for env_b, path_b in contrastive_perturbations(env, path_a, rng, grid_size, max_pairs, max_attempts)
+    ]
+
+
+def _pairs_for_seed(task):
+    """Process pool entry point: derive the contrastive pairs of one base environment"""
+    grid_size, num_obstacles, rng_seed, env_seed, max_pairs, max_attempts = task
+    return pairs_for_seed(grid_size, num_obstacles, random.Random(rng_seed), env_seed, max_pairs, max_attempts)
+
 
 if __name__ == "__main__":
     gen = ContrastiveEnvironmentGenerator(grid_size=12, num_obstacles=10)
-    gen.generate(count=10000)
+    gen.generate_parallel(count=10000)
@@ -3,6 +3,8 @@ import random
 import matplotlib.pyplot as plt
 from matplotlib import colormaps
 from collections import defaultdict
+from path_planning.batched_reachability import batch_path_exists, batch_path_lengths, coalition_stack
+from path_planning.distance_field import UNREACHABLE
 
 class AnchorsExplainer:
     """
@@ -123,6 +125,17 @@ class AnchorsExplainer:
         
         anchor_results = {}
         original_obstacles = self.env.obstacles.copy()
+
+        # Removing shapes only changes an optimal planner's path length through
+        # the BFS distance, and a flood-fill planner's feasibility through
+        # reachability, so their samples are evaluated in bulk on NumPy grids
+        connectivity = getattr(self.planner, "connectivity", None)
+        if self.env.agent_pos is None or self.env.goal_pos is None:
+            batched = False
+        elif original_path:
+            batched = perturbation_mode == "remove" and getattr(self.planner, "optimal", False)
+        else:
+            batched = perturbation_mode == "remove" and connectivity is not None
         total_iterations = len(candidate_anchors) * num_samples
         iteration = 0
         
@@ -131,8 +144,7 @@ class AnchorsExplainer:
             if callback and anchor_idx % 5 == 0:
                 callback(anchor_idx, len(candidate_anchors))
                 
-            samples_results = []
-
+            combinations = []
             for sample_idx in range(num_samples):
                 # Build a perturbation that satisfies this anchor rule
                 combination = []
@@ -141,25 +153,41 @@ class AnchorsExplainer:
                         combination.append(anchor_rule[i])
                     else:
                         combination.append(random.randint(0, 1))
+                combinations.append(combination)
 
-                original_state, _ = self.env.generate_perturbation(combination=combination, mode=perturbation_mode)
-                path = self.planner.plan()
-                
-                # Handle path comparison more carefully
-                if original_path and path:
-                    path_changed = abs(len(path) - len(original_path)) > 1
-                elif bool(original_path) != bool(path):  # One exists and one doesn't
-                    path_changed = True
+            if batched:
+                # All samples of the rule are flooded at once
+                stack = coalition_stack(self.env, combinations)
+                if original_path:
+                    lengths = batch_path_lengths(stack, self.env.agent_pos, self.env.goal_pos)
+                    samples_results = [bool(length == UNREACHABLE or abs(length - len(original_path)) > 1)
+                                       for length in lengths]
                 else:
-                    path_changed = False  # Both don't exist
-                    
-                samples_results.append(path_changed)
-
-                self.env.restore_from_perturbation(original_state)
-                
-                iteration += 1
-                if callback and iteration % 10 == 0:
+                    reachable = batch_path_exists(stack, self.env.agent_pos, self.env.goal_pos, connectivity)
+                    samples_results = [bool(found) for found in reachable]
+                iteration += num_samples
+                if callback:
                     callback(iteration, total_iterations)
+            else:
+                samples_results = []
+                for combination in combinations:
+                    original_state, _ = self.env.generate_perturbation(combination=combination, mode=perturbation_mode)
+                    # Handle path comparison more carefully
+                    if original_path:
+                        path = self.planner.plan(obstacles=self.env.obstacles)
+                        # A lost path counts as a change too
+                        path_changed = not path or abs(len(path) - len(original_path)) > 1
+                    else:
+                        # Without an original path only a feasibility flip is a change
+                        path_changed = self.planner.path_exists(obstacles=self.env.obstacles)
+
+                    samples_results.append(path_changed)
+
+                    self.env.restore_from_perturbation(original_state)
+
+                    iteration += 1
+                    if callback and iteration % 10 == 0:
+                        callback(iteration, total_iterations)
 
             if samples_results:
                 outcome_counts = defaultdict(int)
@@ -1,6 +1,9 @@
 import numpy as np
 import random
 from sklearn.linear_model import Ridge
+from distance_fields import optimal_path_length
+from path_planning.batched_reachability import batch_path_lengths, coalition_stack
+from path_planning.distance_field import UNREACHABLE
 
 class LimeExplainer:
     """
@@ -25,6 +28,8 @@ class LimeExplainer:
         self.env = env.clone()
         self.planner = planner
         self.grid_size = env.grid_size
+        # Path length of the unperturbed environment from precomputed distance fields, if any
+        self.baseline_available, self.baseline_path_length = optimal_path_length(env, planner)
     
     def explain(self, num_samples=100, callback=None, strategy="remove_each_obstacle_once", perturbation_mode="remove"):
         """
@@ -78,6 +83,22 @@ class LimeExplainer:
         original_obstacles = self.env.obstacles.copy()
         original_obstacle_shapes = {k: v.copy() for k, v in self.env.obstacle_shapes.items()}
         
+        # Ensure combination lengths match original obstacle count
+        for i, combination in enumerate(all_combinations):
+            if len(combination) > num_obstacles:
+                # Trim combination if too long
+                all_combinations[i] = combination[:num_obstacles]
+            elif len(combination) < num_obstacles:
+                # Extend combination if too short
+                all_combinations[i] = combination + [1] * (num_obstacles - len(combination))
+
+        # Removing shapes only changes an optimal planner's path length through
+        # the BFS distance, so all samples are flooded at once instead of planned
+        batched_lengths = None
+        if perturbation_mode == "remove" and getattr(self.planner, "optimal", False):
+            stack = coalition_stack(self.env, all_combinations)
+            batched_lengths = batch_path_lengths(stack, self.env.agent_pos, self.env.goal_pos)
+
         # Process each combination
         total_combinations = len(all_combinations)
         
@@ -86,19 +107,22 @@ class LimeExplainer:
             if callback:
                 callback(i, total_combinations)
             
-            # Ensure combination length matches original obstacle count
-            if len(combination) != num_obstacles:
-                if len(combination) > num_obstacles:
-                    # Trim combination if too long
-                    combination = combination[:num_obstacles]
-                else:
-                    # Extend combination if too short
-                    combination = combination + [1] * (num_obstacles - len(combination))
-            
             # Reset environment to original state before each perturbation
             self.env.obstacles = original_obstacles.copy()
             self.env.obstacle_shapes = {k: v.copy() for k, v in original_obstacle_shapes.items()}
             
+            # The unperturbed baseline can be read from the distance fields
+            if self.baseline_available and all(combination):
+                X.append(combination)
+                y.append(self.baseline_path_length if self.baseline_path_length else self.grid_size * 2)
+                continue
+
+            if batched_lengths is not None:
+                X.append(combination)
+                path_length = int(batched_lengths[i])
+                y.append(path_length if path_length != UNREACHABLE else self.grid_size * 2)
+                continue
+
             # Apply perturbation using the fixed-length combination
             original_state, _ = self.env.generate_perturbation(
                 combination=combination,
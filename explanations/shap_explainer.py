@@ -4,6 +4,9 @@ import itertools
 from collections import defaultdict
 import matplotlib.pyplot as plt
 import copy
+from distance_fields import optimal_path_length
+from path_planning.batched_reachability import batch_path_lengths, coalition_stack
+from path_planning.distance_field import UNREACHABLE
 
 class SHAPExplainer:
     def __init__(self):
@@ -12,11 +15,21 @@ class SHAPExplainer:
         self.grid_size = None
         self.baseline_path = None
         self.baseline_path_length = None
+        self.baseline_from_distance_fields = False
 
     def set_environment(self, env, planner):
         self.env = env.clone()
         self.planner = planner
         self.grid_size = env.grid_size
+
+        # Read the baseline from precomputed distance fields instead of replanning
+        available, length = optimal_path_length(env, planner)
+        self.baseline_from_distance_fields = available
+        if available:
+            self.baseline_path = None
+            self.baseline_path_length = length if length else self.get_penalty_value()
+            return
+
         self.baseline_path = planner.plan()
         self.baseline_path_length = len(self.baseline_path) if self.baseline_path else self.get_penalty_value()
 
@@ -35,6 +48,8 @@ class SHAPExplainer:
         # Initialize SHAP values with fixed obstacle keys
         shap_values = {shape_id: 0 for shape_id in obstacle_keys}
         evaluated_combinations = {}
+        if self.baseline_from_distance_fields:
+            evaluated_combinations[tuple([1] * num_obstacles)] = self.baseline_path_length
 
         baseline_path_length = self.compute_path_length([1] * num_obstacles, evaluated_combinations, perturbation_mode)
 
@@ -54,12 +69,16 @@ class SHAPExplainer:
             obstacle_order = list(range(num_obstacles))
             random.shuffle(obstacle_order)
 
+            # Plan every prefix of this order in one batch
             current_combination = [1] * num_obstacles
-            prev_path_length = baseline_path_length
-
+            combinations = []
             for obs_idx in obstacle_order:
                 current_combination[obs_idx] = 0
-                new_path_length = self.compute_path_length(current_combination, evaluated_combinations, perturbation_mode)
+                combinations.append(list(current_combination))
+            path_lengths = self.compute_path_lengths(combinations, evaluated_combinations, perturbation_mode)
+
+            prev_path_length = baseline_path_length
+            for obs_idx, new_path_length in zip(obstacle_order, path_lengths):
                 marginal_contribution = prev_path_length - new_path_length
                 shap_values[obstacle_keys[obs_idx]] += marginal_contribution
                 prev_path_length = new_path_length
@@ -77,11 +96,14 @@ class SHAPExplainer:
             print(f"SHAP value range: min={min(all_vals)}, max={max(all_vals)}")
 
         print("\n[SHAP DEBUG] Baseline path length (all obstacles):", baseline_path_length)
+        single_removals = []
         for shape_id in obstacle_keys:
             combo = [1] * num_obstacles
             idx = obstacle_keys.index(shape_id)
             combo[idx] = 0
-            length = self.compute_path_length(combo, None, perturbation_mode)
+            single_removals.append(combo)
+        lengths = self.compute_path_lengths(single_removals, None, perturbation_mode)
+        for shape_id, length in zip(obstacle_keys, lengths):
             print(f"Removing obstacle #{shape_id}: path length = {length}")
                 
 
@@ -91,52 +113,54 @@ class SHAPExplainer:
         return shap_values
 
     def compute_path_length(self, combination, cache=None, perturbation_mode="remove"):
-        if cache is not None:
+        return self.compute_path_lengths([combination], cache, perturbation_mode)[0]
+
+    def compute_path_lengths(self, combinations, cache=None, perturbation_mode="remove"):
+        # Uncached combinations are evaluated as one batch: optimal planners'
+        # path lengths are BFS distances, so all coalitions are flooded at once
+        # in NumPy; other planners get one plan_many() batch with one obstacle
+        # mask per combination instead of an environment clone and a fresh
+        # planner each
+        path_lengths = [None] * len(combinations)
+        pending = []
+        slots = defaultdict(list)
+        for i, combination in enumerate(combinations):
             key = tuple(combination)
-            if key in cache:
-                return cache[key]
-
-        # Create a completely new environment clone for this computation
-        env_clone = self.env.clone()
-        
-        # Get current obstacle IDs from the clone
-        all_shape_ids = list(env_clone.obstacle_shapes.keys())
-        
-        # Ensure combination length matches current obstacle count
-        if len(combination) != len(all_shape_ids):
-            if len(combination) > len(all_shape_ids):
-                combination = combination[:len(all_shape_ids)]
-            else:
-                combination = combination + [1] * (len(all_shape_ids) - len(combination))
-
-        # Apply the perturbation to the clone
-        for i, val in enumerate(combination):
-            if i < len(all_shape_ids) and val == 0:  # Remove this obstacle
-                shape_id = all_shape_ids[i]
-                if shape_id in env_clone.obstacle_shapes:
-                    points_to_remove = env_clone.obstacle_shapes[shape_id]
-                    env_clone.obstacles = [p for p in env_clone.obstacles if p not in points_to_remove]
-                    del env_clone.obstacle_shapes[shape_id]
-
-        # Use the cloned environment for path calculation
-        planner_class = type(self.planner)
-        planner = planner_class()
-        planner.set_environment(
-            start=env_clone.agent_pos,
-            goal=env_clone.goal_pos,
-            grid_size=env_clone.grid_size,
-            obstacles=env_clone.obstacles
-        )
-        path = planner.plan()
-
-        path_length = len(path) if path else self.get_penalty_value()
-        
-        # No need to restore - we used a clone
-        
-        if cache is not None:
-            cache[tuple(combination)] = path_length
-
-        return path_length
+            if cache is not None and key in cache:
+                path_lengths[i] = cache[key]
+                continue
+            if key not in slots:
+                pending.append(key)
+            slots[key].append(i)
+
+        if not pending:
+            return path_lengths
+
+        start, goal = self.env.agent_pos, self.env.goal_pos
+        if getattr(self.planner, "optimal", False):
+            lengths = batch_path_lengths(coalition_stack(self.env, pending), start, goal)
+            new_lengths = [int(length) if length != UNREACHABLE else self.get_penalty_value() for length in lengths]
+        else:
+            masks = {key: self.perturbed_obstacles(key) for key in pending}
+            paths = self.planner.plan_many([(start, goal, key) for key in pending], obstacle_masks=masks)
+            new_lengths = [len(path) if path else self.get_penalty_value() for path in paths]
+
+        for key, path_length in zip(pending, new_lengths):
+            if cache is not None:
+                cache[key] = path_length
+            for i in slots[key]:
+                path_lengths[i] = path_length
+
+        return path_lengths
+
+    def perturbed_obstacles(self, combination):
+        # Obstacle cells left after removing the shapes marked 0 in combination
+        all_shape_ids = list(self.env.obstacle_shapes.keys())
+        removed = set()
+        for i, val in enumerate(combination[:len(all_shape_ids)]):
+            if val == 0:
+                removed.update(tuple(p) for p in self.env.obstacle_shapes[all_shape_ids[i]])
+        return [p for p in self.env.obstacles if tuple(p) not in removed]
     
     def get_penalty_value(self):
         # Return a large constant penalty for infeasible paths
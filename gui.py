@@ -59,6 +59,7 @@ class PathPlanningApp:
         self.current_step = 0
         self.animation_speed = 200  # milliseconds
         self.animation_running = False
+        self.animation_run = 0  # Bumped per animation, so a newer run stops older ones
         self.setting_start = False
         self.setting_goal = False
 
@@ -676,7 +677,6 @@ class PathPlanningApp:
             self.status_var.set("Unknown algorithm selected.")
 
     def visualize_planner(self, planner_class, name=""):
-        self.start_time = time.time()
         planner = planner_class()
         state = self.env.get_state()
         planner.set_environment(
@@ -685,28 +685,64 @@ class PathPlanningApp:
             grid_size=state["grid_size"],
             obstacles=state["obstacles"]
         )
+
+        if self.visualization_mode == "step":
+            self.animate_planner(planner, name)
+            return
+
+        self.animation_running = False
+        self.start_time = time.time()
         path, steps = planner.plan(return_steps=True)
         execution_time = time.time() - self.start_time
 
         self.algorithm_steps = steps
         self.current_step = len(steps) - 1 if steps else 0
-
-        if steps and self.visualization_mode == "final":
+        if steps:
             self.draw_step(self.current_step)
-        elif steps and self.visualization_mode == "step":
-            self.animation_running = True
-            self.current_step = 0
+        self.finish_visualization(path, name, execution_time)
+
+    def animate_planner(self, planner, name=""):
+        """
+        Animate a planner while it runs.
+
+        One step is pulled from planner.iter_steps() per animation frame, so
+        drawing starts right away and only the current step is held in memory.
+        The full history is kept only when the JSON export or the mosaic needs it.
+        The animation stops once the map is reset or another run starts.
+        """
+        step_iter = planner.iter_steps()
+        keep_steps = self.json or self.mosaic
+        self.algorithm_steps = []
+        self.current_step = 0
+        self.animation_running = True
+        self.animation_run += 1
+        run = self.animation_run
+        planning_time = 0.0
+
+        def process_step():
+            nonlocal planning_time
+            if not self.animation_running or self.animation_run != run:
+                return
+            # Only time the planner, not the drawing between frames
+            step_start = time.time()
+            try:
+                step = next(step_iter)
+            except StopIteration as stop:
+                planning_time += time.time() - step_start
+                self.animation_running = False
+                self.finish_visualization(stop.value, name, planning_time)
+                return
+            planning_time += time.time() - step_start
 
-            def process_step():
-                if self.current_step < len(self.algorithm_steps):
-                    self.draw_step(self.current_step)
-                    self.current_step += 1
-                    self.root.after(self.animation_speed, process_step)
-                else:
-                    self.animation_running = False
+            if keep_steps:
+                self.algorithm_steps.append(step)
+            self.draw_step_data(step, self.current_step)
+            self.current_step += 1
+            self.root.after(self.animation_speed, process_step)
 
-            self.root.after(100, process_step)
+        self.root.after(100, process_step)
 
+    def finish_visualization(self, path, name, execution_time):
         if path:
             self.status_var.set(f"{name}: Path found! Length: {len(path)-1}")
         else:
@@ -733,8 +769,9 @@ class PathPlanningApp:
     def draw_step(self, step_idx):
         if step_idx >= len(self.algorithm_steps):
             return
-            
-        step_data = self.algorithm_steps[step_idx]
+        self.draw_step_data(self.algorithm_steps[step_idx], step_idx)
+
+    def draw_step_data(self, step_data, step_idx):
         self.current_step = step_idx
         
         # Draw grid
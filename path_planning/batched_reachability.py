@@ -0,0 +1,158 @@
+import numpy as np
+
+from .distance_field import UNREACHABLE
+
+
+def occupancy_stack(grid_size, obstacle_lists):
+    """
+    Stack the occupancy grids of several obstacle lists.
+
+    Args:
+        grid_size: Width/height of the square grid
+        obstacle_lists: Sequence of K obstacle lists
+
+    Returns:
+        (K, grid_size, grid_size) bool array, True where a cell is blocked
+    """
+    stack = np.zeros((len(obstacle_lists), grid_size, grid_size), dtype=bool)
+    for k, obstacles in enumerate(obstacle_lists):
+        cells = _on_grid(obstacles, grid_size)
+        if len(cells):
+            stack[k, cells[:, 0], cells[:, 1]] = True
+    return stack
+
+
+def coalition_stack(env, combinations):
+    """
+    Occupancy grids of an environment with obstacle shapes removed.
+
+    Args:
+        env: GridWorldEnv whose obstacle_shapes are switched on and off
+        combinations: K lists with one entry per shape (in obstacle_shapes
+            order), 0 to remove the shape and 1 to keep it
+
+    Returns:
+        (K, grid_size, grid_size) bool array, True where a cell is blocked
+    """
+    n = env.grid_size
+    base = occupancy_stack(n, [env.obstacles])[0]
+    shapes = occupancy_stack(n, list(env.obstacle_shapes.values()))
+    if not len(combinations):
+        return np.zeros((0, n, n), dtype=bool)
+
+    removed = np.asarray(combinations)[:, :len(shapes)] == 0
+    # Cells of every removed shape, one matrix product for all K coalitions
+    cleared = (removed.astype(np.int32) @ shapes.reshape(len(shapes), -1).astype(np.int32)) > 0
+    return base[None] & ~cleared.reshape(-1, n, n)
+
+
+def frontier_reachability(stack, start, goal=None, distances=False, connectivity=4):
+    """
+    Flood fill K occupancy grids from the same start at once.
+
+    Every iteration dilates the frontiers of all K grids by one move with
+    array shifts, so the Python-level work is one loop per BFS layer instead
+    of one search per grid. As with the grid planners, the start itself is
+    never tested against the obstacles.
+
+    Args:
+        stack: (K, H, W) bool array, True where a cell is blocked
+        start: Start cell [row, col]
+        goal: Stop once every grid has reached this cell or run out of frontier
+        distances: Also return the number of moves from the start to each cell
+        connectivity: 4 for the grid planners (A*, BFS, ...), 8 for Theta*
+
+    Returns:
+        (K, H, W) bool array of reached cells, or with distances=True a
+        (K, H, W) int32 array of move counts, UNREACHABLE where not reached
+    """
+    if connectivity not in (4, 8):
+        raise ValueError(f"Unsupported connectivity: {connectivity}")
+
+    k, h, w = stack.shape
+    reached = np.zeros((k, h, w), dtype=bool)
+    dist = np.full((k, h, w), UNREACHABLE, dtype=np.int32) if distances else None
+    if not (0 <= start[0] < h and 0 <= start[1] < w):
+        return dist if distances else reached
+
+    free = ~stack
+    reached[:, start[0], start[1]] = True
+    if distances:
+        dist[:, start[0], start[1]] = 0
+    on_grid_goal = goal is not None and 0 <= goal[0] < h and 0 <= goal[1] < w
+
+    frontier = reached.copy()
+    layer = 0
+    while True:
+        grown = _dilate(frontier, connectivity) & free & ~reached
+        if not grown.any():
+            break
+        layer += 1
+        reached |= grown
+        if distances:
+            dist[grown] = layer
+        frontier = grown
+        if on_grid_goal:
+            active = frontier.any(axis=(1, 2))
+            if (reached[:, goal[0], goal[1]] | ~active).all():
+                break
+
+    return dist if distances else reached
+
+
+def batch_path_exists(stack, start, goal, connectivity=4):
+    """
+    Whether the goal can be reached from the start in each of K grids.
+
+    Same answers as GridSearch.path_exists on each grid.
+
+    Returns:
+        (K,) bool array
+    """
+    k, h, w = stack.shape
+    if not (0 <= start[0] < h and 0 <= start[1] < w and 0 <= goal[0] < h and 0 <= goal[1] < w):
+        return np.zeros(k, dtype=bool)
+    if start[0] == goal[0] and start[1] == goal[1]:
+        return np.ones(k, dtype=bool)
+    reached = frontier_reachability(stack, start, goal, connectivity=connectivity)
+    return reached[:, goal[0], goal[1]]
+
+
+def batch_path_lengths(stack, start, goal):
+    """
+    Shortest 4-connected path lengths from start to goal in each of K grids.
+
+    Lengths count cells like len(path) of the optimal grid planners (A*,
+    Dijkstra, BFS, ...) on the same grid.
+
+    Returns:
+        (K,) int32 array, UNREACHABLE where no path exists
+    """
+    k, h, w = stack.shape
+    if not (0 <= start[0] < h and 0 <= start[1] < w and 0 <= goal[0] < h and 0 <= goal[1] < w):
+        return np.full(k, UNREACHABLE, dtype=np.int32)
+    dist = frontier_reachability(stack, start, goal, distances=True)
+    moves = dist[:, goal[0], goal[1]]
+    return np.where(moves == UNREACHABLE, UNREACHABLE, moves + 1).astype(np.int32)
+
+
+def _on_grid(cells, grid_size):
+    # Shapes moved or clamped near the border can fall outside the grid
+    cells = np.asarray([(cell[0], cell[1]) for cell in cells], dtype=np.int64).reshape(-1, 2)
+    inside = ((cells >= 0) & (cells < grid_size)).all(axis=1)
+    return cells[inside]
+
+
+def _dilate(frontier, connectivity):
+    # Cells one move away from any frontier cell, per grid
+    grown = np.zeros_like(frontier)
+    grown[:, 1:, :] |= frontier[:, :-1, :]
+    grown[:, :-1, :] |= frontier[:, 1:, :]
+    grown[:, :, 1:] |= frontier[:, :, :-1]
+    grown[:, :, :-1] |= frontier[:, :, 1:]
+    if connectivity == 8:
+        grown[:, 1:, 1:] |= frontier[:, :-1, :-1]
+        grown[:, 1:, :-1] |= frontier[:, :-1, 1:]
+        grown[:, :-1, 1:] |= frontier[:, 1:, :-1]
+        grown[:, :-1, :-1] |= frontier[:, 1:, 1:]
+    return grown
@@ -0,0 +1,11 @@
+from .grid_search import GridPlanner, BIDIRECTIONAL_ASTAR
+
+
+class BidirectionalAStarPlanner(GridPlanner):
+    """A* grown from the start and the goal until the two searches meet"""
+
+    # Returns shortest 4-connected paths
+    optimal = True
+
+    policy = BIDIRECTIONAL_ASTAR
+    name = "Bidirectional A*"
@@ -0,0 +1,157 @@
+from .occupancy import cell_index
+
+
+class BitboardGrid:
+    """
+    Free space of a grid packed into one Python integer, for reachability.
+
+    Each row takes grid_size + 1 bits, the extra bit being an always-blocked
+    guard column, so a shift by 1 moves a cell sideways and a shift by the row
+    stride moves it vertically without ever wrapping into the next row.
+    Reachability grows the reached set one direction at a time with occluded
+    fills: O(log grid_size) shift/AND/OR doubling steps slide every reached
+    cell through its whole run of free cells. The fills repeat over all
+    directions until the set stops growing, so flood filling a large map costs
+    a few hundred big-integer operations instead of a Python-level visit per
+    cell.
+    """
+
+    def __init__(self, grid_size, obstacles, connectivity=4):
+        """
+        Pack the free cells of a grid.
+
+        Args:
+            grid_size: Width/height of the square grid
+            obstacles: List of obstacle cells
+            connectivity: 4 for the grid planners (A*, BFS, ...), 8 for Theta*
+        """
+        if connectivity not in (4, 8):
+            raise ValueError(f"Unsupported connectivity: {connectivity}")
+
+        n = grid_size
+        self.grid_size = n
+        self.connectivity = connectivity
+        self.stride = n + 1
+        # Every in-grid bit set: one n-bit row mask repeated every stride bits
+        all_rows = ((1 << (self.stride * n)) - 1) // ((1 << self.stride) - 1) * ((1 << n) - 1)
+        self.free = all_rows & ~self.mask(obstacles)
+
+        stride = self.stride
+        self.directions = [1, -1, stride, -stride]
+        if connectivity == 8:
+            self.directions += [stride + 1, stride - 1, -(stride - 1), -(stride + 1)]
+        # Occluded-fill propagators per direction, rebuilt after the free space changes
+        self._propagators = {}
+
+    @classmethod
+    def from_env(cls, env, connectivity=4):
+        """Build a bitboard for the current obstacles of a GridWorldEnv"""
+        return cls(env.grid_size, env.obstacles, connectivity=connectivity)
+
+    def bit(self, cell):
+        """Bit of a [row, col] cell, or 0 if it is off the grid"""
+        if cell_index(cell, self.grid_size) is None:
+            return 0
+        return 1 << (cell[0] * self.stride + cell[1])
+
+    def mask(self, cells):
+        """Integer with the bits of all on-grid cells set"""
+        n = self.grid_size
+        stride = self.stride
+        bits = bytearray((n * stride + 7) // 8)
+        for cell in cells:
+            # Shapes moved or clamped near the border can fall outside the grid
+            if cell_index(cell, n) is not None:
+                i = cell[0] * stride + cell[1]
+                bits[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bits, "little")
+
+    def clear(self, cells):
+        """Mark cells as free, e.g. after removing an obstacle shape"""
+        self.free |= self.mask(cells)
+        self._propagators = {}
+
+    def block(self, cells):
+        """Mark cells as blocked"""
+        self.free &= ~self.mask(cells)
+        self._propagators = {}
+
+    def _chain(self, direction):
+        # Level k holds the cells whose 2**k predecessors along direction,
+        # the cell included, are all free, paired with the shift 2**k * |direction|
+        chain = self._propagators.get(direction)
+        if chain is None:
+            chain = []
+            p = self.free
+            s = abs(direction)
+            limit = self.grid_size * abs(direction)
+            while p and s < limit:
+                chain.append((s, p))
+                p &= (p << s) if direction > 0 else (p >> s)
+                s *= 2
+            self._propagators[direction] = chain
+        return chain
+
+    def _fill(self, reached, direction):
+        if direction > 0:
+            for s, p in self._chain(direction):
+                reached |= p & (reached << s)
+        else:
+            for s, p in self._chain(direction):
+                reached |= p & (reached >> s)
+        return reached
+
+    def reachable(self, start, goal_bit=0):
+        """
+        Flood fill the free space from the start.
+
+        Like the grid planners, the start itself is never tested against the
+        obstacles.
+
+        Args:
+            start: Start cell [row, col]
+            goal_bit: Stop as soon as this bit is reached, 0 fills everything
+
+        Returns:
+            Integer bitset of the reached cells (0 if the start is off the grid)
+        """
+        reached = self.bit(start)
+        while reached:
+            previous = reached
+            for direction in self.directions:
+                reached = self._fill(reached, direction)
+                if reached & goal_bit:
+                    return reached
+            if reached == previous:
+                break
+        return reached
+
+    def path_exists(self, start, goal):
+        """
+        Whether the goal can be reached from the start.
+
+        Same answer as GridSearch.path_exists with this connectivity.
+
+        Args:
+            start: Start cell [row, col]
+            goal: Goal cell [row, col]
+
+        Returns:
+            True if a path exists
+        """
+        start_bit = self.bit(start)
+        goal_bit = self.bit(goal)
+        if not start_bit or not goal_bit:
+            return False
+        if start_bit == goal_bit:
+            return True
+        if not self.free & goal_bit:
+            return False
+        return bool(self.reachable(start, goal_bit) & goal_bit)
+
+    def cells(self, bits):
+        """[row, col] cells of the set bits of a bitset"""
+        stride = self.stride
+        # Least significant bit first
+        digits = bin(bits)[:1:-1]
+        return [list(divmod(i, stride)) for i, digit in enumerate(digits) if digit == "1"]
@@ -0,0 +1,115 @@
+from array import array
+
+from .occupancy import build_occupancy, cell_index
+
+# Neighbour offsets for the two move models used by the grid planners
+FOUR_CONNECTED = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+EIGHT_CONNECTED = FOUR_CONNECTED + [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+class ConnectivityOracle:
+    """
+    Connected-component labelling of a grid world used as a feasibility oracle.
+
+    One flood fill over the occupancy grid (O(H*W)) assigns every free cell the
+    id of its connected component. Afterwards, whether a path exists between any
+    start/goal pair is a constant-time label comparison, which is all the
+    environment generators need when filtering candidates.
+    """
+
+    def __init__(self, grid_size, obstacles, connectivity=4):
+        """
+        Label the free space of a grid.
+
+        Args:
+            grid_size: Width/height of the square grid
+            obstacles: List of obstacle cells
+            connectivity: 4 for the grid planners (A*, BFS, ...), 8 for Theta*
+        """
+        if connectivity not in (4, 8):
+            raise ValueError(f"Unsupported connectivity: {connectivity}")
+
+        self.grid_size = grid_size
+        self.connectivity = connectivity
+        self.occupancy = build_occupancy(grid_size, obstacles)
+        # 0 marks a blocked cell, components are numbered from 1
+        self.labels = array('i', bytes(4 * grid_size * grid_size))
+        self.num_components = 0
+        self._label_components()
+
+    @classmethod
+    def from_env(cls, env, connectivity=4):
+        """Build an oracle for the current obstacles of a GridWorldEnv"""
+        return cls(env.grid_size, env.obstacles, connectivity=connectivity)
+
+    def _label_components(self):
+        n = self.grid_size
+        occupancy = self.occupancy
+        labels = self.labels
+        offsets = FOUR_CONNECTED if self.connectivity == 4 else EIGHT_CONNECTED
+
+        label = 0
+        for seed in range(n * n):
+            if occupancy[seed] or labels[seed]:
+                continue
+
+            # Iterative flood fill of the component containing seed
+            label += 1
+            labels[seed] = label
+            stack = [seed]
+            while stack:
+                idx = stack.pop()
+                r, c = divmod(idx, n)
+                for dr, dc in offsets:
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < n and 0 <= nc < n:
+                        nidx = nr * n + nc
+                        if not occupancy[nidx] and not labels[nidx]:
+                            labels[nidx] = label
+                            stack.append(nidx)
+
+        self.num_components = label
+
+    def component(self, cell):
+        """Return the component id of a cell (0 if blocked or off the grid)"""
+        idx = cell_index(cell, self.grid_size)
+        return self.labels[idx] if idx is not None else 0
+
+    def _start_components(self, start):
+        # The planners never test the start cell itself against the obstacles,
+        # so a start covered by an obstacle can still leave through any free
+        # neighbour.
+        idx = cell_index(start, self.grid_size)
+        if idx is None:
+            return set()
+        if self.labels[idx]:
+            return {self.labels[idx]}
+
+        offsets = FOUR_CONNECTED if self.connectivity == 4 else EIGHT_CONNECTED
+        components = set()
+        for dr, dc in offsets:
+            label = self.component([start[0] + dr, start[1] + dc])
+            if label:
+                components.add(label)
+        return components
+
+    def is_reachable(self, start, goal):
+        """
+        Check whether the goal can be reached from the start.
+
+        Args:
+            start: Start position [row, col]
+            goal: Goal position [row, col]
+
+        Returns:
+            True if a planner using the same move model would find a path
+        """
+        if start is None or goal is None:
+            return False
+        if list(start) == list(goal):
+            return True
+
+        goal_label = self.component(goal)
+        if not goal_label:
+            return False
+        return goal_label in self._start_components(start)
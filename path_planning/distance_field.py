@@ -0,0 +1,143 @@
+from array import array
+from collections import deque
+
+from .occupancy import cell_index
+
+# Distance/next-hop marker for cells that cannot reach the source
+UNREACHABLE = -1
+
+
+def sweep(occupancy, grid_size, source_idx):
+    """
+    Breadth-first sweep over the free cells of a flat occupancy grid.
+
+    The source itself is always expanded, like the start cell of the grid
+    planners; every other cell is entered only if it is free.
+
+    Args:
+        occupancy: bytearray from build_occupancy
+        grid_size: Width/height of the square grid
+        source_idx: Flat index of the source cell
+
+    Returns:
+        (dist, next_hop): int32 arrays indexed like the occupancy grid with the
+        number of moves to the source and the neighbour one move closer to it,
+        UNREACHABLE where no path exists (next_hop is UNREACHABLE at the source)
+    """
+    n = grid_size
+    dist = array('i', [UNREACHABLE]) * (n * n)
+    next_hop = array('i', [UNREACHABLE]) * (n * n)
+
+    dist[source_idx] = 0
+    queue = deque([source_idx])
+    while queue:
+        idx = queue.popleft()
+        r, c = divmod(idx, n)
+        next_dist = dist[idx] + 1
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= nr < n and 0 <= nc < n:
+                nidx = nr * n + nc
+                if not occupancy[nidx] and dist[nidx] == UNREACHABLE:
+                    dist[nidx] = next_dist
+                    next_hop[nidx] = idx
+                    queue.append(nidx)
+    return dist, next_hop
+
+
+class GoalDistanceField:
+    """
+    Shortest 4-connected distances from every cell to one goal.
+
+    One O(H*W) sweep from the goal stores, for each cell, its distance and
+    the neighbour one move closer to the goal. Afterwards the shortest path
+    length from any start is a lookup and the path itself is O(path), so
+    many starts can be answered against the same goal and obstacle map.
+    Answers match what the optimal grid planners (A*, Dijkstra, BFS, ...)
+    return for the same start, goal and obstacles.
+    """
+
+    def __init__(self, grid_size, occupancy, goal):
+        """
+        Sweep the grid from the goal.
+
+        Args:
+            grid_size: Width/height of the square grid
+            occupancy: bytearray from build_occupancy
+            goal: Goal cell [row, col] on the grid
+        """
+        n = grid_size
+        self.grid_size = n
+        self.occupancy = occupancy
+        self.goal = goal
+        self.goal_idx = cell_index(goal, n)
+        if self.goal_idx is None:
+            raise ValueError(f"Goal {goal} is off the {n}x{n} grid")
+
+        if occupancy[self.goal_idx]:
+            # The planners never enter a blocked goal, so only the goal itself reaches it
+            self.dist = array('i', [UNREACHABLE]) * (n * n)
+            self.next_hop = array('i', [UNREACHABLE]) * (n * n)
+            self.dist[self.goal_idx] = 0
+        else:
+            self.dist, self.next_hop = sweep(occupancy, n, self.goal_idx)
+
+    def _first_hop(self, start_idx):
+        # The planners never test the start against the obstacles: a blocked
+        # start is left through its closest free neighbour
+        if self.dist[start_idx] != UNREACHABLE or not self.occupancy[start_idx]:
+            return start_idx
+        n = self.grid_size
+        r, c = divmod(start_idx, n)
+        best = None
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= nr < n and 0 <= nc < n:
+                nidx = nr * n + nc
+                d = self.dist[nidx]
+                if d != UNREACHABLE and not self.occupancy[nidx] and (best is None or d < self.dist[best]):
+                    best = nidx
+        return best
+
+    def distance(self, start):
+        """
+        Number of moves on a shortest path from start to the goal.
+
+        Returns:
+            int number of moves, or None if no path exists
+        """
+        start_idx = cell_index(start, self.grid_size)
+        if start_idx is None:
+            return None
+        hop = self._first_hop(start_idx)
+        if hop is None or self.dist[hop] == UNREACHABLE:
+            return None
+        return self.dist[hop] + (hop != start_idx)
+
+    def path_length(self, start):
+        """
+        Number of cells on a shortest path from start to the goal.
+
+        Returns:
+            int path length (as len(path) from an optimal planner), or None if infeasible
+        """
+        d = self.distance(start)
+        return None if d is None else d + 1
+
+    def path(self, start):
+        """
+        A shortest path from start to the goal.
+
+        Returns:
+            List of [row, col] cells starting with start, or None if no path exists
+        """
+        if self.distance(start) is None:
+            return None
+        n = self.grid_size
+        next_hop = self.next_hop
+        path = [start]
+        idx = self._first_hop(cell_index(start, n))
+        if idx != cell_index(start, n):
+            path.append(list(divmod(idx, n)))
+        while next_hop[idx] != UNREACHABLE:
+            idx = next_hop[idx]
+            path.append(list(divmod(idx, n)))
+        return path
@@ -0,0 +1,1019 @@
+import heapq
+import time
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .connectivity import EIGHT_CONNECTED, FOUR_CONNECTED
+from .distance_field import GoalDistanceField
+from .occupancy import build_occupancy, cell_index
+from .queries import chunks, normalize_queries
+from .tracing import DeltaRecorder, StepRecorder, collect_steps, run_steps, skip_none
+
+# Parent/g-score marker for cells that have not been reached yet
+UNSET = -1
+
+
+class SearchPolicy:
+    """
+    Describes how a grid planner drives the shared search kernel.
+
+    Args:
+        frontier: "best_first" (priority queue with g-score relaxation, A*/Dijkstra),
+            "greedy" (priority queue ordered by heuristic only, each node expanded
+            once), "jump" (A* over jump points, see GridSearch._jump_points),
+            "fifo" (BFS), "lifo" (DFS), or "bidirectional_fifo" /
+            "bidirectional_best_first" (BFS / A* grown from start and goal at once)
+        heuristic: Whether the Manhattan distance to the goal is part of the priority
+        queue: Priority queue of a "best_first" frontier: "heap" (binary heap of
+            (priority, id) tuples) or "bucket" (Dial's bucket queue, O(1) push
+            and pop because every move costs 1 and priorities are integers)
+    """
+
+    def __init__(self, frontier, heuristic=False, queue="heap"):
+        self.frontier = frontier
+        self.heuristic = heuristic
+        self.queue = queue
+
+    def with_queue(self, queue):
+        """Copy of this policy using a different priority queue"""
+        return SearchPolicy(self.frontier, self.heuristic, queue)
+
+
+ASTAR = SearchPolicy("best_first", heuristic=True)
+DIJKSTRA = SearchPolicy("best_first")
+GREEDY_BEST_FIRST = SearchPolicy("greedy", heuristic=True)
+JUMP_POINT = SearchPolicy("jump", heuristic=True)
+BREADTH_FIRST = SearchPolicy("fifo")
+DEPTH_FIRST = SearchPolicy("lifo")
+BIDIRECTIONAL_BREADTH_FIRST = SearchPolicy("bidirectional_fifo")
+BIDIRECTIONAL_ASTAR = SearchPolicy("bidirectional_best_first", heuristic=True)
+
+
+class GridSearch:
+    """
+    Search kernel shared by the 4-connected grid planners.
+
+    The grid is held in flat arrays indexed by r * grid_size + c: a bytearray
+    occupancy map and int32 g-score and parent arrays. Nodes are plain integer
+    ids, so membership tests are O(1) array lookups and heap entries are
+    (priority, id) tuples. Because ids preserve the row-major order of
+    [row, col] lists, ties break exactly as they did with list entries.
+    """
+
+    def __init__(self, grid_size, obstacles):
+        n = grid_size
+        self.grid_size = n
+        self.occupancy = build_occupancy(n, obstacles)
+        # Allocated by each search; path_exists() needs neither
+        self.g = None
+        self.parent = None
+        self.uses_g = False
+        # Jump point searches link parents across straight runs of cells
+        self.jumps = False
+        # Bidirectional searches grow a second tree from the goal; tracers see
+        # that tree while one of its nodes is being expanded
+        self.g_back = None
+        self.parent_back = None
+        self.tracing_back = False
+
+    def search(self, start, goal, policy, tracer=None, name=""):
+        """
+        Run one search from start to goal.
+
+        Args:
+            start: Start cell [row, col]
+            goal: Goal cell [row, col]
+            policy: SearchPolicy of the calling planner
+            tracer: Optional SearchTracer notified of every search event
+            name: Algorithm name reported to the tracer
+
+        Returns:
+            List of node ids from start to goal, or None if no path exists
+        """
+        return run_steps(self.iter_search(start, goal, policy, tracer, name))
+
+    def iter_search(self, start, goal, policy, tracer=None, name=""):
+        """
+        Run one search as a generator.
+
+        Yields every step the tracer emits while the search advances, so a
+        consumer can process steps as they are produced. Without a tracer
+        nothing is yielded.
+
+        Returns:
+            (as the generator's return value) list of node ids from start to
+            goal, or None if no path exists
+        """
+        # Tracers may ignore an event by returning None instead of a step
+        return (yield from skip_none(self._search_steps(start, goal, policy, tracer, name)))
+
+    def _search_steps(self, start, goal, policy, tracer, name):
+        start_idx = cell_index(start, self.grid_size)
+        goal_idx = cell_index(goal, self.grid_size)
+        if start_idx is None or goal_idx is None:
+            return None
+
+        n = self.grid_size
+        self.g = array('i', [UNSET]) * (n * n)
+        self.parent = array('i', [UNSET]) * (n * n)
+        self.uses_g = policy.frontier in ("best_first", "jump")
+        self.jumps = policy.frontier == "jump"
+        if tracer is not None:
+            yield tracer.start(self, start_idx, name)
+
+        if policy.frontier == "best_first" and policy.queue == "bucket":
+            loop = self._best_first_buckets(start_idx, goal_idx, policy.heuristic, tracer)
+        elif policy.frontier == "best_first":
+            loop = self._best_first(start_idx, goal_idx, policy.heuristic, tracer)
+        elif policy.frontier == "greedy":
+            loop = self._greedy(start_idx, goal_idx, tracer)
+        elif policy.frontier == "jump":
+            loop = self._jump_points(start_idx, goal_idx, tracer)
+        elif policy.frontier in ("fifo", "lifo"):
+            loop = self._uninformed(start_idx, goal_idx, policy.frontier == "lifo", tracer)
+        elif policy.frontier == "bidirectional_fifo":
+            loop = self._bidirectional_uninformed(start_idx, goal_idx, tracer)
+        elif policy.frontier == "bidirectional_best_first":
+            loop = self._bidirectional_best_first(start_idx, goal_idx, policy.heuristic, tracer)
+        else:
+            raise ValueError(f"Unknown search frontier: {policy.frontier}")
+
+        found = yield from loop
+        return self.reconstruct(goal_idx) if found else None
+
+    def path_exists(self, start, goal, connectivity=4):
+        """
+        Whether the goal can be reached from the start, without planning a path.
+
+        A depth-first flood fill that stops at the first contact with the goal.
+        Its only state is a copy of the occupancy bitmap, in which reached cells
+        are marked as blocked, and the stack of cells still to expand.
+
+        Args:
+            start: Start cell [row, col]
+            goal: Goal cell [row, col]
+            connectivity: 4 for the grid planners, 8 for Theta*
+
+        Returns:
+            True if a path exists
+        """
+        n = self.grid_size
+        start_idx = cell_index(start, n)
+        goal_idx = cell_index(goal, n)
+        if start_idx is None or goal_idx is None:
+            return False
+        if start_idx == goal_idx:
+            return True
+        if not self.passable(goal_idx, start_idx):
+            return False
+
+        offsets = FOUR_CONNECTED if connectivity == 4 else EIGHT_CONNECTED
+        seen = bytearray(self.occupancy)
+        seen[start_idx] = 1
+        stack = [start_idx]
+        while stack:
+            r, c = divmod(stack.pop(), n)
+            for dr, dc in offsets:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < n and 0 <= nc < n:
+                    idx = nr * n + nc
+                    if not seen[idx]:
+                        if idx == goal_idx:
+                            return True
+                        seen[idx] = 1
+                        stack.append(idx)
+        return False
+
+    def passable(self, idx, start_idx):
+        """
+        Whether a search from start_idx can pass through a node.
+
+        Free cells can; so can the start itself, which is never tested
+        against the obstacles.
+        """
+        return idx == start_idx or not self.occupancy[idx]
+
+    def distance_field(self, goal):
+        """GoalDistanceField of this grid for goal (see GoalDistanceField)"""
+        return GoalDistanceField(self.grid_size, self.occupancy, goal)
+
+    def reconstruct(self, idx, parent=None):
+        """Follow parent pointers (of the forward tree unless given) from idx back to the root"""
+        if parent is None:
+            parent = self.parent
+        ids = [idx]
+        while parent[idx] != UNSET:
+            idx = parent[idx]
+            ids.append(idx)
+        ids.reverse()
+        if self.jumps:
+            return self._fill_jumps(ids)
+        return ids
+
+    def _fill_jumps(self, ids):
+        # Consecutive jump points share a row or a column; insert the cells between them
+        n = self.grid_size
+        filled = ids[:1]
+        for a, b in zip(ids, ids[1:]):
+            stride = 1 if a // n == b // n else n
+            if b < a:
+                stride = -stride
+            filled.extend(range(a + stride, b + stride, stride))
+        return filled
+
+    def to_cells(self, ids, start):
+        """Convert node ids to [row, col] cells, keeping the caller's start object first"""
+        n = self.grid_size
+        return [start] + [list(divmod(idx, n)) for idx in ids[1:]]
+
+    def cell(self, idx):
+        """[row, col] cell of a node id"""
+        return list(divmod(idx, self.grid_size))
+
+    def _traced_tree(self):
+        return self.parent_back if self.tracing_back else self.parent
+
+    def has_parent(self, idx):
+        """Whether a node has been reached from another node"""
+        return self._traced_tree()[idx] != UNSET
+
+    def path_cells(self, idx):
+        """Current best path from the start (or the goal, for a backward node) to a node as [row, col] cells"""
+        return [self.cell(i) for i in self.reconstruct(idx, self._traced_tree())]
+
+    def _stitch(self, meet):
+        # Point the backward tree's path from meet to the goal into the forward
+        # tree, so that reconstruct(goal) returns the whole path
+        parent = self.parent
+        parent_back = self.parent_back
+        prev, idx = meet, parent_back[meet]
+        while idx != UNSET:
+            parent[idx] = prev
+            prev, idx = idx, parent_back[idx]
+        self.tracing_back = False
+
+    def g_scores(self):
+        """g-scores of all reached nodes keyed like the legacy traces, or None for searches without costs"""
+        if not self.uses_g:
+            return None
+        g = self.g
+        return {str(divmod(i, self.grid_size)): g[i] for i in range(len(g)) if g[i] != UNSET}
+
+    def neighbours(self, idx):
+        """Ids of the 4-connected neighbours of a node, in the order every grid planner expands them"""
+        # Up, down, left, right - the order every grid planner has always used
+        n = self.grid_size
+        r, c = divmod(idx, n)
+        result = []
+        if r > 0:
+            result.append(idx - n)
+        if r < n - 1:
+            result.append(idx + n)
+        if c > 0:
+            result.append(idx - 1)
+        if c < n - 1:
+            result.append(idx + 1)
+        return result
+
+    def _best_first(self, start_idx, goal_idx, use_heuristic, tracer):
+        n = self.grid_size
+        occupancy = self.occupancy
+        g = self.g
+        parent = self.parent
+        neighbours = self.neighbours
+        gr, gc = divmod(goal_idx, n)
+
+        def h(idx):
+            if not use_heuristic:
+                return 0
+            r, c = divmod(idx, n)
+            return abs(r - gr) + abs(c - gc)
+
+        g[start_idx] = 0
+        open_set = [(h(start_idx), start_idx)]
+
+        while open_set:
+            f, current = heapq.heappop(open_set)
+            g_current = g[current]
+            # Entry superseded by a cheaper push: expanding it again changes nothing
+            if f != g_current + h(current):
+                if tracer is not None:
+                    tracer.discard(self, current)
+                continue
+
+            if tracer is not None:
+                tracer.expand(self, current, open_set)
+
+            if current == goal_idx:
+                if tracer is not None:
+                    yield tracer.success(self, goal_idx)
+                return True
+
+            if tracer is not None:
+                tracer.visit(self, current)
+
+            tentative_g = g_current + 1
+            for neighbor in neighbours(current):
+                if occupancy[neighbor]:
+                    continue
+                improved = g[neighbor] == UNSET or tentative_g < g[neighbor]
+                if improved:
+                    h_neighbor = h(neighbor)
+                    g[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    heapq.heappush(open_set, (tentative_g + h_neighbor, neighbor))
+                if tracer is not None:
+                    if improved:
+                        tracer.push(self, current, neighbor)
+                    tracer.relax(self, current, neighbor, tentative_g,
+                                 h_neighbor if improved else h(neighbor), improved)
+
+            if tracer is not None:
+                yield tracer.close(self, current)
+
+        return False
+
+    def _best_first_buckets(self, start_idx, goal_idx, use_heuristic, tracer):
+        # Dial's algorithm: the Manhattan heuristic is consistent and moves cost
+        # 1, so f never decreases along the expansion order and each f value
+        # gets one list. Pushing appends to buckets[f]; popping takes from the
+        # lowest non-empty bucket, which only ever moves forward.
+        n = self.grid_size
+        occupancy = self.occupancy
+        g = self.g
+        parent = self.parent
+        neighbours = self.neighbours
+        gr, gc = divmod(goal_idx, n)
+
+        def h(idx):
+            if not use_heuristic:
+                return 0
+            r, c = divmod(idx, n)
+            return abs(r - gr) + abs(c - gc)
+
+        g[start_idx] = 0
+        f = h(start_idx)
+        buckets = [[] for _ in range(f + 1)]
+        buckets[f].append(start_idx)
+        frontier = BucketFrontier(buckets)
+        size = 1
+
+        while size:
+            while not buckets[f]:
+                f += 1
+            current = buckets[f].pop()
+            size -= 1
+            g_current = g[current]
+            # Entry superseded by a cheaper push: expanding it again changes nothing
+            if f != g_current + h(current):
+                if tracer is not None:
+                    tracer.discard(self, current)
+                continue
+
+            if tracer is not None:
+                frontier.lowest = f
+                tracer.expand(self, current, frontier)
+
+            if current == goal_idx:
+                if tracer is not None:
+                    yield tracer.success(self, goal_idx)
+                return True
+
+            if tracer is not None:
+                tracer.visit(self, current)
+
+            tentative_g = g_current + 1
+            for neighbor in neighbours(current):
+                if occupancy[neighbor]:
+                    continue
+                improved = g[neighbor] == UNSET or tentative_g < g[neighbor]
+                if improved:
+                    h_neighbor = h(neighbor)
+                    g[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    f_neighbor = tentative_g + h_neighbor
+                    while len(buckets) <= f_neighbor:
+                        buckets.append([])
+                    buckets[f_neighbor].append(neighbor)
+                    size += 1
+                if tracer is not None:
+                    if improved:
+                        tracer.push(self, current, neighbor)
+                    tracer.relax(self, current, neighbor, tentative_g,
+                                 h_neighbor if improved else h(neighbor), improved)
+
+            if tracer is not None:
+                yield tracer.close(self, current)
+
+        return False
+
+    def _jump_points(self, start_idx, goal_idx, tracer):
+        # Jump Point Search for 4-connected grids. Among equally short paths
+        # only the canonical ones are searched: vertical runs that branch off
+        # into horizontal runs. A horizontal run therefore only stops at the
+        # goal or where a cell above/below becomes reachable only from here
+        # (its neighbour behind us is blocked). A vertical run stops at the
+        # goal or wherever a horizontal run started from it would stop. Only
+        # those jump points enter the open set; g-scores are the Manhattan
+        # lengths of the runs, so path lengths match A*.
+        n = self.grid_size
+        occupancy = self.occupancy
+        g = self.g
+        parent = self.parent
+        gr, gc = divmod(goal_idx, n)
+
+        def h(idx):
+            r, c = divmod(idx, n)
+            return abs(r - gr) + abs(c - gc)
+
+        def free(r, c):
+            return 0 <= r < n and 0 <= c < n and not occupancy[r * n + c]
+
+        def jump_horizontal(r, c, dc):
+            while True:
+                c += dc
+                if not free(r, c):
+                    return None
+                idx = r * n + c
+                if idx == goal_idx:
+                    return idx
+                # Forced neighbour above or below
+                if (free(r - 1, c) and not free(r - 1, c - dc)) or (free(r + 1, c) and not free(r + 1, c - dc)):
+                    return idx
+
+        def jump_vertical(r, c, dr):
+            while True:
+                r += dr
+                if not free(r, c):
+                    return None
+                idx = r * n + c
+                if idx == goal_idx:
+                    return idx
+                if jump_horizontal(r, c, -1) is not None or jump_horizontal(r, c, 1) is not None:
+                    return idx
+
+        def successors(idx):
+            r, c = divmod(idx, n)
+            if parent[idx] == UNSET:
+                # The start searches in every direction
+                return [jump_vertical(r, c, -1), jump_vertical(r, c, 1),
+                        jump_horizontal(r, c, -1), jump_horizontal(r, c, 1)]
+            pr, pc = divmod(parent[idx], n)
+            if pc == c:
+                # Moving vertically: keep going, and branch off horizontally
+                dr = 1 if r > pr else -1
+                return [jump_vertical(r, c, dr), jump_horizontal(r, c, -1), jump_horizontal(r, c, 1)]
+            # Moving horizontally: keep going, and turn only towards forced neighbours
+            dc = 1 if c > pc else -1
+            result = [jump_horizontal(r, c, dc)]
+            for dr in (-1, 1):
+                if free(r + dr, c) and not free(r + dr, c - dc):
+                    result.append(jump_vertical(r, c, dr))
+            return result
+
+        g[start_idx] = 0
+        open_set = [(h(start_idx), start_idx)]
+
+        while open_set:
+            f, current = heapq.heappop(open_set)
+            g_current = g[current]
+            # Entry superseded by a cheaper push: expanding it again changes nothing
+            if f != g_current + h(current):
+                if tracer is not None:
+                    tracer.discard(self, current)
+                continue
+
+            if tracer is not None:
+                tracer.expand(self, current, open_set)
+
+            if current == goal_idx:
+                if tracer is not None:
+                    yield tracer.success(self, goal_idx)
+                return True
+
+            if tracer is not None:
+                tracer.visit(self, current)
+
+            r, c = divmod(current, n)
+            for neighbor in successors(current):
+                if neighbor is None:
+                    continue
+                nr, nc = divmod(neighbor, n)
+                tentative_g = g_current + abs(nr - r) + abs(nc - c)
+                improved = g[neighbor] == UNSET or tentative_g < g[neighbor]
+                if improved:
+                    h_neighbor = h(neighbor)
+                    g[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    heapq.heappush(open_set, (tentative_g + h_neighbor, neighbor))
+                if tracer is not None:
+                    if improved:
+                        tracer.push(self, current, neighbor)
+                    tracer.relax(self, current, neighbor, tentative_g,
+                                 h_neighbor if improved else h(neighbor), improved)
+
+            if tracer is not None:
+                yield tracer.close(self, current)
+
+        return False
+
+    def _greedy(self, start_idx, goal_idx, tracer):
+        n = self.grid_size
+        occupancy = self.occupancy
+        parent = self.parent
+        neighbours = self.neighbours
+        gr, gc = divmod(goal_idx, n)
+        expanded = bytearray(n * n)
+
+        def h(idx):
+            r, c = divmod(idx, n)
+            return abs(r - gr) + abs(c - gc)
+
+        open_set = [(h(start_idx), start_idx)]
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+
+            if tracer is not None:
+                tracer.expand(self, current, open_set)
+
+            if current == goal_idx:
+                if tracer is not None:
+                    yield tracer.success(self, goal_idx)
+                return True
+
+            expanded[current] = 1
+            if tracer is not None:
+                tracer.visit(self, current)
+
+            for neighbor in neighbours(current):
+                if not occupancy[neighbor] and not expanded[neighbor]:
+                    heapq.heappush(open_set, (h(neighbor), neighbor))
+                    parent[neighbor] = current
+                    if tracer is not None:
+                        tracer.push(self, current, neighbor)
+
+            if tracer is not None:
+                yield tracer.close(self, current)
+
+        return False
+
+    def _uninformed(self, start_idx, goal_idx, lifo, tracer):
+        occupancy = self.occupancy
+        parent = self.parent
+        neighbours = self.neighbours
+        seen = bytearray(self.grid_size * self.grid_size)
+
+        frontier = deque([start_idx])
+        pop = frontier.pop if lifo else frontier.popleft
+        seen[start_idx] = 1
+        if tracer is not None:
+            tracer.visit(self, start_idx)
+
+        while frontier:
+            current = pop()
+
+            if tracer is not None:
+                tracer.expand(self, current, frontier)
+
+            if current == goal_idx:
+                if tracer is not None:
+                    yield tracer.success(self, goal_idx)
+                return True
+
+            for neighbor in neighbours(current):
+                if not occupancy[neighbor] and not seen[neighbor]:
+                    frontier.append(neighbor)
+                    seen[neighbor] = 1
+                    parent[neighbor] = current
+                    if tracer is not None:
+                        tracer.push(self, current, neighbor)
+                        tracer.visit(self, neighbor)
+
+            if tracer is not None:
+                yield tracer.close(self, current)
+
+        return False
+
+    def _bidirectional_uninformed(self, start_idx, goal_idx, tracer):
+        # Breadth-first search from both ends, one whole level of the smaller
+        # frontier at a time. A node belongs to the tree that reached it
+        # first, so the first edge found between the two trees joins a
+        # shortest path: a shorter one would have met a level earlier.
+        n = self.grid_size
+        occupancy = self.occupancy
+        neighbours = self.neighbours
+        parent = self.parent
+        parent_back = self.parent_back = array('i', [UNSET]) * (n * n)
+        # 1 for nodes of the start tree, 2 for nodes of the goal tree
+        side = bytearray(n * n)
+
+        forward = deque([start_idx])
+        side[start_idx] = 1
+        if tracer is not None:
+            tracer.visit(self, start_idx)
+
+        if start_idx == goal_idx:
+            forward.popleft()
+            if tracer is not None:
+                tracer.expand(self, start_idx, forward)
+                yield tracer.success(self, goal_idx)
+            return True
+        # A forward search never enters a blocked goal
+        if occupancy[goal_idx]:
+            return False
+
+        backward = deque([goal_idx])
+        side[goal_idx] = 2
+        if tracer is not None:
+            tracer.push(self, None, goal_idx)
+            tracer.visit(self, goal_idx)
+        frontier = FrontierView(forward, backward)
+
+        # Either frontier running dry proves that no path exists
+        while forward and backward:
+            is_back = len(backward) < len(forward)
+            queue, tree, own, other = ((backward, parent_back, 2, 1) if is_back
+                                       else (forward, parent, 1, 2))
+
+            for _ in range(len(queue)):
+                current = queue.popleft()
+                self.tracing_back = is_back
+                if tracer is not None:
+                    tracer.expand(self, current, frontier)
+
+                for neighbor in neighbours(current):
+                    if occupancy[neighbor] or side[neighbor] == own:
+                        continue
+                    if side[neighbor] == other:
+                        # Link the forward end of the meeting edge into the backward tree
+                        if is_back:
+                            parent_back[neighbor] = current
+                            self._stitch(neighbor)
+                        else:
+                            parent_back[current] = neighbor
+                            self._stitch(current)
+                        if tracer is not None:
+                            yield tracer.success(self, goal_idx)
+                        return True
+                    queue.append(neighbor)
+                    side[neighbor] = own
+                    tree[neighbor] = current
+                    if tracer is not None:
+                        tracer.push(self, current, neighbor)
+                        tracer.visit(self, neighbor)
+
+                if tracer is not None:
+                    yield tracer.close(self, current)
+
+        return False
+
+    def _bidirectional_best_first(self, start_idx, goal_idx, use_heuristic, tracer):
+        # A* from both ends, expanding from the smaller open set each time.
+        # Every relaxation of a node that both searches have reached proposes
+        # a path through it. The search stops once the lowest f of either
+        # open set reaches the best proposal: with consistent heuristics that
+        # side can no longer lead to a shorter path.
+        n = self.grid_size
+        occupancy = self.occupancy
+        neighbours = self.neighbours
+        g = self.g
+        parent = self.parent
+        g_back = self.g_back = array('i', [UNSET]) * (n * n)
+        parent_back = self.parent_back = array('i', [UNSET]) * (n * n)
+        sr, sc = divmod(start_idx, n)
+        gr, gc = divmod(goal_idx, n)
+
+        def h_forward(idx):
+            if not use_heuristic:
+                return 0
+            r, c = divmod(idx, n)
+            return abs(r - gr) + abs(c - gc)
+
+        def h_backward(idx):
+            if not use_heuristic:
+                return 0
+            r, c = divmod(idx, n)
+            return abs(r - sr) + abs(c - sc)
+
+        g[start_idx] = 0
+        open_forward = [(h_forward(start_idx), start_idx)]
+
+        if start_idx == goal_idx:
+            heapq.heappop(open_forward)
+            if tracer is not None:
+                tracer.expand(self, start_idx, open_forward)
+                yield tracer.success(self, goal_idx)
+            return True
+        # A forward search never enters a blocked goal
+        if occupancy[goal_idx]:
+            return False
+
+        g_back[goal_idx] = 0
+        open_backward = [(h_backward(goal_idx), goal_idx)]
+        if tracer is not None:
+            tracer.push(self, None, goal_idx)
+        frontier = FrontierView(open_forward, open_backward)
+
+        best = UNSET
+        meet = UNSET
+        # Either open set running dry before the searches met proves that no path exists
+        while open_forward and open_backward:
+            is_back = len(open_backward) < len(open_forward)
+            open_set, g_own, g_other, tree, h = (
+                (open_backward, g_back, g, parent_back, h_backward) if is_back
+                else (open_forward, g, g_back, parent, h_forward))
+
+            f, current = heapq.heappop(open_set)
+            g_current = g_own[current]
+            # Entry superseded by a cheaper push: expanding it again changes nothing
+            if f != g_current + h(current):
+                if tracer is not None:
+                    tracer.discard(self, current)
+                continue
+
+            self.tracing_back = is_back
+            if tracer is not None:
+                tracer.expand(self, current, frontier)
+                tracer.visit(self, current)
+
+            tentative_g = g_current + 1
+            for neighbor in neighbours(current):
+                if occupancy[neighbor]:
+                    continue
+                if g_own[neighbor] == UNSET or tentative_g < g_own[neighbor]:
+                    g_own[neighbor] = tentative_g
+                    tree[neighbor] = current
+                    heapq.heappush(open_set, (tentative_g + h(neighbor), neighbor))
+                    if tracer is not None:
+                        tracer.push(self, current, neighbor)
+                    if g_other[neighbor] != UNSET and (best == UNSET or tentative_g + g_other[neighbor] < best):
+                        best = tentative_g + g_other[neighbor]
+                        meet = neighbor
+
+            if best != UNSET and (not open_forward or not open_backward
+                                  or open_forward[0][0] >= best or open_backward[0][0] >= best):
+                self._stitch(meet)
+                if tracer is not None:
+                    yield tracer.success(self, goal_idx)
+                return True
+
+            if tracer is not None:
+                yield tracer.close(self, current)
+
+        return False
+
+
+class FrontierView:
+    """Iterable view of the entries of several frontiers, handed to tracers"""
+
+    def __init__(self, *frontiers):
+        self.frontiers = frontiers
+
+    def __iter__(self):
+        for frontier in self.frontiers:
+            yield from frontier
+
+
+class BucketFrontier:
+    """Iterable view of the node ids still queued in a bucket queue, handed to tracers"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.lowest = 0
+
+    def __iter__(self):
+        for bucket in self.buckets[self.lowest:]:
+            yield from bucket
+
+
+class GridPlanner:
+    """
+    Base class of the 4-connected grid planners built on GridSearch.
+
+    Subclasses only choose a SearchPolicy and a display name; environment
+    handling, timing and the plan() interface are shared.
+    """
+
+    policy = None
+    name = ""
+    # Moves path_exists() answers for: every grid planner is complete on the 4-connected grid
+    connectivity = 4
+
+    def __init__(self, grid_size=10, obstacles=None, queue=None):
+        """
+        Initialize the planner with environment parameters
+
+        Args:
+            grid_size: Width/height of the square grid
+            obstacles: List of obstacle positions
+            queue: Priority queue override for A*/Dijkstra ("heap" or "bucket"),
+                None keeps the planner's default
+        """
+        if queue is not None:
+            if queue not in ("heap", "bucket"):
+                raise ValueError(f"Unknown priority queue: {queue}")
+            if self.policy.frontier != "best_first":
+                raise ValueError(f"{self.name} does not use a priority queue with g-scores")
+            self.policy = self.policy.with_queue(queue)
+        self.grid_size = grid_size
+        self.obstacles = obstacles or []
+        self.start = None
+        self.goal = None
+        self.execution_time = 0
+
+    def set_environment(self, start, goal, grid_size, obstacles):
+        """Set or update the environment for planning"""
+        self.start = start
+        self.goal = goal
+        self.grid_size = grid_size
+        self.obstacles = obstacles
+
+    def h(self, pos):
+        """Heuristic function - Manhattan distance"""
+        return abs(pos[0] - self.goal[0]) + abs(pos[1] - self.goal[1])
+
+    def plan(self, start=None, goal=None, obstacles=None, return_steps=False):
+        """
+        Run the planner
+
+        Args:
+            start: Start position [row, col], uses stored start if None
+            goal: Goal position [row, col], uses stored goal if None
+            obstacles: List of obstacle positions, uses stored obstacles if None
+            return_steps: If True, returns planning steps for visualization
+
+        Returns:
+            If return_steps is False: path or None (if no path found)
+            If return_steps is True: (path, steps) or (None, steps)
+        """
+        if return_steps:
+            return collect_steps(self.iter_steps(start, goal, obstacles))
+        # The plain path runs without a tracer and records nothing
+        return run_steps(self._plan_steps(start, goal, obstacles, tracer=None))
+
+    def iter_steps(self, start=None, goal=None, obstacles=None):
+        """
+        Run the planner as a generator of visualization steps.
+
+        Steps are yielded as the search advances, so a caller can start
+        drawing immediately and only needs to hold the current step.
+
+        Args:
+            start: Start position [row, col], uses stored start if None
+            goal: Goal position [row, col], uses stored goal if None
+            obstacles: List of obstacle positions, uses stored obstacles if None
+
+        Returns:
+            (as the generator's return value) path or None if no path found
+        """
+        return (yield from self._plan_steps(start, goal, obstacles, tracer=StepRecorder()))
+
+    def iter_delta_steps(self, start=None, goal=None, obstacles=None):
+        """
+        Run the planner as a generator of delta-encoded steps.
+
+        Each step only holds what changed since the previous one (see
+        DeltaRecorder); TraceReplay rebuilds the full steps.
+
+        Returns:
+            (as the generator's return value) path or None if no path found
+        """
+        return (yield from self._plan_steps(start, goal, obstacles, tracer=DeltaRecorder()))
+
+    def path_exists(self, start=None, goal=None, obstacles=None):
+        """
+        Check whether any path exists, without planning one
+
+        Every grid planner is complete on the 4-connected grid, so they all
+        share one flood fill that stops at the first contact with the goal.
+
+        Args:
+            start: Start position [row, col], uses stored start if None
+            goal: Goal position [row, col], uses stored goal if None
+            obstacles: List of obstacle positions, uses stored obstacles if None
+
+        Returns:
+            True if a path exists, False otherwise
+        """
+        self._update_query(start, goal, obstacles)
+        if not self.start or not self.goal:
+            return False
+        return GridSearch(self.grid_size, self.obstacles).path_exists(self.start, self.goal, self.connectivity)
+
+    def distance_field(self, goal=None, obstacles=None):
+        """
+        Compute the distances of every cell to the goal in one sweep
+
+        The returned GoalDistanceField answers shortest path lengths and paths
+        for any number of starts against the same goal and obstacles, without
+        a search per start. Its answers are those of the optimal grid planners.
+
+        Args:
+            goal: Goal position [row, col], uses stored goal if None
+            obstacles: List of obstacle positions, uses stored obstacles if None
+
+        Returns:
+            GoalDistanceField, or None if the goal is missing or off the grid
+        """
+        self._update_query(None, goal, obstacles)
+        if not self.goal or cell_index(self.goal, self.grid_size) is None:
+            return None
+        return GridSearch(self.grid_size, self.obstacles).distance_field(self.goal)
+
+    def plan_many(self, queries, obstacle_masks=None, workers=None):
+        """
+        Answer a batch of planning queries
+
+        Each obstacle mask is turned into an occupancy grid once and shared by
+        all of its queries. Optimal planners answer queries that share a goal
+        and a mask from one GoalDistanceField sweep instead of one search per
+        start; the paths are shortest paths, but ties may break differently
+        from plan(). The planner's stored start, goal and obstacles are left
+        untouched.
+
+        Args:
+            queries: Iterable of (start, goal) or (start, goal, mask_id) tuples;
+                a mask_id of None uses the stored obstacles
+            obstacle_masks: Mapping of mask id to obstacle list
+            workers: Fan the queries out over a process pool of this size,
+                None or 1 answers them in this process
+
+        Returns:
+            List of paths (None where no path was found), in query order
+        """
+        queries = normalize_queries(queries)
+        masks = obstacle_masks or {}
+        share_goals = getattr(self, "optimal", False)
+        if not workers or workers <= 1 or len(queries) < 2:
+            return _answer_queries((self.grid_size, self.obstacles, masks, self.policy, share_goals, queries))
+
+        # Keep each mask's queries together so the workers can still share structures
+        order = sorted(range(len(queries)), key=lambda i: str(queries[i][2]))
+        batches = chunks(order, -(-len(order) // workers))
+        tasks = []
+        for batch in batches:
+            batch_queries = [queries[i] for i in batch]
+            batch_masks = {mask_id: masks[mask_id] for _, _, mask_id in batch_queries if mask_id is not None}
+            tasks.append((self.grid_size, self.obstacles, batch_masks, self.policy, share_goals, batch_queries))
+
+        results = [None] * len(queries)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch, paths in zip(batches, executor.map(_answer_queries, tasks)):
+                for i, path in zip(batch, paths):
+                    results[i] = path
+        return results
+
+    def _update_query(self, start, goal, obstacles):
+        # Update parameters if provided
+        if start is not None:
+            self.start = start
+        if goal is not None:
+            self.goal = goal
+        if obstacles is not None:
+            self.obstacles = obstacles
+
+    def _plan_steps(self, start, goal, obstacles, tracer):
+        self._update_query(start, goal, obstacles)
+
+        # Verify we have valid start and goal
+        if not self.start or not self.goal:
+            return None
+
+        start_time = time.time()
+
+        search = GridSearch(self.grid_size, self.obstacles)
+        ids = yield from search.iter_search(self.start, self.goal, self.policy, tracer=tracer, name=self.name)
+        path = search.to_cells(ids, self.start) if ids is not None else None
+
+        self.execution_time = time.time() - start_time
+        return path
+
+
+def _answer_queries(task):
+    """Process pool entry point: answer (start, goal, mask_id) queries on shared grids"""
+    grid_size, obstacles, masks, policy, share_goals, queries = task
+    searches = {}
+    fields = {}
+    goal_counts = Counter((mask_id, tuple(goal)) for _, goal, mask_id in queries if goal) if share_goals else {}
+
+    results = [None] * len(queries)
+    for i, (start, goal, mask_id) in enumerate(queries):
+        if not start or not goal:
+            continue
+        search = searches.get(mask_id)
+        if search is None:
+            search = GridSearch(grid_size, obstacles if mask_id is None else masks[mask_id])
+            searches[mask_id] = search
+
+        key = (mask_id, tuple(goal))
+        if goal_counts.get(key, 0) > 1 and cell_index(goal, grid_size) is not None:
+            field = fields.get(key)
+            if field is None:
+                field = fields[key] = search.distance_field(goal)
+            results[i] = field.path(start)
+        else:
+            ids = search.search(start, goal, policy)
+            results[i] = search.to_cells(ids, start) if ids is not None else None
+    return results
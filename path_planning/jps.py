@@ -0,0 +1,11 @@
+from .grid_search import GridPlanner, JUMP_POINT
+
+
+class JPSPlanner(GridPlanner):
+    """Jump Point Search: A* that only expands jump points of the 4-connected grid"""
+
+    # Returns shortest 4-connected paths
+    optimal = True
+
+    policy = JUMP_POINT
+    name = "Jump Point Search"
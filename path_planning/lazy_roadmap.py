@@ -0,0 +1,169 @@
+import math
+import random
+
+from .segment_collision import SegmentChecker
+from .spatial_index import PointIndex
+
+
+class LazyRoadmap:
+    """
+    PRM roadmap kept across planning queries on perturbations of one map.
+
+    Nodes and candidate edges are checked once against the base obstacles.
+    A segment is blocked exactly when one of the cells its traversal reads
+    is, so every candidate edge keeps the base obstacle cells it crosses and
+    is filed under all the cells it reads. Under other obstacles, an edge
+    crossing an added obstacle is blocked, and otherwise it is free once all
+    of its base blockers are gone. That test only runs when the search
+    reaches the edge, and no segment is traversed again. Base obstacle cells
+    get samples of their own the first time a query frees them; those nodes
+    stay in the roadmap and are cut off by their blocked edges whenever
+    their cell is an obstacle again.
+    """
+
+    def __init__(self, grid_size, obstacles, connection_radius, k_nearest=None, cell_samples=1):
+        """
+        Create an empty roadmap over a base map.
+
+        Args:
+            grid_size: Width/height of the square grid
+            obstacles: Obstacle cells of the base map
+            connection_radius: Maximum length of a roadmap edge
+            k_nearest: Only try each new node's k nearest neighbours if set
+            cell_samples: Number of samples added to each freed cell
+        """
+        self.grid_size = grid_size
+        self.base_obstacles = set(tuple(o) for o in obstacles)
+        self.connection_radius = connection_radius
+        self.k_nearest = k_nearest
+        self.cell_samples = cell_samples
+        self.checker = SegmentChecker(grid_size, self.base_obstacles)
+
+        self.index = PointIndex(connection_radius)
+        self.nodes = self.index.points
+        # Neighbour ids per node, over all candidate edges
+        self.edges = []
+        # (i, j) with i < j -> base obstacle cells on the edge (empty if it is
+        # free), or None if it leaves the grid and can never be free
+        self.blockers = {}
+        # Cell -> candidate edges whose collision check reads that cell
+        self.cell_edges = {}
+        # Start/goal points -> node id, so repeated queries reuse their nodes
+        self._anchors = {}
+        # Base obstacle cells that already got their samples
+        self._sampled_cells = set()
+        # Obstacle cells the current query adds to the base map, and the
+        # edges crossing them; edges filed later are cut as they are added
+        self._added = set()
+        self._cut = set()
+
+    def add_nodes(self, points, anchors=()):
+        """
+        Add points as nodes and file their candidate edges.
+
+        Args:
+            points: Sampled points
+            anchors: Start/goal points, added before points and looked up by
+                position in later queries
+
+        Returns:
+            Ids of the new nodes, anchors first
+        """
+        for point in anchors:
+            self._anchors[(point[0], point[1])] = len(self.nodes)
+            self.index.insert([point[0], point[1]])
+        new_ids = list(range(len(self.nodes) - len(anchors), len(self.nodes)))
+        new_ids += [self.index.insert(p) for p in points]
+        self.edges.extend([] for _ in new_ids)
+
+        pairs = []
+        seen = set()
+        for i in new_ids:
+            node = self.nodes[i]
+            neighbours = [j for j in self.index.within(node, self.connection_radius) if j != i]
+            if self.k_nearest is not None:
+                neighbours.sort(key=lambda j: (_distance(node, self.nodes[j]), j))
+                neighbours = neighbours[:self.k_nearest]
+            for j in neighbours:
+                pair = (i, j) if i < j else (j, i)
+                if pair not in self.blockers and pair not in seen:
+                    seen.add(pair)
+                    pairs.append(pair)
+        if not pairs:
+            return new_ids
+
+        n = self.grid_size
+        base = self.base_obstacles
+        touched = set()
+        for pair in pairs:
+            i, j = pair
+            cells = self.checker.segment_cells(self.nodes[i], self.nodes[j])
+            if all(0 <= r < n and 0 <= c < n for r, c in cells):
+                self.blockers[pair] = tuple(cell for cell in cells if cell in base)
+            else:
+                self.blockers[pair] = None
+            self.edges[i].append(j)
+            self.edges[j].append(i)
+            touched.update(pair)
+            for cell in cells:
+                self.cell_edges.setdefault(cell, []).append(pair)
+                if cell in self._added:
+                    self._cut.add(pair)
+        # Neighbour lists stay in id order, like a roadmap built in one go
+        for i in touched:
+            self.edges[i].sort()
+        return new_ids
+
+    def anchor(self, point):
+        """Node id of a start or goal point, adding the node on first use"""
+        node_id = self._anchors.get((point[0], point[1]))
+        if node_id is None:
+            node_id = self.add_nodes([], anchors=[point])[0]
+        return node_id
+
+    def query(self, obstacles):
+        """
+        Prepare a search of the roadmap under other obstacles.
+
+        Base obstacle cells that are free in obstacles get samples first.
+        Nodes added afterwards, such as new start/goal anchors, are checked
+        against obstacles as well.
+
+        Args:
+            obstacles: Obstacle cells of the perturbed map
+
+        Returns:
+            edge_free(i, j) function telling whether the roadmap edge between
+            nodes i and j is collision-free under obstacles
+        """
+        obstacles = set(tuple(o) for o in obstacles)
+        # Edges across an added obstacle are blocked whatever else they cross
+        self._added = added = obstacles - self.base_obstacles
+        self._cut = cut = set()
+        for cell in added:
+            cut.update(self.cell_edges.get(cell, ()))
+
+        freed = self.base_obstacles - obstacles
+        fresh = sorted(freed - self._sampled_cells)
+        if fresh:
+            self._sampled_cells.update(fresh)
+            self.add_nodes([
+                [r + random.random(), c + random.random()]
+                for r, c in fresh
+                for _ in range(self.cell_samples)
+            ])
+
+        blockers = self.blockers
+
+        def edge_free(i, j):
+            pair = (i, j) if i < j else (j, i)
+            if pair in cut:
+                return False
+            cells = blockers[pair]
+            return cells is not None and not any(cell in obstacles for cell in cells)
+
+        return edge_free
+
+
+def _distance(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
@@ -0,0 +1,281 @@
+import heapq
+import time
+
+from .grid_search import GridPlanner, GridSearch
+from .occupancy import cell_index
+from .queries import plan_each
+from .tracing import encode_steps
+
+# g/rhs value of cells that cannot be reached from the start
+INF = float('inf')
+
+
+class LPAStarPlanner(GridPlanner):
+    """
+    Lifelong Planning A* on the 4-connected grid.
+
+    The search of the previous plan() call is kept. When the next call only
+    differs in its obstacles, the blocked cells that changed are fed to the
+    search as edge-cost changes and only the cells whose start distance they
+    affect are re-expanded. Changing the start, goal or grid size starts a
+    fresh search. Path lengths are the same as AStarPlanner's.
+
+    Query handling, path_exists() and distance_field() come from GridPlanner,
+    and the kept grid is a GridSearch, so neighbour order and the blocked-start
+    rule are the kernel's.
+    """
+
+    name = "LPA*"
+    # Returns shortest 4-connected paths
+    optimal = True
+
+    def __init__(self, grid_size=10, obstacles=None):
+        """Initialize the planner with environment parameters"""
+        super().__init__(grid_size, obstacles)
+        # Nodes expanded by the last plan() call
+        self.expansions = 0
+        # (grid_size, start id, goal id) of the kept search, None before the first search
+        self._search_key = None
+
+    def plan_many(self, queries, obstacle_masks=None):
+        """
+        Answer a batch of planning queries
+
+        Each query is one plan() call, so consecutive queries with the same
+        start and goal only repair the kept search for the obstacles that
+        differ between their masks. The stored start, goal and obstacles are
+        left untouched.
+
+        Args:
+            queries: Iterable of (start, goal) or (start, goal, mask_id) tuples;
+                a mask_id of None uses the stored obstacles
+            obstacle_masks: Mapping of mask id to obstacle list
+
+        Returns:
+            List of paths (None where no path was found), in query order
+        """
+        return plan_each(self, queries, obstacle_masks)
+
+    def iter_delta_steps(self, start=None, goal=None, obstacles=None):
+        """
+        Run LPA* as a generator of delta-encoded steps.
+
+        LPA* records full steps itself, so they are encoded one at a time.
+        A repaired search only yields the expansions of the repair.
+
+        Returns:
+            (as the generator's return value) path or None if no path found
+        """
+        return (yield from encode_steps(self.iter_steps(start, goal, obstacles)))
+
+    def update_cells(self, changes):
+        """
+        Apply a stream of cell changes to the kept search.
+
+        The next plan() call repairs the search instead of starting over.
+        The stored obstacle list is replaced by the updated one.
+
+        Args:
+            changes: Iterable of ([row, col], blocked) pairs
+        """
+        if not self.start or not self.goal:
+            raise ValueError("set_environment() must be called before update_cells()")
+        if not self._matches_search():
+            self._reset_search()
+
+        n = self.grid_size
+        for cell, blocked in changes:
+            idx = cell_index(cell, n)
+            if idx is not None and bool(self._occupancy[idx]) != bool(blocked):
+                self._toggle(idx)
+        self.obstacles = [list(divmod(idx, n)) for idx in sorted(self._blocked)]
+
+    def _plan_steps(self, start, goal, obstacles, tracer):
+        # LPA* does not run the kernel's search loop; a tracer only switches
+        # on its own full steps
+        trace = tracer is not None
+        self._update_query(start, goal, obstacles)
+
+        # Verify we have valid start and goal
+        if not self.start or not self.goal:
+            return None
+        if cell_index(self.start, self.grid_size) is None or cell_index(self.goal, self.grid_size) is None:
+            return None
+
+        start_time = time.time()
+
+        if self._matches_search():
+            self._sync_obstacles()
+        else:
+            self._reset_search()
+
+        if trace:
+            yield {
+                "step": 0,
+                "type": "init",
+                "open_set": self._open_cells(),
+                "current": None,
+                "visited": [],
+                "current_path": [],
+                "description": "Initializing LPA*"
+            }
+
+        self.expansions = 0
+        yield from self._compute_shortest_path(trace)
+
+        path = self._extract_path()
+        self.execution_time = time.time() - start_time
+
+        if trace and path is not None:
+            yield {
+                "step": self.expansions + 1,
+                "type": "success",
+                "current": self.goal,
+                "open_set": self._open_cells(),
+                "visited": [],
+                "current_path": path,
+                "description": f"Goal reached! Path length: {len(path)}"
+            }
+
+        return path
+
+    def _matches_search(self):
+        n = self.grid_size
+        return self._search_key == (n, cell_index(self.start, n), cell_index(self.goal, n))
+
+    def _reset_search(self):
+        n = self.grid_size
+        self._start_idx = cell_index(self.start, n)
+        self._goal_idx = cell_index(self.goal, n)
+        self._search_key = (n, self._start_idx, self._goal_idx)
+        self._grid = GridSearch(n, self.obstacles)
+        self._occupancy = self._grid.occupancy
+        self._blocked = self._blocked_cells(self.obstacles)
+
+        self._g = [INF] * (n * n)
+        self._rhs = [INF] * (n * n)
+        self._rhs[self._start_idx] = 0
+        # Heap entries are (key, id); an entry is live while _queued[id] == key
+        self._open = []
+        self._queued = {}
+        self._enqueue(self._start_idx)
+
+    def _blocked_cells(self, obstacles):
+        n = self.grid_size
+        blocked = set()
+        for cell in obstacles:
+            idx = cell_index(cell, n)
+            # Shapes moved or clamped near the border can fall outside the grid
+            if idx is not None:
+                blocked.add(idx)
+        return blocked
+
+    def _sync_obstacles(self):
+        # Only cells whose blocked state differs from the kept search change edge costs
+        for idx in self._blocked_cells(self.obstacles) ^ self._blocked:
+            self._toggle(idx)
+
+    def _toggle(self, idx):
+        self._occupancy[idx] ^= 1
+        if self._occupancy[idx]:
+            self._blocked.add(idx)
+        else:
+            self._blocked.discard(idx)
+        self._update_vertex(idx)
+        for neighbor in self._grid.neighbours(idx):
+            self._update_vertex(neighbor)
+
+    def _predecessors(self, idx):
+        # Only cells a search can pass through lead anywhere
+        grid = self._grid
+        start_idx = self._start_idx
+        return [p for p in grid.neighbours(idx) if grid.passable(p, start_idx)]
+
+    def _key(self, idx):
+        n = self.grid_size
+        r, c = divmod(idx, n)
+        gr, gc = divmod(self._goal_idx, n)
+        best = min(self._g[idx], self._rhs[idx])
+        return (best + abs(r - gr) + abs(c - gc), best)
+
+    def _enqueue(self, idx):
+        key = self._key(idx)
+        self._queued[idx] = key
+        heapq.heappush(self._open, (key, idx))
+
+    def _update_vertex(self, idx):
+        g = self._g
+        rhs = self._rhs
+        if idx != self._start_idx:
+            if self._occupancy[idx]:
+                rhs[idx] = INF
+            else:
+                rhs[idx] = min((g[p] + 1 for p in self._predecessors(idx)), default=INF)
+        if g[idx] != rhs[idx]:
+            self._enqueue(idx)
+        else:
+            self._queued.pop(idx, None)
+
+    def _compute_shortest_path(self, trace):
+        g = self._g
+        rhs = self._rhs
+        open_set = self._open
+        queued = self._queued
+        goal_idx = self._goal_idx
+        visited = [] if trace else None
+
+        while open_set:
+            key, current = open_set[0]
+            if queued.get(current) != key:
+                # Stale entry of a node that was re-queued or became consistent
+                heapq.heappop(open_set)
+                continue
+            if key >= self._key(goal_idx) and rhs[goal_idx] == g[goal_idx]:
+                break
+
+            heapq.heappop(open_set)
+            del queued[current]
+            self.expansions += 1
+
+            if g[current] > rhs[current]:
+                # Overconsistent: the start distance went down (or was never known)
+                g[current] = rhs[current]
+            else:
+                # Underconsistent: the old start distance is no longer valid
+                g[current] = INF
+                self._update_vertex(current)
+            for neighbor in self._grid.neighbours(current):
+                self._update_vertex(neighbor)
+
+            if trace:
+                current_cell = list(divmod(current, self.grid_size))
+                visited.append(current_cell)
+                yield {
+                    "step": self.expansions,
+                    "type": "explore",
+                    "current": current_cell,
+                    "open_set": self._open_cells(),
+                    "visited": list(visited),
+                    "current_path": [],
+                    "description": f"Exploring node at {current_cell}"
+                }
+
+    def _open_cells(self):
+        n = self.grid_size
+        return [list(divmod(idx, n)) for idx in self._queued]
+
+    def _extract_path(self):
+        g = self._g
+        idx = self._goal_idx
+        if g[idx] == INF:
+            return None
+
+        # Walk back from the goal along predecessors with the lowest start distance
+        ids = [idx]
+        while idx != self._start_idx:
+            idx = min(self._predecessors(idx), key=g.__getitem__)
+            ids.append(idx)
+        ids.reverse()
+
+        n = self.grid_size
+        return [self.start] + [list(divmod(idx, n)) for idx in ids[1:]]
@@ -0,0 +1,27 @@
+def build_occupancy(grid_size, obstacles):
+    """
+    Build a flat occupancy grid from a list of obstacle cells.
+
+    Args:
+        grid_size: Width/height of the square grid
+        obstacles: Iterable of [row, col] (or (row, col)) obstacle cells
+
+    Returns:
+        bytearray of length grid_size * grid_size where cell (r, c) lives at
+        index r * grid_size + c and is 1 if blocked, 0 if free
+    """
+    occupancy = bytearray(grid_size * grid_size)
+    for cell in obstacles:
+        r, c = cell[0], cell[1]
+        # Shapes moved or clamped near the border can fall outside the grid
+        if 0 <= r < grid_size and 0 <= c < grid_size:
+            occupancy[r * grid_size + c] = 1
+    return occupancy
+
+
+def cell_index(cell, grid_size):
+    """Return the flat index of a [row, col] cell, or None if it is off the grid"""
+    r, c = cell[0], cell[1]
+    if 0 <= r < grid_size and 0 <= c < grid_size:
+        return r * grid_size + c
+    return None
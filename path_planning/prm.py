@@ -2,9 +2,14 @@ import time
 import random
 import math
 from collections import deque
+from .lazy_roadmap import LazyRoadmap
+from .queries import plan_each
+from .segment_collision import SegmentChecker
+from .spatial_index import PointIndex
+from .tracing import collect_steps, run_steps
 
 class PRMPlanner:
-    def __init__(self, num_samples=200, connection_radius=None):
+    def __init__(self, num_samples=200, connection_radius=None, k_nearest=None, reuse_roadmap=False):
         self.grid_size = 10
         self.obstacles = []
         self.start = None
@@ -12,6 +17,10 @@ class PRMPlanner:
         self.execution_time = 0
         self.num_samples = num_samples
         self.connection_radius = connection_radius  # Can be set based on grid size
+        self.k_nearest = k_nearest  # Only try each node's k nearest neighbours if set
+        self.reuse_roadmap = reuse_roadmap  # Keep one lazily validated roadmap across runs
+        self._checker = None
+        self._roadmap = None
 
     def set_environment(self, start, goal, grid_size, obstacles):
         self.start = start
@@ -35,6 +44,57 @@ class PRMPlanner:
             If return_steps is False: path or None (if no path found)
             If return_steps is True: (path, steps) or (None, steps)
         """
+        if return_steps:
+            return collect_steps(self.iter_steps(start, goal, obstacles))
+        return run_steps(self._plan_steps(start, goal, obstacles, trace=False))
+
+    def path_exists(self, start=None, goal=None, obstacles=None):
+        """
+        Check whether this planner finds a path, without building it
+
+        Sampling is random, so the answer is the one a plan() call would give:
+        the run stops at the first contact with the goal and skips path
+        reconstruction.
+
+        Args:
+            start: Start position [row, col], uses stored start if None
+            goal: Goal position [row, col], uses stored goal if None
+            obstacles: List of obstacle positions, uses stored obstacles if None
+
+        Returns:
+            True if a path exists, False otherwise
+        """
+        return run_steps(self._plan_steps(start, goal, obstacles, trace=False, reach_only=True)) is True
+
+    def plan_many(self, queries, obstacle_masks=None):
+        """
+        Answer a batch of planning queries
+
+        Each query is one plan() call with its own roadmap; the stored start,
+        goal and obstacles are left untouched.
+
+        Args:
+            queries: Iterable of (start, goal) or (start, goal, mask_id) tuples;
+                a mask_id of None uses the stored obstacles
+            obstacle_masks: Mapping of mask id to obstacle list
+
+        Returns:
+            List of paths (None where no path was found), in query order
+        """
+        return plan_each(self, queries, obstacle_masks)
+
+    def iter_steps(self, start=None, goal=None, obstacles=None):
+        """
+        Run PRM as a generator of visualization steps.
+
+        Steps are yielded as planning advances instead of being collected.
+
+        Returns:
+            (as the generator's return value) path or None if no path found
+        """
+        return (yield from self._plan_steps(start, goal, obstacles, trace=True))
+
+    def _plan_steps(self, start, goal, obstacles, trace, reach_only=False):
         # Update parameters if provided
         if start is not None:
             self.start = start
@@ -45,74 +105,74 @@ class PRMPlanner:
                 
         # Verify we have valid start and goal
         if not self.start or not self.goal:
-            return None if not return_steps else (None, [])
+            return None
             
         start_time = time.time()
+        if self.reuse_roadmap:
+            return (yield from self._reuse_plan_steps(start_time, trace, reach_only))
+        self._checker = SegmentChecker(self.grid_size, self.obstacles)
 
         nodes = [self.start, self.goal]
         edges = {}
 
-        steps = []
-        if return_steps:
-            steps.append({
+        step_count = 0
+        if trace:
+            yield {
                 "step": 0,
                 "type": "init",
                 "open_set": [self.start],
                 "visited": [],
                 "current_path": [],
                 "description": "Initializing PRM"
-            })
+            }
+            step_count += 1
 
         while len(nodes) < self.num_samples + 2:
-            if len(nodes) < 10:
-                bias_target = self.start if len(nodes) % 2 == 0 else self.goal
-                p = [
-                    random.gauss(bias_target[0], 1.5),
-                    random.gauss(bias_target[1], 1.5)
-                ]
-            else:
-                p = [random.uniform(0, self.grid_size), random.uniform(0, self.grid_size)]
-
+            p = self._sample_point(len(nodes))
             if not self._collision(p):
                 nodes.append(p)
-                if return_steps:
-                    steps.append({
-                        "step": len(steps),
+                if trace:
+                    yield {
+                        "step": step_count,
                         "type": "sample",
                         "current": p,
                         "open_set": list(nodes),
                         "visited": [],
                         "current_path": [],
                         "description": f"Sampled node #{len(nodes)}"
-                    })
+                    }
+                    step_count += 1
+
+        # Every candidate connection, checked in one batch
+        pairs = self._candidate_pairs(nodes)
+        linked = [[] for _ in nodes]
+        if pairs:
+            blocked = self._checker.segments_blocked(
+                [nodes[i] for i, _ in pairs], [nodes[j] for _, j in pairs]
+            )
+            # Pairs come ordered by (i, j), so neighbour lists stay sorted
+            for (i, j), hit in zip(pairs, blocked):
+                if not hit:
+                    linked[i].append(j)
+                    linked[j].append(i)
 
         for i, node in enumerate(nodes):
-            edges[i] = []
-            for j, other in enumerate(nodes):
-                if i != j and self._distance(node, other) <= self.connection_radius:
-                    if not self._collision_line(node, other):
-                        edges[i].append(j)
-                        if return_steps:
-                            steps.append({
-                                "step": len(steps),
-                                "type": "connect",
-                                "current": node,
-                                "open_set": list(nodes),
-                                "visited": [],
-                                "current_path": [],
-                                "description": f"Connected node {i} to {j}"
-                            })
-
-        # Ensure start and goal are connected if isolated
-        start_idx, goal_idx = 0, 1
-        for idx, ref_node in [(start_idx, self.start), (goal_idx, self.goal)]:
-            if not edges[idx]:
-                for i, node in enumerate(nodes[2:], start=2):
-                    if self._distance(ref_node, node) <= self.connection_radius and not self._collision_line(ref_node, node):
-                        edges[idx].append(i)
-                        edges[i].append(idx)
+            edges[i] = linked[i]
+            if trace:
+                for j in linked[i]:
+                    yield {
+                        "step": step_count,
+                        "type": "connect",
+                        "current": node,
+                        "open_set": list(nodes),
+                        "visited": [],
+                        "current_path": [],
+                        "description": f"Connected node {i} to {j}"
+                    }
+                    step_count += 1
 
         # BFS search on roadmap
+        start_idx, goal_idx = 0, 1
         came_from = {start_idx: None}
         queue = deque([start_idx])
 
@@ -125,7 +185,7 @@ class PRMPlanner:
                     came_from[neighbor] = curr
                     queue.append(neighbor)
 
-                    if return_steps:
+                    if trace:
                         path_so_far = []
                         idx = neighbor
                         while idx is not None:
@@ -137,20 +197,23 @@ class PRMPlanner:
                             idx = came_from.get(idx)
                         path_so_far.reverse()
 
-                        steps.append({
-                            "step": len(steps),
+                        yield {
+                            "step": step_count,
                             "type": "explore",
                             "current": nodes[neighbor],
                             "open_set": list(nodes),
                             "visited": [],
                             "current_path": path_so_far,
                             "description": f"Explored node {neighbor}"
-                        })
+                        }
+                        step_count += 1
 
         self.execution_time = time.time() - start_time
 
         if goal_idx not in came_from:
-            return None if not return_steps else (None, steps)
+            return None
+        if reach_only:
+            return True
 
         path = []
         curr = goal_idx
@@ -162,34 +225,156 @@ class PRMPlanner:
             curr = came_from[curr]
         path.reverse()
 
-        if return_steps:
-            steps.append({
-                "step": len(steps),
+        if trace:
+            yield {
+                "step": step_count,
                 "type": "success",
                 "current": self.goal,
                 "open_set": list(nodes),
                 "visited": [],
                 "current_path": path,
                 "description": "Final PRM path"
-            })
-            return path, steps
+            }
 
         return path
 
+    def reset_roadmap(self):
+        """Drop the kept roadmap, so the next reuse_roadmap run samples a new one"""
+        self._roadmap = None
+
+    def _reuse_plan_steps(self, start_time, trace, reach_only):
+        roadmap = self._roadmap
+        if (roadmap is None or roadmap.grid_size != self.grid_size
+                or roadmap.connection_radius != self.connection_radius or roadmap.k_nearest != self.k_nearest):
+            roadmap = self._roadmap = self._build_roadmap()
+        start_idx = roadmap.anchor(self.start)
+        goal_idx = roadmap.anchor(self.goal)
+        edge_free = roadmap.query(self.obstacles)
+        nodes = roadmap.nodes
+
+        step_count = 0
+        if trace:
+            yield {
+                "step": 0,
+                "type": "init",
+                "open_set": list(nodes),
+                "visited": [],
+                "current_path": [],
+                "description": f"Reusing PRM roadmap ({len(nodes)} nodes)"
+            }
+            step_count += 1
+
+        # BFS over the roadmap, checking changed edges as they are reached
+        came_from = {start_idx: None}
+        queue = deque([start_idx])
+
+        while queue:
+            curr = queue.popleft()
+            if curr == goal_idx:
+                break
+            for neighbor in roadmap.edges[curr]:
+                if neighbor not in came_from and edge_free(curr, neighbor):
+                    came_from[neighbor] = curr
+                    queue.append(neighbor)
+
+                    if trace:
+                        yield {
+                            "step": step_count,
+                            "type": "explore",
+                            "current": nodes[neighbor],
+                            "open_set": list(nodes),
+                            "visited": [],
+                            "current_path": self._roadmap_path(nodes, came_from, neighbor),
+                            "description": f"Explored node {neighbor}"
+                        }
+                        step_count += 1
+
+        self.execution_time = time.time() - start_time
+
+        if goal_idx not in came_from:
+            return None
+        if reach_only:
+            return True
+
+        path = self._roadmap_path(nodes, came_from, goal_idx)
+
+        if trace:
+            yield {
+                "step": step_count,
+                "type": "success",
+                "current": self.goal,
+                "open_set": list(nodes),
+                "visited": [],
+                "current_path": path,
+                "description": "Final PRM path"
+            }
+
+        return path
+
+    def _build_roadmap(self):
+        # Sample the base roadmap like a fresh run, against the current obstacles
+        checker = SegmentChecker(self.grid_size, self.obstacles)
+        points = []
+        while len(points) < self.num_samples:
+            p = self._sample_point(len(points) + 2)
+            if not checker.point_blocked(p):
+                points.append(p)
+
+        # Freed cells are sampled about as densely as the base free space
+        cell_samples = max(1, math.ceil(self.num_samples / (self.grid_size * self.grid_size)))
+        roadmap = LazyRoadmap(self.grid_size, self.obstacles, self.connection_radius,
+                              k_nearest=self.k_nearest, cell_samples=cell_samples)
+        roadmap.add_nodes(points, anchors=[self.start, self.goal])
+        return roadmap
+
+    def _roadmap_path(self, nodes, came_from, idx):
+        path = []
+        while idx is not None:
+            node = nodes[idx]
+            path.append([int(round(node[0])), int(round(node[1]))])
+            idx = came_from[idx]
+        path.reverse()
+        return path
+
+    def _sample_point(self, count):
+        # The first samples are drawn around the start and goal
+        if count < 10:
+            bias_target = self.start if count % 2 == 0 else self.goal
+            return [
+                random.gauss(bias_target[0], 1.5),
+                random.gauss(bias_target[1], 1.5)
+            ]
+        return [random.uniform(0, self.grid_size), random.uniform(0, self.grid_size)]
+
+    def _candidate_pairs(self, nodes):
+        # Node pairs (i, j), i < j, to try connecting, sorted. Nodes are
+        # bucketed by connection_radius, so each node only meets the nodes
+        # in the buckets around it instead of every other node
+        index = PointIndex(self.connection_radius)
+        for node in nodes:
+            index.insert(node)
+
+        if self.k_nearest is None:
+            return [
+                (i, j)
+                for i, node in enumerate(nodes)
+                for j in index.within(node, self.connection_radius)
+                if j > i
+            ]
+
+        # An edge is tried if either end counts the other among its k nearest
+        pairs = set()
+        for i, node in enumerate(nodes):
+            neighbours = [j for j in index.within(node, self.connection_radius) if j != i]
+            neighbours.sort(key=lambda j: (self._distance(node, nodes[j]), j))
+            pairs.update((min(i, j), max(i, j)) for j in neighbours[:self.k_nearest])
+        return sorted(pairs)
+
     def _distance(self, a, b):
         return math.hypot(a[0] - b[0], a[1] - b[1])
 
     def _collision(self, p):
-        cell = (int(p[0]), int(p[1]))
-        return (cell[0] < 0 or cell[0] >= self.grid_size or
-                cell[1] < 0 or cell[1] >= self.grid_size or
-                cell in self.obstacles)
+        return self._checker.point_blocked(p)
 
     def _collision_line(self, a, b):
-        steps = max(int(self._distance(a, b) / 0.2), 1)
-        for i in range(steps + 1):
-            x = a[0] + i / steps * (b[0] - a[0])
-            y = a[1] + i / steps * (b[1] - a[1])
-            if self._collision([x, y]):
-                return True
-        return False
+        return self._checker.segment_blocked(a, b)
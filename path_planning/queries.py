@@ -0,0 +1,52 @@
+def normalize_queries(queries):
+    """
+    Bring plan_many() queries into (start, goal, mask_id) form.
+
+    Args:
+        queries: Iterable of (start, goal) or (start, goal, mask_id) tuples;
+            a mask_id of None stands for the planner's stored obstacles
+
+    Returns:
+        List of (start, goal, mask_id) tuples
+    """
+    normalized = []
+    for query in queries:
+        if len(query) == 2:
+            start, goal = query
+            mask_id = None
+        else:
+            start, goal, mask_id = query
+        normalized.append((start, goal, mask_id))
+    return normalized
+
+
+def plan_each(planner, queries, obstacle_masks=None):
+    """
+    Answer plan_many() queries with one plan() call per query.
+
+    The fallback for planners without shared per-query structures. The
+    planner's stored start, goal and obstacles are restored afterwards.
+
+    Args:
+        planner: Planner with the usual plan(start, goal, obstacles) interface
+        queries: See normalize_queries
+        obstacle_masks: Mapping of mask id to obstacle list
+
+    Returns:
+        List of paths (None where no path was found), in query order
+    """
+    queries = normalize_queries(queries)
+    saved = planner.start, planner.goal, planner.obstacles
+    results = [None] * len(queries)
+    try:
+        for i, (start, goal, mask_id) in enumerate(queries):
+            obstacles = saved[2] if mask_id is None else obstacle_masks[mask_id]
+            results[i] = planner.plan(start, goal, obstacles)
+    finally:
+        planner.start, planner.goal, planner.obstacles = saved
+    return results
+
+
+def chunks(items, size):
+    """Split a list into consecutive chunks of at most size items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
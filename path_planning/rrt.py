@@ -1,6 +1,10 @@
 import time
 import random
 import math
+from .queries import plan_each
+from .segment_collision import SegmentChecker
+from .spatial_index import PointIndex
+from .tracing import collect_steps, run_steps
 
 class RRTPlanner:
     def __init__(self, max_iterations=500, step_size=1.0, goal_sample_rate=0.05):
@@ -12,6 +16,7 @@ class RRTPlanner:
         self.max_iterations = max_iterations
         self.step_size = step_size
         self.goal_sample_rate = goal_sample_rate
+        self._checker = None
 
     def set_environment(self, start, goal, grid_size, obstacles):
         self.start = [float(start[0]), float(start[1])]
@@ -33,6 +38,57 @@ class RRTPlanner:
             If return_steps is False: path or None (if no path found)
             If return_steps is True: (path, steps) or (None, steps)
         """
+        if return_steps:
+            return collect_steps(self.iter_steps(start, goal, obstacles))
+        return run_steps(self._plan_steps(start, goal, obstacles, trace=False))
+
+    def path_exists(self, start=None, goal=None, obstacles=None):
+        """
+        Check whether this planner finds a path, without building it
+
+        Sampling is random, so the answer is the one a plan() call would give:
+        the run stops at the first contact with the goal and skips path
+        reconstruction.
+
+        Args:
+            start: Start position [row, col], uses stored start if None
+            goal: Goal position [row, col], uses stored goal if None
+            obstacles: List of obstacle positions, uses stored obstacles if None
+
+        Returns:
+            True if a path exists, False otherwise
+        """
+        return run_steps(self._plan_steps(start, goal, obstacles, trace=False, reach_only=True)) is True
+
+    def plan_many(self, queries, obstacle_masks=None):
+        """
+        Answer a batch of planning queries
+
+        Each query is one plan() call with its own random tree; the stored
+        start, goal and obstacles are left untouched.
+
+        Args:
+            queries: Iterable of (start, goal) or (start, goal, mask_id) tuples;
+                a mask_id of None uses the stored obstacles
+            obstacle_masks: Mapping of mask id to obstacle list
+
+        Returns:
+            List of paths (None where no path was found), in query order
+        """
+        return plan_each(self, queries, obstacle_masks)
+
+    def iter_steps(self, start=None, goal=None, obstacles=None):
+        """
+        Run RRT as a generator of visualization steps.
+
+        Steps are yielded as planning advances instead of being collected.
+
+        Returns:
+            (as the generator's return value) path or None if no path found
+        """
+        return (yield from self._plan_steps(start, goal, obstacles, trace=True))
+
+    def _plan_steps(self, start, goal, obstacles, trace, reach_only=False):
         # Update parameters if provided
         if start is not None:
             self.start = [float(start[0]), float(start[1])]
@@ -43,23 +99,28 @@ class RRTPlanner:
             
         # Verify we have valid start and goal
         if not self.start or not self.goal:
-            return None if not return_steps else (None, [])
+            return None
             
         start_time = time.time()
+        self._checker = SegmentChecker(self.grid_size, self.obstacles)
 
-        nodes = [self.start]
+        # Nodes are bucketed by step-sized cells for nearest-neighbour queries
+        index = PointIndex(self.step_size)
+        index.insert(self.start)
+        nodes = index.points
         parent = {tuple(self._round(self.start)): None}
 
-        steps = []
-        if return_steps:
-            steps.append({
+        step_count = 0
+        if trace:
+            yield {
                 "step": 0,
                 "type": "init",
                 "open_set": [self.start],
                 "visited": [],
                 "current_path": [],
                 "description": "Initializing RRT"
-            })
+            }
+            step_count += 1
 
         for i in range(self.max_iterations):
             if random.random() < self.goal_sample_rate:
@@ -67,35 +128,38 @@ class RRTPlanner:
             else:
                 rand = [random.uniform(0, self.grid_size), random.uniform(0, self.grid_size)]
 
-            nearest = min(nodes, key=lambda n: self._distance(n, rand))
+            nearest = nodes[index.nearest(rand)]
             new_node = self._steer(nearest, rand)
 
             if not self._collision(nearest, new_node):
-                nodes.append(new_node)
+                index.insert(new_node)
                 parent[tuple(self._round(new_node))] = tuple(self._round(nearest))
 
                 # Check if goal is reached
                 if self._distance(new_node, self.goal) < self.step_size * 1.5:
+                    if reach_only:
+                        self.execution_time = time.time() - start_time
+                        return True
+
                     goal_node = self.goal
                     parent[tuple(self._round(goal_node))] = tuple(self._round(new_node))
                     path = self._reconstruct_path(parent, goal_node)
 
                     self.execution_time = time.time() - start_time
 
-                    if return_steps:
-                        steps.append({
-                            "step": len(steps),
+                    if trace:
+                        yield {
+                            "step": step_count,
                             "type": "success",
                             "current": new_node,
                             "current_path": path,
                             "description": f"Goal reached in {i} iterations"
-                        })
-                        return path, steps
+                        }
 
                     return path
 
                 # Log step with reconstructed path
-                if return_steps:
+                if trace:
                     current_path = []
                     curr = tuple(self._round(new_node))
                     while curr is not None:
@@ -103,18 +167,19 @@ class RRTPlanner:
                         curr = parent.get(curr)
                     current_path.reverse()
 
-                    steps.append({
-                        "step": len(steps),
+                    yield {
+                        "step": step_count,
                         "type": "explore",
                         "current": new_node,
                         "open_set": list(nodes),
                         "visited": [],
                         "current_path": current_path,
                         "description": f"Added node #{len(nodes)}"
-                    })
+                    }
+                    step_count += 1
 
         self.execution_time = time.time() - start_time
-        return None if not return_steps else (None, steps)
+        return None
 
     def _round(self, point):
         return [int(round(point[0])), int(round(point[1]))]
@@ -130,16 +195,7 @@ class RRTPlanner:
         ]
 
     def _collision(self, from_node, to_node):
-        steps = max(int(self._distance(from_node, to_node) / 0.2), 1)
-        for i in range(steps + 1):
-            x = from_node[0] + i / steps * (to_node[0] - from_node[0])
-            y = from_node[1] + i / steps * (to_node[1] - from_node[1])
-            cell = (int(x), int(y))
-            if (0 > cell[0] or cell[0] >= self.grid_size or
-                0 > cell[1] or cell[1] >= self.grid_size or
-                cell in self.obstacles):
-                return True
-        return False
+        return self._checker.segment_blocked(from_node, to_node)
 
     def _reconstruct_path(self, parent, goal):
         path = []
@@ -1,6 +1,10 @@
 import time
 import random
 import math
+from .queries import plan_each
+from .segment_collision import SegmentChecker
+from .spatial_index import PointIndex
+from .tracing import collect_steps, run_steps
 
 class RRTStarPlanner:
     def __init__(self, max_iterations=500, step_size=1.0, goal_sample_rate=0.05, radius=2.0):
@@ -13,6 +17,7 @@ class RRTStarPlanner:
         self.step_size = step_size
         self.goal_sample_rate = goal_sample_rate
         self.radius = radius
+        self._checker = None
 
     def set_environment(self, start, goal, grid_size, obstacles):
         self.start = [float(start[0]), float(start[1])]
@@ -34,6 +39,57 @@ class RRTStarPlanner:
             If return_steps is False: path or None (if no path found)
             If return_steps is True: (path, steps) or (None, steps)
         """
+        if return_steps:
+            return collect_steps(self.iter_steps(start, goal, obstacles))
+        return run_steps(self._plan_steps(start, goal, obstacles, trace=False))
+
+    def path_exists(self, start=None, goal=None, obstacles=None):
+        """
+        Check whether this planner finds a path, without building it
+
+        Sampling is random, so the answer is the one a plan() call would give:
+        the run stops at the first contact with the goal and skips path
+        reconstruction.
+
+        Args:
+            start: Start position [row, col], uses stored start if None
+            goal: Goal position [row, col], uses stored goal if None
+            obstacles: List of obstacle positions, uses stored obstacles if None
+
+        Returns:
+            True if a path exists, False otherwise
+        """
+        return run_steps(self._plan_steps(start, goal, obstacles, trace=False, reach_only=True)) is True
+
+    def plan_many(self, queries, obstacle_masks=None):
+        """
+        Answer a batch of planning queries
+
+        Each query is one plan() call with its own random tree; the stored
+        start, goal and obstacles are left untouched.
+
+        Args:
+            queries: Iterable of (start, goal) or (start, goal, mask_id) tuples;
+                a mask_id of None uses the stored obstacles
+            obstacle_masks: Mapping of mask id to obstacle list
+
+        Returns:
+            List of paths (None where no path was found), in query order
+        """
+        return plan_each(self, queries, obstacle_masks)
+
+    def iter_steps(self, start=None, goal=None, obstacles=None):
+        """
+        Run RRT* as a generator of visualization steps.
+
+        Steps are yielded as planning advances instead of being collected.
+
+        Returns:
+            (as the generator's return value) path or None if no path found
+        """
+        return (yield from self._plan_steps(start, goal, obstacles, trace=True))
+
+    def _plan_steps(self, start, goal, obstacles, trace, reach_only=False):
         # Update parameters if provided
         if start is not None:
             self.start = [float(start[0]), float(start[1])]
@@ -44,24 +100,32 @@ class RRTStarPlanner:
             
         # Verify we have valid start and goal
         if not self.start or not self.goal:
-            return None if not return_steps else (None, [])
+            return None
             
         start_time = time.time()
-
-        nodes = [self.start]
-        parent = {tuple(self._round(self.start)): None}
-        cost = {tuple(self._round(self.start)): 0}
-
-        steps = []
-        if return_steps:
-            steps.append({
+        self._checker = SegmentChecker(self.grid_size, self.obstacles)
+
+        # Nodes are bucketed by step-sized cells for neighbourhood queries.
+        # The tree is kept per node id: rounded cells collide when two nodes
+        # fall into the same cell
+        index = PointIndex(self.step_size)
+        index.insert(self.start)
+        nodes = index.points
+        parent = [None]
+        cost = [0.0]
+        children = [[]]
+
+        step_count = 0
+        if trace:
+            yield {
                 "step": 0,
                 "type": "init",
                 "open_set": [self.start],
                 "visited": [],
                 "current_path": [],
                 "description": "Initializing RRT*"
-            })
+            }
+            step_count += 1
 
         for i in range(self.max_iterations):
             rand = self.goal if random.random() < self.goal_sample_rate else [
@@ -69,74 +133,85 @@ class RRTStarPlanner:
                 random.uniform(0, self.grid_size)
             ]
 
-            nearest = min(nodes, key=lambda n: self._distance(n, rand))
+            nearest_id = index.nearest(rand)
+            nearest = nodes[nearest_id]
             new_node = self._steer(nearest, rand)
 
             if self._collision(nearest, new_node):
                 continue
 
-            nodes.append(new_node)
-            new_node_r = tuple(self._round(new_node))
-            nearest_r = tuple(self._round(nearest))
-
-            # Default connection
-            parent[new_node_r] = nearest_r
-            cost[new_node_r] = cost[nearest_r] + self._distance(nearest, new_node)
+            neighbours = index.within(new_node, self.radius)
 
-            # Rewire: try to find better parent
-            for node in nodes:
-                node_r = tuple(self._round(node))
-                if node_r == new_node_r:
+            # Choose parent: the cheapest neighbour with a free edge
+            best_id = nearest_id
+            best_cost = cost[nearest_id] + self._distance(nearest, new_node)
+            for node_id in neighbours:
+                if node_id == nearest_id:
                     continue
-                if self._distance(node, new_node) <= self.radius and not self._collision(node, new_node):
-                    new_cost = cost[node_r] + self._distance(node, new_node)
-                    if new_cost < cost[new_node_r]:
-                        parent[new_node_r] = node_r
-                        cost[new_node_r] = new_cost
+                node = nodes[node_id]
+                new_cost = cost[node_id] + self._distance(node, new_node)
+                if new_cost < best_cost and not self._collision(node, new_node):
+                    best_id, best_cost = node_id, new_cost
+
+            new_id = index.insert(new_node)
+            parent.append(best_id)
+            cost.append(best_cost)
+            children.append([])
+            children[best_id].append(new_id)
+
+            # Rewire: route neighbours through the new node where that is cheaper
+            rewired = 0
+            for node_id in neighbours:
+                if node_id == best_id:
+                    continue
+                node = nodes[node_id]
+                new_cost = best_cost + self._distance(new_node, node)
+                if new_cost < cost[node_id] and not self._collision(new_node, node):
+                    children[parent[node_id]].remove(node_id)
+                    parent[node_id] = new_id
+                    children[new_id].append(node_id)
+                    self._propagate_cost(node_id, new_cost - cost[node_id], cost, children)
+                    rewired += 1
 
             # Check goal connection
             if self._distance(new_node, self.goal) < self.step_size * 1.5:
-                goal_r = tuple(self._round(self.goal))
-                parent[goal_r] = new_node_r
-                cost[goal_r] = cost[new_node_r] + self._distance(new_node, self.goal)
-                path = self._reconstruct_path(parent, self.goal)
+                if reach_only:
+                    self.execution_time = time.time() - start_time
+                    return True
+
+                path = self._reconstruct_path(parent, nodes, new_id)
+                goal_r = self._round(self.goal)
+                if path[-1] != goal_r:
+                    path.append(goal_r)
 
                 self.execution_time = time.time() - start_time
 
-                if return_steps:
-                    steps.append({
-                        "step": len(steps),
+                if trace:
+                    yield {
+                        "step": step_count,
                         "type": "success",
                         "current": self.goal,
                         "current_path": path,
                         "open_set": list(nodes),
                         "description": f"Goal reached in {i} iterations"
-                    })
-                    return path, steps
+                    }
 
                 return path
 
-            # Step recording with path reconstruction
-            if return_steps:
-                path_so_far = []
-                curr = new_node_r
-                while curr is not None:
-                    path_so_far.append(list(curr))
-                    curr = parent.get(curr)
-                path_so_far.reverse()
-
-                steps.append({
-                    "step": len(steps),
+            if trace:
+                yield {
+                    "step": step_count,
                     "type": "explore",
                     "current": new_node,
-                    "current_path": path_so_far,
+                    "current_path": self._reconstruct_path(parent, nodes, new_id),
                     "open_set": list(nodes),
                     "visited": [],
-                    "description": f"Added node #{len(nodes)} (rewired if needed)"
-                })
+                    "description": f"Added node #{len(nodes)} (rewired {rewired} neighbours)"
+                }
+                step_count += 1
 
         self.execution_time = time.time() - start_time
-        return None if not return_steps else (None, steps)
+        return None
 
     def _round(self, point):
         return [int(round(point[0])), int(round(point[1]))]
@@ -152,22 +227,23 @@ class RRTStarPlanner:
         ]
 
     def _collision(self, from_node, to_node):
-        steps = max(int(self._distance(from_node, to_node) / 0.2), 1)
-        for i in range(steps + 1):
-            x = from_node[0] + i / steps * (to_node[0] - from_node[0])
-            y = from_node[1] + i / steps * (to_node[1] - from_node[1])
-            cell = (int(x), int(y))
-            if (cell[0] < 0 or cell[0] >= self.grid_size or
-                cell[1] < 0 or cell[1] >= self.grid_size or
-                cell in self.obstacles):
-                return True
-        return False
-
-    def _reconstruct_path(self, parent, goal):
+        return self._checker.segment_blocked(from_node, to_node)
+
+    def _propagate_cost(self, node_id, delta, cost, children):
+        # A rewired node moves its whole subtree by the same cost change
+        stack = [node_id]
+        while stack:
+            node_id = stack.pop()
+            cost[node_id] += delta
+            stack.extend(children[node_id])
+
+    def _reconstruct_path(self, parent, nodes, node_id):
+        # Grid cells from the start to node_id, merging nodes in the same cell
         path = []
-        curr = tuple(self._round(goal))
-        while curr is not None:
-            path.append(list(curr))
-            curr = parent.get(curr)
+        while node_id is not None:
+            cell = self._round(nodes[node_id])
+            if not path or path[-1] != cell:
+                path.append(cell)
+            node_id = parent[node_id]
         path.reverse()
         return path
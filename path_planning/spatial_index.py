@@ -0,0 +1,138 @@
+import math
+
+# Slack for points that rounding puts into a bucket next to their true one
+_EPSILON = 1e-9
+
+
+class PointIndex:
+    """
+    Incrementally built grid hash over 2-D points.
+
+    Points are bucketed by the cell of side cell_size they fall into.
+    Nearest-neighbour queries search rings of buckets outward from the query
+    and stop once no unsearched ring can hold a closer point. Radius queries
+    only visit the buckets overlapping the query circle. With cell_size
+    close to the spacing between points, both take a handful of bucket
+    visits instead of a scan over every point.
+
+    Point ids are insertion indices. Ties are broken towards the lower id,
+    so answers match min() or a filtered scan over the points in insertion
+    order.
+    """
+
+    def __init__(self, cell_size=1.0):
+        """
+        Create an empty index.
+
+        Args:
+            cell_size: Side length of the hash buckets
+        """
+        if cell_size <= 0:
+            raise ValueError(f"Cell size must be positive, got {cell_size}")
+        self.cell_size = cell_size
+        self.points = []
+        self._buckets = {}
+        # Bounding box of the occupied buckets, None while empty
+        self._bounds = None
+
+    def __len__(self):
+        return len(self.points)
+
+    def _key(self, point):
+        return (math.floor(point[0] / self.cell_size), math.floor(point[1] / self.cell_size))
+
+    def insert(self, point):
+        """
+        Add a point.
+
+        Returns:
+            Id of the point (its insertion index)
+        """
+        point_id = len(self.points)
+        self.points.append(point)
+        kx, ky = self._key(point)
+        self._buckets.setdefault((kx, ky), []).append(point_id)
+        if self._bounds is None:
+            self._bounds = [kx, kx, ky, ky]
+        else:
+            bounds = self._bounds
+            bounds[0] = min(bounds[0], kx)
+            bounds[1] = max(bounds[1], kx)
+            bounds[2] = min(bounds[2], ky)
+            bounds[3] = max(bounds[3], ky)
+        return point_id
+
+    def nearest(self, point):
+        """
+        Id of the point closest to point (lowest id among equally close ones).
+
+        Returns:
+            Point id, or None if the index is empty
+        """
+        if self._bounds is None:
+            return None
+        qx, qy = self._key(point)
+        min_x, max_x, min_y, max_y = self._bounds
+        # No bucket lies further than this many rings from the query
+        last_ring = max(qx - min_x, max_x - qx, qy - min_y, max_y - qy)
+
+        points = self.points
+        best_dist = None
+        best_id = None
+        ring = 0
+        while ring <= last_ring:
+            for key in self._ring_keys(qx, qy, ring):
+                for point_id in self._buckets.get(key, ()):
+                    other = points[point_id]
+                    dist = math.hypot(other[0] - point[0], other[1] - point[1])
+                    if best_dist is None or dist < best_dist or (dist == best_dist and point_id < best_id):
+                        best_dist, best_id = dist, point_id
+            # Points in the next ring are at least ring * cell_size away; one
+            # exactly that far could still win a tie, so only a strict bound stops
+            if best_dist is not None and best_dist + _EPSILON < ring * self.cell_size:
+                break
+            ring += 1
+        return best_id
+
+    def within(self, point, radius):
+        """
+        Ids of the points at most radius away from point.
+
+        Returns:
+            List of point ids in increasing order
+        """
+        if self._bounds is None:
+            return []
+        cs = self.cell_size
+        points = self.points
+        min_x, max_x, min_y, max_y = self._bounds
+        reach = radius + _EPSILON
+        x_lo = max(math.floor((point[0] - reach) / cs), min_x)
+        x_hi = min(math.floor((point[0] + reach) / cs), max_x)
+        y_lo = max(math.floor((point[1] - reach) / cs), min_y)
+        y_hi = min(math.floor((point[1] + reach) / cs), max_y)
+
+        found = []
+        buckets = self._buckets
+        for kx in range(x_lo, x_hi + 1):
+            for ky in range(y_lo, y_hi + 1):
+                for point_id in buckets.get((kx, ky), ()):
+                    other = points[point_id]
+                    if math.hypot(other[0] - point[0], other[1] - point[1]) <= radius:
+                        found.append(point_id)
+        found.sort()
+        return found
+
+    @staticmethod
+    def _ring_keys(qx, qy, ring):
+        # Buckets at Chebyshev distance ring from (qx, qy)
+        if ring == 0:
+            return [(qx, qy)]
+        keys = []
+        for kx in range(qx - ring, qx + ring + 1):
+            keys.append((kx, qy - ring))
+            keys.append((kx, qy + ring))
+        for ky in range(qy - ring + 1, qy + ring):
+            keys.append((qx - ring, ky))
+            keys.append((qx + ring, ky))
+        return keys
@@ -2,17 +2,47 @@ import heapq
 import time
 import numpy as np
 import math
+from .grid_search import GridSearch
+from .occupancy import build_occupancy
+from .queries import plan_each
+from .tracing import collect_steps, run_steps
 
 class ThetaStarPlanner:
-    """Theta* algorithm for path planning with any-angle paths"""
-    
-    def __init__(self, grid_size=10, obstacles=None):
-        """Initialize the Theta* planner"""
+    """
+    Theta* algorithm for path planning with any-angle paths
+
+    With lazy=True the planner runs Lazy Theta*: a generated node is assumed
+    to see the parent of the node that generated it, and the line of sight
+    is only checked once the node is expanded. If it is blocked, the node
+    falls back to its best already expanded neighbour. Most generated nodes
+    are never expanded, so far fewer line-of-sight checks are needed for
+    any-angle paths of the same quality.
+    """
+
+    # Moves path_exists() answers for: line-of-sight shortcuts stay on the 8-connected grid
+    connectivity = 8
+
+    def __init__(self, grid_size=10, obstacles=None, lazy=False):
+        """
+        Initialize the Theta* planner
+
+        Args:
+            grid_size: Width/height of the square grid
+            obstacles: List of obstacle positions
+            lazy: Defer line-of-sight checks to node expansion (Lazy Theta*)
+        """
+        self.lazy = lazy
         self.grid_size = grid_size
         self.obstacles = obstacles or []
         self.start = None
         self.goal = None
         self.execution_time = 0
+        # Occupancy grid and line-of-sight results of the current run, keyed by
+        # (start row, start col, end row, end col); rebuilt by every plan() call
+        self._occupancy = None
+        self._los_cache = {}
+        # line_of_sight() calls made by the last run
+        self.los_checks = 0
         
     def set_environment(self, start, goal, grid_size, obstacles):
         """Set or update the environment for planning"""
@@ -20,6 +50,7 @@ class ThetaStarPlanner:
         self.goal = goal
         self.grid_size = grid_size
         self.obstacles = obstacles
+        self._occupancy = None
         
     def h(self, pos):
         """Euclidean distance heuristic"""
@@ -27,10 +58,26 @@ class ThetaStarPlanner:
         
     def line_of_sight(self, start, end):
         """Check if there is a clear line of sight between start and end"""
-        # Bresenham's line algorithm
-        x0, y0 = start[0], start[1]
-        x1, y1 = end[0], end[1]
-        
+        self.los_checks += 1
+        key = (start[0], start[1], end[0], end[1])
+        visible = self._los_cache.get(key)
+        if visible is None:
+            if self._occupancy is None:
+                self._reset_run()
+            visible = self._trace_line(start[0], start[1], end[0], end[1])
+            self._los_cache[key] = visible
+        return visible
+
+    def _reset_run(self):
+        self._occupancy = build_occupancy(self.grid_size, self.obstacles)
+        self._los_cache = {}
+        self.los_checks = 0
+
+    def _trace_line(self, x0, y0, x1, y1):
+        # Bresenham's line algorithm; every cell but the end must be free
+        n = self.grid_size
+        occupancy = self._occupancy
+
         dx = abs(x1 - x0)
         dy = abs(y1 - y0)
         
@@ -41,7 +88,7 @@ class ThetaStarPlanner:
         
         while x0 != x1 or y0 != y1:
             # Check if the current cell is an obstacle
-            if [x0, y0] in self.obstacles:
+            if 0 <= x0 < n and 0 <= y0 < n and occupancy[x0 * n + y0]:
                 return False
                 
             e2 = 2 * err
@@ -53,7 +100,7 @@ class ThetaStarPlanner:
                 y0 += sy
                 
             # Check if we're out of bounds
-            if not (0 <= x0 < self.grid_size and 0 <= y0 < self.grid_size):
+            if not (0 <= x0 < n and 0 <= y0 < n):
                 return False
         
         return True
@@ -72,6 +119,65 @@ class ThetaStarPlanner:
             If return_steps is False: path or None (if no path found)
             If return_steps is True: (path, steps) or (None, steps)
         """
+        if return_steps:
+            return collect_steps(self.iter_steps(start, goal, obstacles))
+        return run_steps(self._plan_steps(start, goal, obstacles, trace=False))
+
+    def path_exists(self, start=None, goal=None, obstacles=None):
+        """
+        Check whether any path exists, without planning one
+
+        Theta* is complete on the 8-connected grid and line-of-sight shortcuts
+        do not change which cells are reachable, so a flood fill over the
+        8-connected grid gives the same answer as a full search.
+
+        Args:
+            start: Start position [row, col], uses stored start if None
+            goal: Goal position [row, col], uses stored goal if None
+            obstacles: List of obstacle positions, uses stored obstacles if None
+
+        Returns:
+            True if a path exists, False otherwise
+        """
+        if start is not None:
+            self.start = start
+        if goal is not None:
+            self.goal = goal
+        if obstacles is not None:
+            self.obstacles = obstacles
+        if not self.start or not self.goal:
+            return False
+        return GridSearch(self.grid_size, self.obstacles).path_exists(self.start, self.goal, self.connectivity)
+
+    def plan_many(self, queries, obstacle_masks=None):
+        """
+        Answer a batch of planning queries
+
+        Each query is one plan() call; the stored start, goal and obstacles
+        are left untouched.
+
+        Args:
+            queries: Iterable of (start, goal) or (start, goal, mask_id) tuples;
+                a mask_id of None uses the stored obstacles
+            obstacle_masks: Mapping of mask id to obstacle list
+
+        Returns:
+            List of paths (None where no path was found), in query order
+        """
+        return plan_each(self, queries, obstacle_masks)
+
+    def iter_steps(self, start=None, goal=None, obstacles=None):
+        """
+        Run Theta* as a generator of visualization steps.
+
+        Steps are yielded as planning advances instead of being collected.
+
+        Returns:
+            (as the generator's return value) path or None if no path found
+        """
+        return (yield from self._plan_steps(start, goal, obstacles, trace=True))
+
+    def _plan_steps(self, start, goal, obstacles, trace):
         # Update parameters if provided
         if start is not None:
             self.start = start
@@ -82,10 +188,15 @@ class ThetaStarPlanner:
             
         # Verify we have valid start and goal
         if not self.start or not self.goal:
-            return None if not return_steps else (None, [])
+            return None
             
         # Start timer
         start_time = time.time()
+        self._reset_run()
+        if self.lazy:
+            return (yield from self._lazy_plan_steps(start_time, trace))
+        occupancy = self._occupancy
+        n = self.grid_size
         
         # Initialize variables
         open_set = []
@@ -95,13 +206,12 @@ class ThetaStarPlanner:
         
         # For visualization
         visited = []
-        current_path = []
         
         # For step tracking if needed
-        steps = []
-        if return_steps:
+        step_count = 0
+        if trace:
             # Record initial state
-            steps.append({
+            yield {
                 "step": 0,
                 "type": "init",
                 "open_set": [self.start],
@@ -109,7 +219,8 @@ class ThetaStarPlanner:
                 "visited": [],
                 "current_path": [],
                 "description": "Initializing Theta* algorithm"
-            })
+            }
+            step_count += 1
         
         while open_set:
             # Get current node
@@ -117,9 +228,9 @@ class ThetaStarPlanner:
             current_tuple = tuple(current)
             
             # Record step data if tracking steps
-            if return_steps:
+            if trace:
                 step_data = {
-                    "step": len(steps),
+                    "step": step_count,
                     "type": "explore",
                     "current": current,
                     "open_set": [list(n[1]) for n in open_set],
@@ -139,20 +250,21 @@ class ThetaStarPlanner:
                 path.append(self.start)
                 path.reverse()
                 
-                if return_steps:
+                if trace:
                     step_data["type"] = "success"
                     step_data["current_path"] = path
                     step_data["description"] = f"Goal reached! Path length: {len(path)}"
-                    steps.append(step_data)
+                    yield step_data
                 
                 self.execution_time = time.time() - start_time
-                return path if not return_steps else (path, steps)
+                return path
             
-            # Add current to visited
-            visited.append(current)
+            # Add current to visited (only needed for the step trace)
+            if trace:
+                visited.append(current)
             
             # Record the current path for visualization if tracking steps
-            if return_steps and tuple(current) in came_from:
+            if trace and tuple(current) in came_from:
                 curr = current
                 current_path = []
                 while tuple(curr) in came_from:
@@ -163,16 +275,16 @@ class ThetaStarPlanner:
                 step_data["current_path"] = current_path
             
             # Explore neighbors
-            neighbors_data = [] if return_steps else None
+            neighbors_data = [] if trace else None
             for dx, dy in [(-1,0), (1,0), (0,-1), (0,1), (-1,-1), (-1,1), (1,-1), (1,1)]:
                 neighbor = [current[0] + dx, current[1] + dy]
                 neighbor_tuple = tuple(neighbor)
                 
-                if 0 <= neighbor[0] < self.grid_size and 0 <= neighbor[1] < self.grid_size and neighbor not in self.obstacles:
+                if 0 <= neighbor[0] < n and 0 <= neighbor[1] < n and not occupancy[neighbor[0] * n + neighbor[1]]:
                     # Calculate cost - diagonal moves cost more
                     move_cost = 1.0 if dx == 0 or dy == 0 else 1.414
                     
-                    if return_steps:
+                    if trace:
                         neighbor_info = {
                             "pos": neighbor,
                             "g_score": g_score[current_tuple] + move_cost,
@@ -197,11 +309,11 @@ class ThetaStarPlanner:
                                 f_score = new_g + self.h(neighbor)
                                 heapq.heappush(open_set, (f_score, neighbor))
                                 
-                                if return_steps:
+                                if trace:
                                     neighbor_info["g_score"] = new_g
                                     neighbor_info["action"] = "add_or_update_line_of_sight"
                             
-                            if return_steps:
+                            if trace:
                                 neighbors_data.append(neighbor_info)
                             continue
                     
@@ -213,16 +325,139 @@ class ThetaStarPlanner:
                         f_score = tentative_g + self.h(neighbor)
                         heapq.heappush(open_set, (f_score, neighbor))
                         
-                        if return_steps:
+                        if trace:
                             neighbor_info["action"] = "add_or_update"
                     
-                    if return_steps:
+                    if trace:
                         neighbors_data.append(neighbor_info)
             
-            if return_steps:
+            if trace:
                 step_data["neighbors"] = neighbors_data
-                steps.append(step_data)
+                yield step_data
+                step_count += 1
         
         # If we get here, no path was found
         self.execution_time = time.time() - start_time
-        return None if not return_steps else (None, steps)
\ No newline at end of file
+        return None
+
+    def _lazy_plan_steps(self, start_time, trace):
+        occupancy = self._occupancy
+        n = self.grid_size
+        moves = [(-1,0), (1,0), (0,-1), (0,1), (-1,-1), (-1,1), (1,-1), (1,1)]
+
+        open_set = []
+        heapq.heappush(open_set, (0, self.start))
+        came_from = {}
+        g_score = {tuple(self.start): 0}
+        closed = set()
+        visited = []
+
+        step_count = 0
+        if trace:
+            yield {
+                "step": 0,
+                "type": "init",
+                "open_set": [self.start],
+                "current": None,
+                "visited": [],
+                "current_path": [],
+                "description": "Initializing Lazy Theta* algorithm"
+            }
+            step_count += 1
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            current_tuple = tuple(current)
+            # Entries left behind by a later, cheaper push
+            if current_tuple in closed:
+                continue
+
+            # The parent was assumed visible when the node was generated; check it now
+            if current_tuple in came_from and not self.line_of_sight(came_from[current_tuple], current):
+                best_g, best_parent = None, None
+                for dx, dy in moves:
+                    neighbor_tuple = (current[0] + dx, current[1] + dy)
+                    if neighbor_tuple in closed:
+                        new_g = g_score[neighbor_tuple] + (1.0 if dx == 0 or dy == 0 else 1.414)
+                        if best_g is None or new_g < best_g:
+                            best_g, best_parent = new_g, list(neighbor_tuple)
+                g_score[current_tuple] = best_g
+                came_from[current_tuple] = best_parent
+
+            closed.add(current_tuple)
+
+            current_path = []
+            if trace or current == self.goal:
+                curr = current
+                while tuple(curr) in came_from:
+                    current_path.append(curr)
+                    curr = came_from[tuple(curr)]
+                current_path.append(self.start)
+                current_path.reverse()
+
+            if trace:
+                step_data = {
+                    "step": step_count,
+                    "type": "explore",
+                    "current": current,
+                    "open_set": [list(entry[1]) for entry in open_set if tuple(entry[1]) not in closed],
+                    "visited": list(visited),
+                    "g_score": {str(k): v for k, v in g_score.items()},
+                    "current_path": current_path,
+                    "description": f"Exploring node at {current}"
+                }
+
+            if current == self.goal:
+                if trace:
+                    step_data["type"] = "success"
+                    step_data["description"] = f"Goal reached! Path length: {len(current_path)}"
+                    yield step_data
+                self.execution_time = time.time() - start_time
+                return current_path
+
+            if trace:
+                visited.append(current)
+
+            # Neighbours are linked to the parent's parent without a line-of-sight check
+            parent = came_from.get(current_tuple)
+            neighbors_data = [] if trace else None
+            for dx, dy in moves:
+                neighbor = [current[0] + dx, current[1] + dy]
+                neighbor_tuple = tuple(neighbor)
+                if not (0 <= neighbor[0] < n and 0 <= neighbor[1] < n) or occupancy[neighbor[0] * n + neighbor[1]]:
+                    continue
+                if neighbor_tuple in closed:
+                    continue
+
+                if parent is not None:
+                    new_parent = parent
+                    new_g = g_score[tuple(parent)] + math.sqrt(
+                        (neighbor[0] - parent[0])**2 + (neighbor[1] - parent[1])**2)
+                    action = "add_or_update_assumed_line_of_sight"
+                else:
+                    new_parent = current
+                    new_g = g_score[current_tuple] + (1.0 if dx == 0 or dy == 0 else 1.414)
+                    action = "add_or_update"
+
+                if neighbor_tuple not in g_score or new_g < g_score[neighbor_tuple]:
+                    g_score[neighbor_tuple] = new_g
+                    came_from[neighbor_tuple] = new_parent
+                    heapq.heappush(open_set, (new_g + self.h(neighbor), neighbor))
+                else:
+                    action = "skip"
+
+                if trace:
+                    neighbors_data.append({
+                        "pos": neighbor,
+                        "g_score": new_g,
+                        "h_score": self.h(neighbor),
+                        "action": action
+                    })
+
+            if trace:
+                step_data["neighbors"] = neighbors_data
+                yield step_data
+                step_count += 1
+
+        self.execution_time = time.time() - start_time
+        return None
@@ -0,0 +1,472 @@
+import json
+from collections import Counter
+
+
+def skip_none(step_iter):
+    """Forward the steps of a generator, dropping None, and return its return value"""
+    while True:
+        try:
+            step = next(step_iter)
+        except StopIteration as stop:
+            return stop.value
+        if step is not None:
+            yield step
+
+
+def run_steps(step_iter):
+    """Exhaust a step generator and return its return value"""
+    while True:
+        try:
+            next(step_iter)
+        except StopIteration as stop:
+            return stop.value
+
+
+def collect_steps(step_iter):
+    """
+    Exhaust a step generator.
+
+    Returns:
+        (return value, list of all yielded steps) - the plan(return_steps=True) format
+    """
+    steps = []
+    while True:
+        try:
+            steps.append(next(step_iter))
+        except StopIteration as stop:
+            return stop.value, steps
+
+
+class SearchTracer:
+    """
+    Observer interface for GridSearch.
+
+    The kernel calls these hooks only when a tracer is attached, so planning
+    without one does no trace bookkeeping at all. Node arguments are the
+    kernel's integer cell ids; use search.cell(idx) to turn them into
+    [row, col] lists. start, close and success may return a step, which the
+    kernel yields to its consumer. The base class ignores every event.
+    """
+
+    def start(self, search, start_idx, name):
+        """The search is initialized"""
+
+    def visit(self, search, idx):
+        """A node is added to the visited set"""
+
+    def expand(self, search, current, frontier):
+        """A node is popped from the frontier (heap of (priority, id), deque of ids or iterable of ids)"""
+
+    def push(self, search, current, neighbor):
+        """A neighbor is pushed onto the frontier with current as its parent (None for the goal of a bidirectional search)"""
+
+    def discard(self, search, idx):
+        """A superseded frontier entry is dropped without being expanded"""
+
+    def relax(self, search, current, neighbor, g, h, improved):
+        """A neighbor is evaluated by a g-score based search"""
+
+    def close(self, search, current):
+        """Expansion of the current node is finished"""
+
+    def success(self, search, goal_idx):
+        """The goal was popped from the frontier"""
+
+
+class StepRecorder(SearchTracer):
+    """
+    Emits the full-state visualization steps of plan(return_steps=True) and iter_steps().
+
+    Steps are returned one at a time and not kept, so a lazy consumer only
+    holds the step it is drawing. Every step is a dict with step/type/current/
+    open_set/visited/current_path/description keys; searches with g-scores
+    also record g_score and neighbors.
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._visited = []
+        self._step = None
+        self._neighbors = None
+
+    def start(self, search, start_idx, name):
+        self._count = 1
+        return {
+            "step": 0,
+            "type": "init",
+            "open_set": [search.cell(start_idx)],
+            "current": None,
+            "visited": [],
+            "current_path": [],
+            "description": f"Initializing {name}"
+        }
+
+    def visit(self, search, idx):
+        self._visited.append(idx)
+
+    def expand(self, search, current, frontier):
+        current_cell = search.cell(current)
+        self._step = {
+            "step": self._count,
+            "type": "explore",
+            "current": current_cell,
+            "open_set": [search.cell(e[1] if isinstance(e, tuple) else e) for e in frontier],
+            "visited": [search.cell(i) for i in self._visited],
+            "current_path": search.path_cells(current) if search.has_parent(current) else [],
+            "description": f"Exploring node at {current_cell}"
+        }
+        g_scores = search.g_scores()
+        if g_scores is not None:
+            self._step["g_score"] = g_scores
+            self._neighbors = []
+
+    def relax(self, search, current, neighbor, g, h, improved):
+        self._neighbors.append({
+            "pos": search.cell(neighbor),
+            "g_score": g,
+            "h_score": h,
+            "f_score": g + h,
+            "action": "add_or_update" if improved else "skip"
+        })
+
+    def close(self, search, current):
+        if self._neighbors is not None:
+            self._step["neighbors"] = self._neighbors
+            self._neighbors = None
+        return self._emit()
+
+    def success(self, search, goal_idx):
+        path = search.path_cells(goal_idx)
+        self._step["type"] = "success"
+        self._step["current_path"] = path
+        self._step["description"] = f"Goal reached! Path length: {len(path)}"
+        self._neighbors = None
+        return self._emit()
+
+    def _emit(self):
+        step, self._step = self._step, None
+        self._count += 1
+        return step
+
+
+# Keys of a full step that describe accumulated search state; delta traces
+# store only their changes, every other key is stored as-is
+STATE_KEYS = ("open_set", "visited", "current_path", "g_score")
+
+
+def _path_delta(previous, path):
+    # Length of the common prefix plus the differing tail
+    keep = 0
+    limit = min(len(previous), len(path))
+    while keep < limit and previous[keep] == path[keep]:
+        keep += 1
+    return keep, path[keep:]
+
+
+class DeltaRecorder(SearchTracer):
+    """
+    Emits delta-encoded steps for GridSearch.
+
+    Instead of copying the open set, visited list and g-scores into every
+    step, a step carries only what changed since the previous one: frontier
+    entries pushed and popped, newly visited cells, updated g-scores and the
+    tail of the current path that differs. The cost per step is proportional
+    to the work done in it, not to the size of the search. TraceReplay turns
+    the deltas back into full steps.
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._open_add = []
+        self._open_remove = []
+        self._visited_add = []
+        self._g_update = {}
+        self._path = []
+        self._step = None
+        self._neighbors = None
+
+    def start(self, search, start_idx, name):
+        self._count = 1
+        if search.uses_g:
+            # The kernel sets the start g-score before the first expansion
+            self._g_update[start_idx] = 0
+        return {
+            "step": 0,
+            "type": "init",
+            "current": None,
+            "open_add": [search.cell(start_idx)],
+            "description": f"Initializing {name}"
+        }
+
+    def visit(self, search, idx):
+        self._visited_add.append(idx)
+
+    def push(self, search, current, neighbor):
+        self._open_add.append(neighbor)
+        if search.uses_g:
+            self._g_update[neighbor] = search.g[neighbor]
+
+    def discard(self, search, idx):
+        self._open_remove.append(idx)
+
+    def expand(self, search, current, frontier):
+        self._open_remove.append(current)
+        current_cell = search.cell(current)
+        path = search.path_cells(current) if search.has_parent(current) else []
+
+        step = {
+            "step": self._count,
+            "type": "explore",
+            "current": current_cell,
+            "description": f"Exploring node at {current_cell}"
+        }
+        self._add_changes(step, search, path)
+        if search.uses_g:
+            step["g_update"] = {str(divmod(i, search.grid_size)): g for i, g in self._g_update.items()}
+            self._g_update = {}
+            self._neighbors = []
+        self._step = step
+
+    def relax(self, search, current, neighbor, g, h, improved):
+        self._neighbors.append({
+            "pos": search.cell(neighbor),
+            "g_score": g,
+            "h_score": h,
+            "f_score": g + h,
+            "action": "add_or_update" if improved else "skip"
+        })
+
+    def close(self, search, current):
+        if self._neighbors is not None:
+            self._step["neighbors"] = self._neighbors
+            self._neighbors = None
+        return self._emit()
+
+    def success(self, search, goal_idx):
+        path = search.path_cells(goal_idx)
+        self._step["type"] = "success"
+        self._step["description"] = f"Goal reached! Path length: {len(path)}"
+        # Replace the path change recorded at expansion by the final path
+        self._path = self._previous_path
+        self._step.pop("path_keep", None)
+        self._step.pop("path_add", None)
+        self._add_path(self._step, path)
+        self._neighbors = None
+        return self._emit()
+
+    def _add_changes(self, step, search, path):
+        if self._open_add:
+            step["open_add"] = [search.cell(i) for i in self._open_add]
+            self._open_add = []
+        if self._open_remove:
+            step["open_remove"] = [search.cell(i) for i in self._open_remove]
+            self._open_remove = []
+        if self._visited_add:
+            step["visited_add"] = [search.cell(i) for i in self._visited_add]
+            self._visited_add = []
+        self._previous_path = self._path
+        self._add_path(step, path)
+
+    def _add_path(self, step, path):
+        keep, tail = _path_delta(self._path, path)
+        if keep != len(self._path) or tail:
+            step["path_keep"] = keep
+            step["path_add"] = tail
+        self._path = path
+
+    def _emit(self):
+        step, self._step = self._step, None
+        self._count += 1
+        return step
+
+
+def _as_key(cell):
+    return tuple(cell)
+
+
+def _multiset_delta(previous, current):
+    before = Counter(_as_key(c) for c in previous)
+    after = Counter(_as_key(c) for c in current)
+    added = [list(c) for c in (after - before).elements()]
+    removed = [list(c) for c in (before - after).elements()]
+    return added, removed
+
+
+def encode_steps(steps):
+    """
+    Delta-encode a stream of full steps.
+
+    Works with the iter_steps() generator of any planner, so planners that
+    build full steps themselves (Theta*, RRT, RRT*, PRM) can be exported in
+    the same compact format as the grid kernel. Only the previous state is
+    held in memory.
+
+    Args:
+        steps: Iterable of full step dicts (e.g. planner.iter_steps())
+
+    Returns:
+        (as the generator's return value) the return value of steps, e.g. the path
+    """
+    open_set, visited, path, g_score = [], [], [], {}
+    while True:
+        try:
+            step = next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+        delta = {k: v for k, v in step.items() if k not in STATE_KEYS}
+        absent = [k for k in ("open_set", "visited", "current_path") if k not in step]
+        if absent:
+            delta["absent"] = absent
+
+        if "open_set" in step:
+            added, removed = _multiset_delta(open_set, step["open_set"])
+            if added:
+                delta["open_add"] = added
+            if removed:
+                delta["open_remove"] = removed
+            open_set = step["open_set"]
+        if "visited" in step:
+            added, removed = _multiset_delta(visited, step["visited"])
+            if added:
+                delta["visited_add"] = added
+            if removed:
+                delta["visited_remove"] = removed
+            visited = step["visited"]
+        if "current_path" in step:
+            keep, tail = _path_delta(path, step["current_path"])
+            if keep != len(path) or tail:
+                delta["path_keep"] = keep
+                delta["path_add"] = tail
+            path = step["current_path"]
+        if "g_score" in step:
+            new_g = step["g_score"]
+            delta["g_update"] = {k: v for k, v in new_g.items() if g_score.get(k) != v}
+            dropped = [k for k in g_score if k not in new_g]
+            if dropped:
+                delta["g_remove"] = dropped
+            g_score = new_g
+
+        yield delta
+
+
+class _ReplayState:
+    def __init__(self):
+        self.open_set = []
+        self.visited = []
+        self.path = []
+        self.g_score = {}
+
+    @staticmethod
+    def _apply_multiset(items, added, removed):
+        # Additions come first: a node pushed since the last step can be popped in this one
+        items = items + [list(c) for c in added]
+        if removed:
+            pending = Counter(_as_key(c) for c in removed)
+            kept = []
+            for item in items:
+                key = _as_key(item)
+                if pending[key]:
+                    pending[key] -= 1
+                else:
+                    kept.append(item)
+            items = kept
+        return items
+
+    def apply(self, delta):
+        self.open_set = self._apply_multiset(self.open_set, delta.get("open_add", []), delta.get("open_remove", []))
+        self.visited = self._apply_multiset(self.visited, delta.get("visited_add", []), delta.get("visited_remove", []))
+        if "path_keep" in delta:
+            self.path = self.path[:delta["path_keep"]] + [list(c) for c in delta["path_add"]]
+        if "g_update" in delta:
+            self.g_score.update(delta["g_update"])
+        for key in delta.get("g_remove", []):
+            self.g_score.pop(key, None)
+
+        step = {k: v for k, v in delta.items()
+                if k not in ("open_add", "open_remove", "visited_add", "visited_remove",
+                             "path_keep", "path_add", "g_update", "g_remove", "absent")}
+        absent = delta.get("absent", [])
+        if "open_set" not in absent:
+            step["open_set"] = list(self.open_set)
+        if "visited" not in absent:
+            step["visited"] = list(self.visited)
+        if "current_path" not in absent:
+            step["current_path"] = list(self.path)
+        if "g_update" in delta:
+            step["g_score"] = dict(self.g_score)
+        return step
+
+
+class TraceReplay:
+    """
+    Full steps reconstructed on demand from a delta-encoded trace.
+
+    Iterating replays the trace once from the start. Indexing replays up to
+    the requested step and remembers the position, so stepping forward
+    through a trace only applies one delta per step.
+    """
+
+    def __init__(self, delta_steps):
+        self.delta_steps = list(delta_steps)
+        self._state = None
+        self._position = -1
+        self._current = None
+
+    def __len__(self):
+        return len(self.delta_steps)
+
+    def __iter__(self):
+        state = _ReplayState()
+        for delta in self.delta_steps:
+            yield state.apply(delta)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.delta_steps)
+        if not 0 <= index < len(self.delta_steps):
+            raise IndexError("trace step out of range")
+
+        if self._state is None or index < self._position:
+            self._state = _ReplayState()
+            self._position = -1
+        while self._position < index:
+            self._position += 1
+            self._current = self._state.apply(self.delta_steps[self._position])
+        return self._current
+
+
+def delta_trace(planner, start=None, goal=None, obstacles=None):
+    """
+    Run a planner and yield its steps in the delta-encoded format.
+
+    Grid kernel planners record deltas directly; other planners have their
+    full steps encoded one at a time.
+
+    Returns:
+        (as the generator's return value) path or None if no path found
+    """
+    if hasattr(planner, "iter_delta_steps"):
+        return (yield from planner.iter_delta_steps(start, goal, obstacles))
+    return (yield from encode_steps(planner.iter_steps(start, goal, obstacles)))
+
+
+def save_trace(delta_steps, filepath):
+    """
+    Write a delta-encoded trace as JSON lines, one step per line.
+
+    Returns:
+        Number of steps written
+    """
+    count = 0
+    with open(filepath, "w") as f:
+        for delta in delta_steps:
+            f.write(json.dumps(delta, separators=(",", ":")) + "\n")
+            count += 1
+    return count
+
+
+def load_trace(filepath):
+    """Read a trace written by save_trace into a TraceReplay"""
+    with open(filepath, "r") as f:
+        return TraceReplay(json.loads(line) for line in f if line.strip())
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from distance_fields import distance_fields_path, load_distance_fields
+from environment_generator import EnvironmentGenerator
+from grid_world_env import GridWorldEnv
+
+
+class DistanceFieldsStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "env.json")
+        self.generator = EnvironmentGenerator(grid_size=8, num_obstacles=4, seed=0)
+        self.env = self._env(seed=0)
+
+    @staticmethod
+    def _env(seed):
+        env = GridWorldEnv(grid_size=8, num_obstacles=4, seed=seed)
+        env.agent_pos = env.generate_random_position()
+        env.goal_pos = env.generate_random_position()
+        return env
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_loaded_fields_match_their_environment(self):
+        self.generator.save_environment(self.env, self.filename, distance_fields=True)
+        fields = load_distance_fields(self.filename, self.env)
+        self.assertIsNotNone(fields)
+        self.assertTrue(fields.matches(self.env))
+
+    def test_stale_sidecar_is_ignored(self):
+        self.generator.save_environment(self.env, self.filename, distance_fields=True)
+        other = self._env(seed=1)
+        other.agent_pos, other.goal_pos = self.env.agent_pos, self.env.goal_pos
+        self.assertIsNone(load_distance_fields(self.filename, other))
+
+        moved = self._env(seed=0)
+        moved.goal_pos = [moved.goal_pos[0], (moved.goal_pos[1] + 1) % 8]
+        self.assertIsNone(load_distance_fields(self.filename, moved))
+
+    def test_saving_without_fields_removes_old_sidecar(self):
+        self.generator.save_environment(self.env, self.filename, distance_fields=True)
+        self.generator.save_environment(self.env, self.filename, distance_fields=False)
+        self.assertFalse(os.path.exists(distance_fields_path(self.filename)))
+        self.assertIsNone(load_distance_fields(self.filename, self.env))
+
+
+if __name__ == "__main__":
+    unittest.main()
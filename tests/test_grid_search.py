@@ -0,0 +1,100 @@
+import random
+import unittest
+
+from path_planning.astar import AStarPlanner
+from path_planning.bfs import BFSPlanner
+from path_planning.bidirectional_astar import BidirectionalAStarPlanner
+from path_planning.bidirectional_bfs import BidirectionalBFSPlanner
+from path_planning.dfs import DFSPlanner
+from path_planning.dijkstra import DijkstraPlanner
+from path_planning.greedy_best_first import GreedyBestFirstPlanner
+from path_planning.jps import JPSPlanner
+from path_planning.lpa_star import LPAStarPlanner
+
+OPTIMAL_PLANNERS = [AStarPlanner, DijkstraPlanner, JPSPlanner, BidirectionalBFSPlanner, BidirectionalAStarPlanner]
+ALL_PLANNERS = OPTIMAL_PLANNERS + [BFSPlanner, DFSPlanner, GreedyBestFirstPlanner, LPAStarPlanner]
+
+
+def random_queries(seed, count=150):
+    """Seeded random grids with free start and goal cells"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        grid_size = rng.randint(2, 14)
+        density = rng.uniform(0.0, 0.45)
+        obstacles = [[r, c] for r in range(grid_size) for c in range(grid_size) if rng.random() < density]
+        blocked = set(map(tuple, obstacles))
+        free = [[r, c] for r in range(grid_size) for c in range(grid_size) if (r, c) not in blocked]
+        if len(free) < 2:
+            continue
+        start, goal = rng.sample(free, 2)
+        yield grid_size, obstacles, start, goal
+
+
+class GridSearchTest(unittest.TestCase):
+    def assertValidPath(self, path, grid_size, obstacles, start, goal):
+        blocked = set(map(tuple, obstacles))
+        self.assertEqual(list(path[0]), start)
+        self.assertEqual(list(path[-1]), goal)
+        for (r, c), (nr, nc) in zip(path, path[1:]):
+            self.assertEqual(abs(r - nr) + abs(c - nc), 1)
+            self.assertTrue(0 <= nr < grid_size and 0 <= nc < grid_size)
+            self.assertNotIn((nr, nc), blocked)
+
+    def test_optimal_planners_match_bfs_path_length(self):
+        for grid_size, obstacles, start, goal in random_queries(seed=0):
+            reference = BFSPlanner(grid_size, obstacles).plan(start, goal, obstacles)
+            for planner_class in OPTIMAL_PLANNERS + [LPAStarPlanner]:
+                path = planner_class(grid_size, obstacles).plan(start, goal, obstacles)
+                if reference is None:
+                    self.assertIsNone(path, planner_class.__name__)
+                else:
+                    self.assertIsNotNone(path, planner_class.__name__)
+                    self.assertEqual(len(path), len(reference), planner_class.__name__)
+                    self.assertValidPath(path, grid_size, obstacles, start, goal)
+
+    def test_path_exists_agrees_with_plan(self):
+        for grid_size, obstacles, start, goal in random_queries(seed=1):
+            for planner_class in ALL_PLANNERS:
+                planner = planner_class(grid_size, obstacles)
+                planner.set_environment(start, goal, grid_size, obstacles)
+                path = planner.plan()
+                self.assertEqual(planner.path_exists(), path is not None, planner_class.__name__)
+                if path is not None:
+                    self.assertValidPath(path, grid_size, obstacles, start, goal)
+
+    def test_bucket_and_heap_queues_return_equally_short_paths(self):
+        # Ties within one priority are broken differently, so only lengths are compared
+        for grid_size, obstacles, start, goal in random_queries(seed=2):
+            for planner_class in (AStarPlanner, DijkstraPlanner):
+                heap_path = planner_class(grid_size, obstacles, queue="heap").plan(start, goal, obstacles)
+                bucket_path = planner_class(grid_size, obstacles, queue="bucket").plan(start, goal, obstacles)
+                if heap_path is None:
+                    self.assertIsNone(bucket_path, planner_class.__name__)
+                else:
+                    self.assertEqual(len(bucket_path), len(heap_path), planner_class.__name__)
+                    self.assertValidPath(bucket_path, grid_size, obstacles, start, goal)
+
+    def test_lpa_star_repairs_match_fresh_searches(self):
+        rng = random.Random(3)
+        for grid_size, obstacles, start, goal in random_queries(seed=3, count=40):
+            planner = LPAStarPlanner(grid_size, obstacles)
+            planner.plan(start, goal, obstacles)
+            for _ in range(5):
+                # Toggle a few cells other than start and goal, then repair
+                changed = set(map(tuple, obstacles))
+                for _ in range(rng.randint(1, 4)):
+                    cell = (rng.randrange(grid_size), rng.randrange(grid_size))
+                    if list(cell) not in (start, goal):
+                        changed ^= {cell}
+                obstacles = [list(cell) for cell in sorted(changed)]
+                reference = BFSPlanner(grid_size, obstacles).plan(start, goal, obstacles)
+                path = planner.plan(start, goal, obstacles)
+                if reference is None:
+                    self.assertIsNone(path)
+                else:
+                    self.assertEqual(len(path), len(reference))
+                    self.assertValidPath(path, grid_size, obstacles, start, goal)
+
+
+if __name__ == "__main__":
+    unittest.main()
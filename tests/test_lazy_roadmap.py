@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from path_planning.lazy_roadmap import LazyRoadmap
+from path_planning.prm import PRMPlanner
+from path_planning.segment_collision import SegmentChecker
+
+
+class LazyRoadmapTest(unittest.TestCase):
+    def test_new_anchor_edges_respect_added_obstacles(self):
+        rng = random.Random(0)
+        grid_size = 12
+        base = {(rng.randrange(grid_size), rng.randrange(grid_size)) for _ in range(15)}
+        for trial in range(20):
+            roadmap = LazyRoadmap(grid_size, base, connection_radius=4.0)
+            roadmap.add_nodes([[rng.uniform(0, grid_size), rng.uniform(0, grid_size)] for _ in range(60)])
+            obstacles = base | {(rng.randrange(grid_size), rng.randrange(grid_size)) for _ in range(10)}
+            checker = SegmentChecker(grid_size, obstacles)
+
+            # Anchor a new start after query(), as an unordered caller would
+            edge_free = roadmap.query(obstacles)
+            start = [rng.randrange(grid_size), rng.randrange(grid_size)]
+            start_idx = roadmap.anchor(start)
+            for j in roadmap.edges[start_idx]:
+                if edge_free(start_idx, j):
+                    self.assertFalse(checker.segment_blocked(roadmap.nodes[start_idx], roadmap.nodes[j]))
+
+
+class PRMReuseTest(unittest.TestCase):
+    def test_reuse_edges_avoid_added_obstacles_with_new_starts(self):
+        random.seed(1)
+        rng = random.Random(1)
+        grid_size = 12
+        base = {(rng.randrange(grid_size), rng.randrange(grid_size)) for _ in range(15)}
+        planner = PRMPlanner(num_samples=80, reuse_roadmap=True)
+        planner.set_environment([0, 0], [grid_size - 1, grid_size - 1], grid_size, base)
+        planner.plan()
+        roadmap = planner._roadmap
+
+        # Keep the edge test each run searched with
+        used = []
+        query = roadmap.query
+        roadmap.query = lambda obstacles: used.append(query(obstacles)) or used[-1]
+
+        for _ in range(50):
+            obstacles = base | {(rng.randrange(grid_size), rng.randrange(grid_size)) for _ in range(10)}
+            start = [rng.randrange(grid_size), rng.randrange(grid_size)]
+            if tuple(start) in obstacles:
+                continue
+            planner.plan(start=start, obstacles=obstacles)
+            edge_free = used[-1]
+            checker = SegmentChecker(grid_size, obstacles)
+            start_idx = roadmap.anchor(start)
+            for j in roadmap.edges[start_idx]:
+                if edge_free(start_idx, j):
+                    self.assertFalse(checker.segment_blocked(roadmap.nodes[start_idx], roadmap.nodes[j]))
+
+
+if __name__ == "__main__":
+    unittest.main()
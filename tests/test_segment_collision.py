@@ -0,0 +1,102 @@
+import math
+import random
+import unittest
+
+from path_planning.segment_collision import SegmentChecker
+
+
+def random_checker(rng, grid_size):
+    obstacles = [[r, c] for r in range(grid_size) for c in range(grid_size) if rng.random() < 0.2]
+    return SegmentChecker(grid_size, obstacles)
+
+
+def random_segments(rng, grid_size, count):
+    """General, corner-aligned and off-grid segments"""
+    segments = []
+    for _ in range(count):
+        kind = rng.randrange(3)
+        if kind == 0:
+            a = [rng.uniform(0, grid_size), rng.uniform(0, grid_size)]
+            b = [rng.uniform(0, grid_size), rng.uniform(0, grid_size)]
+        elif kind == 1:
+            # Integer and half-integer points pass exactly through cell corners
+            a = [rng.randint(0, 2 * grid_size) / 2, rng.randint(0, 2 * grid_size) / 2]
+            b = [rng.randint(0, 2 * grid_size) / 2, rng.randint(0, 2 * grid_size) / 2]
+        else:
+            a = [rng.uniform(-2, grid_size + 2), rng.uniform(-2, grid_size + 2)]
+            b = [rng.uniform(-2, grid_size + 2), rng.uniform(-2, grid_size + 2)]
+        segments.append((a, b))
+    return segments
+
+
+def sampled_cells(a, b, samples=4000):
+    """Cells containing densely sampled points of the segment from a to b"""
+    cells = set()
+    for i in range(samples + 1):
+        t = i / samples
+        cells.add((math.floor(a[0] + t * (b[0] - a[0])), math.floor(a[1] + t * (b[1] - a[1]))))
+    return cells
+
+
+def clips_cell(a, b, cell):
+    """Whether the segment from a to b runs through the interior of cell"""
+    t_lo, t_hi = 0.0, 1.0
+    for axis in (0, 1):
+        d = b[axis] - a[axis]
+        lo, hi = cell[axis], cell[axis] + 1
+        if d == 0:
+            if not lo < a[axis] < hi:
+                return False
+            continue
+        t0, t1 = sorted(((lo - a[axis]) / d, (hi - a[axis]) / d))
+        t_lo, t_hi = max(t_lo, t0), min(t_hi, t1)
+    return t_lo < t_hi
+
+
+class SegmentCheckerTest(unittest.TestCase):
+    def test_batch_matches_scalar_checks(self):
+        rng = random.Random(0)
+        for _ in range(40):
+            grid_size = rng.randint(1, 12)
+            checker = random_checker(rng, grid_size)
+            segments = random_segments(rng, grid_size, 100)
+            blocked = checker.segments_blocked([a for a, _ in segments], [b for _, b in segments])
+            for (a, b), hit in zip(segments, blocked):
+                self.assertEqual(bool(hit), checker.segment_blocked(a, b), (a, b))
+
+    def test_segment_cells_decide_segment_blocked(self):
+        rng = random.Random(1)
+        for _ in range(40):
+            grid_size = rng.randint(1, 12)
+            checker = random_checker(rng, grid_size)
+            for a, b in random_segments(rng, grid_size, 100):
+                cells = checker.segment_cells(a, b)
+                self.assertEqual(len(cells), len(set(cells)))
+                self.assertEqual(checker.segment_blocked(a, b), any(checker.cell_blocked(x, y) for x, y in cells))
+
+    def test_segment_cells_match_dense_sampling(self):
+        # Sampling can step over a tiny clipped corner, so cells it misses
+        # must still be crossed by the segment
+        rng = random.Random(2)
+        checker = SegmentChecker(12, [])
+        for _ in range(300):
+            a = [rng.uniform(0, 12), rng.uniform(0, 12)]
+            b = [rng.uniform(0, 12), rng.uniform(0, 12)]
+            cells = set(checker.segment_cells(a, b))
+            sampled = sampled_cells(a, b)
+            self.assertLessEqual(sampled, cells, (a, b))
+            for cell in cells - sampled:
+                self.assertTrue(clips_cell(a, b, cell), (a, b, cell))
+
+    def test_segment_cells_cover_corner_segments(self):
+        # Through a corner the cells beside it are added, so sampling gives a subset
+        rng = random.Random(3)
+        checker = SegmentChecker(12, [])
+        for _ in range(300):
+            a = [rng.randint(0, 24) / 2, rng.randint(0, 24) / 2]
+            b = [rng.randint(0, 24) / 2, rng.randint(0, 24) / 2]
+            self.assertLessEqual(sampled_cells(a, b), set(checker.segment_cells(a, b)), (a, b))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import math
+import random
+import unittest
+
+from path_planning.spatial_index import PointIndex
+
+
+class PointIndexTest(unittest.TestCase):
+    def test_queries_match_brute_force(self):
+        rng = random.Random(4)
+        for _ in range(30):
+            index = PointIndex(cell_size=rng.uniform(0.3, 4.0))
+            points = []
+            for _ in range(rng.randint(1, 120)):
+                # Lattice points produce exact distance ties
+                if rng.random() < 0.3:
+                    point = [float(rng.randint(-5, 15)), float(rng.randint(-5, 15))]
+                else:
+                    point = [rng.uniform(-5, 15), rng.uniform(-5, 15)]
+                points.append(point)
+                index.insert(point)
+
+            def distance(point_id, query):
+                return math.hypot(points[point_id][0] - query[0], points[point_id][1] - query[1])
+
+            for _ in range(30):
+                query = [rng.uniform(-10, 20), rng.uniform(-10, 20)]
+                expected = min(range(len(points)), key=lambda i: (distance(i, query), i))
+                self.assertEqual(index.nearest(query), expected)
+
+                radius = rng.uniform(0, 8)
+                expected = [i for i in range(len(points)) if distance(i, query) <= radius]
+                self.assertEqual(index.within(query, radius), expected)
+
+    def test_empty_index(self):
+        index = PointIndex()
+        self.assertIsNone(index.nearest([0, 0]))
+        self.assertEqual(index.within([0, 0], 5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import os
-import json
 import matplotlib.pyplot as plt
+from contrastive_pair_store import load_pairs, PAIR_STORE_FILENAME
 
 def draw_environment(ax, grid_size, obstacles, path_A, path_B, start, goal):
     ax.set_xlim(-0.5, grid_size - 0.5)
@@ -34,10 +34,7 @@ def draw_environment(ax, grid_size, obstacles, path_A, path_B, start, goal):
 
     ax.legend(loc='upper right')
 
-def visualize_and_save(pair_json_path, output_img_path):
-    with open(pair_json_path, 'r') as f:
-        data = json.load(f)
-
+def visualize_and_save(data, output_img_path):
     original = data['original_environment']
     contrastive = data['contrastive_environment']
 
@@ -59,14 +56,17 @@ def visualize_and_save(pair_json_path, output_img_path):
     print(f"[✓] Saved image to {output_img_path}")
 
 def visualize_all_pairs(folder="contrastive_envs"):
-    subfolders = sorted([f for f in os.listdir(folder) if f.startswith("pair_")])
-    for subfolder in subfolders:
-        pair_path = os.path.join(folder, subfolder, "pair.json")
-        if not os.path.exists(pair_path):
-            print(f"[!] Skipping {subfolder}: pair.json not found")
-            continue
-        output_img = os.path.join(folder, subfolder, "visualization.png")
-        visualize_and_save(pair_path, output_img)
+    legacy_layout = not os.path.exists(os.path.join(folder, PAIR_STORE_FILENAME))
+    output_dir = os.path.join(folder, "visualizations")
+    if not legacy_layout:
+        os.makedirs(output_dir, exist_ok=True)
+
+    for name, data in load_pairs(folder):
+        if legacy_layout:
+            output_img = os.path.join(folder, name, "visualization.png")
+        else:
+            output_img = os.path.join(output_dir, f"{name}.png")
+        visualize_and_save(data, output_img)
 
 if __name__ == "__main__":
     visualize_all_pairs("contrastive_envs")
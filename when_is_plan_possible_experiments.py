@@ -6,6 +6,7 @@ import numpy as np
 from tqdm import tqdm
 from batch_experiment import BatchExperimentRunner
 from gui import GridWorldEnv
+from distance_fields import free_grid_path_length
 
 def get_ranked_obstacles_from_explanation(explainer, explainer_name, env):
     """
@@ -66,23 +67,23 @@ def get_ranked_obstacles_from_explanation(explainer, explainer_name, env):
         print(f"Warning: Error ranking obstacles for {explainer_name}: {e}")
         return list(env.obstacle_shapes.keys())
 
-def calculate_path_optimality(path, optimal_path):
+def calculate_path_optimality(path_length, optimal_length):
     """
     Calculate how optimal a path is compared to the theoretical optimal path
     
     Args:
-        path: The current path
-        optimal_path: The optimal path (with no obstacles)
+        path_length: Length of the current path
+        optimal_length: Length of the optimal path (with no obstacles)
         
     Returns:
         Optimality score (1.0 means it's optimal, lower means less optimal)
     """
-    if not path or not optimal_path:
+    if not path_length or not optimal_length:
         return 0.0
         
     # Optimality is ratio of optimal path length to current path length
     # (since shorter paths are better)
-    return len(optimal_path) / len(path)
+    return optimal_length / path_length
 
 def calculate_obstacle_removal_efficiency(removed_obstacles, total_obstacles):
     """
@@ -117,21 +118,27 @@ def evaluate_path_after_obstacle_removal(env, planner, explainer, explainer_name
     # Get ranked obstacles from explanation
     ranked_obstacles = get_ranked_obstacles_from_explanation(explainer, explainer_name, env)
     
-    # Calculate optimal path (if no obstacles existed)
-    obstacle_free_env = env.clone()
-    obstacle_free_env.obstacles = []
-    obstacle_free_env.obstacle_shapes = {}
-    
-    optimal_planner = planner()
-    optimal_planner.set_environment(
-        start=obstacle_free_env.agent_pos,
-        goal=obstacle_free_env.goal_pos,
-        grid_size=obstacle_free_env.grid_size,
-        obstacles=obstacle_free_env.obstacles
-    )
-    
-    result = optimal_planner.plan(return_steps=False)
-    optimal_path = result[0] if isinstance(result, tuple) else result
+    # Calculate optimal path length (if no obstacles existed). For planners that
+    # return shortest 4-connected paths this is the Manhattan distance, so there
+    # is no need to replan on an empty grid.
+    if getattr(planner, "optimal", False):
+        optimal_length = free_grid_path_length(env.agent_pos, env.goal_pos)
+    else:
+        obstacle_free_env = env.clone()
+        obstacle_free_env.obstacles = []
+        obstacle_free_env.obstacle_shapes = {}
+        
+        optimal_planner = planner()
+        optimal_planner.set_environment(
+            start=obstacle_free_env.agent_pos,
+            goal=obstacle_free_env.goal_pos,
+            grid_size=obstacle_free_env.grid_size,
+            obstacles=obstacle_free_env.obstacles
+        )
+        
+        result = optimal_planner.plan(return_steps=False)
+        optimal_path = result[0] if isinstance(result, tuple) else result
+        optimal_length = len(optimal_path) if optimal_path else 0
     
     # Start removing obstacles one by one
     modified_env = env.clone()
@@ -159,11 +166,10 @@ def evaluate_path_after_obstacle_removal(env, planner, explainer, explainer_name
         if path and len(path) > 0:
             # Path found after removing k obstacles
             path_length = len(path)
-            optimal_length = len(optimal_path) if optimal_path else 0
             
             # Calculate metrics
             obstacle_efficiency = calculate_obstacle_removal_efficiency(k, total_obstacles)
-            path_optimality = calculate_path_optimality(path, optimal_path) if optimal_path else 0.0
+            path_optimality = calculate_path_optimality(path_length, optimal_length)
             
             return {
                 "obstacles_removed": k,
@@ -181,7 +187,7 @@ def evaluate_path_after_obstacle_removal(env, planner, explainer, explainer_name
         "obstacles_removed_percentage": 1.0,
         "obstacle_removal_efficiency": 0.0,
         "path_length": 0,
-        "optimal_path_length": len(optimal_path) if optimal_path else 0,
+        "optimal_path_length": optimal_length,
         "path_optimality": 0.0,
         "success": False
     }
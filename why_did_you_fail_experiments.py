@@ -10,6 +10,8 @@ from batch_experiment import BatchExperimentRunner
 from metrics import compute_path_metrics
 from environment_generator import EnvironmentGenerator
 from gui import GridWorldEnv
+from distance_fields import optimal_path_length
+from path_planning.bitboard import BitboardGrid
 
 def jaccard_similarity(set1, set2):
     """Calculate Jaccard similarity between two sets"""
@@ -51,6 +53,11 @@ def calculate_faithfulness_score(env, planner, explainer, ranked_obstacles):
     total_obstacles = len(ranked_obstacles)
     if total_obstacles == 0:
         return 0  # No obstacles to remove
+
+    # Planners whose path_exists() is an exact flood fill share one bitboard
+    # that only has each removed shape cleared, instead of a search per step
+    connectivity = getattr(planner, "connectivity", None)
+    board = BitboardGrid.from_env(modified_env, connectivity) if connectivity else None
     
     # Iterate through obstacles and remove them until path is found
     for k, obstacle_id in enumerate(ranked_obstacles, 1):
@@ -59,20 +66,23 @@ def calculate_faithfulness_score(env, planner, explainer, ranked_obstacles):
             points_to_remove = modified_env.obstacle_shapes[obstacle_id]
             modified_env.obstacles = [p for p in modified_env.obstacles if p not in points_to_remove]
             del modified_env.obstacle_shapes[obstacle_id]
+            if board is not None:
+                board.clear(points_to_remove)
         
         # Check if path exists now
-        planner_instance = planner()
-        planner_instance.set_environment(
-            start=modified_env.agent_pos,
-            goal=modified_env.goal_pos,
-            grid_size=modified_env.grid_size,
-            obstacles=modified_env.obstacles
-        )
-        
-        result = planner_instance.plan(return_steps=False)
-        path = result[0] if isinstance(result, tuple) else result
+        if board is not None:
+            path_found = board.path_exists(modified_env.agent_pos, modified_env.goal_pos)
+        else:
+            planner_instance = planner()
+            planner_instance.set_environment(
+                start=modified_env.agent_pos,
+                goal=modified_env.goal_pos,
+                grid_size=modified_env.grid_size,
+                obstacles=modified_env.obstacles
+            )
+            path_found = planner_instance.path_exists()
         
-        if path and len(path) > 0:
+        if path_found:
             # Path found after removing k obstacles
             return k / total_obstacles
     
@@ -357,11 +367,16 @@ def main():
                     obstacles=env.obstacles
                 )
                 
-                # Get original path (should be None/empty for infeasible environments)
-                result = planner_instance.plan(return_steps=False)
-                original_path = result[0] if isinstance(result, tuple) else result
-                # for infeasible environments path length is 0
-                path_length = len(original_path) if original_path else 0
+                # Get original path length (should be 0 for infeasible environments),
+                # from the stored distance fields when the planner is optimal
+                available, optimal_length = optimal_path_length(env, planner_instance)
+                if available:
+                    path_length = optimal_length or 0
+                else:
+                    result = planner_instance.plan(return_steps=False)
+                    original_path = result[0] if isinstance(result, tuple) else result
+                    # for infeasible environments path length is 0
+                    path_length = len(original_path) if original_path else 0
                 
                 # For each explanation method
                 for explainer_name in explanations:
@@ -403,10 +418,7 @@ def main():
                                     grid_size=perturbed_env_candidate.grid_size,
                                     obstacles=perturbed_env_candidate.obstacles
                                 )
-                                result_check = planner_check.plan(return_steps=False)
-                                path_check = result_check[0] if isinstance(result_check, tuple) else result_check
-                                
-                                if not (path_check and len(path_check) > 0): # Path NOT found (still infeasible)
+                                if not planner_check.path_exists(): # Path NOT found (still infeasible)
                                     current_perturbed_env = perturbed_env_candidate
                                     final_planner_check_for_perturbed = planner_check
                                     found_infeasible_perturbation = True